@@ -105,7 +105,7 @@ def search_users_api(request):
     """Search for users API endpoint"""
     try:
         query = request.GET.get('q', '').strip()
-        users = search_users(request.user, query)[:10]
+        users = search_users(request.user, query, limit=10)
 
         serializer = UserSerializer(users, many=True, context={'request': request})
         
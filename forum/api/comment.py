@@ -13,6 +13,7 @@ from forum.services.comment_services import (
     get_comments_service,
 )
 from forum.serializers import CommentSerializer
+from forum.services.post_detail_services import build_comment_trees
 
 @api_view(['POST'])
 @authentication_classes([TokenAuthentication])
@@ -62,8 +63,10 @@ def delete_comment_api(request, comment_id):
 def get_comments_api(request, solution_id):
     try:
         solution = get_object_or_404(Solution, id=solution_id)
-        comments = solution.comments.filter(parent__isnull=True).order_by('created_at')
-        serializer = CommentSerializer(comments, many=True, context={'request': request})
+        # One query for the whole thread; replies are nested in memory
+        comments = list(solution.comments.select_related('author__userprofile').order_by('path'))
+        root_comments = build_comment_trees(comments)
+        serializer = CommentSerializer(root_comments, many=True, context={'request': request})
         return Response({
             'comments': serializer.data,
             'solution_id': solution_id
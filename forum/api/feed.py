@@ -3,19 +3,35 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from forum.services.feed_services import get_for_you_posts, get_all_posts
+from forum.services.feed_services import (
+    get_for_you_posts, get_all_posts, get_for_you_posts_by_cursor, get_all_posts_by_cursor
+)
+from forum.services.post_card_services import prefetch_author_profiles
 from forum.serializers import PostListSerializer
 
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
 def api_for_you(request):
+    """
+    Page mode: ?page=N returns page/total_pages.
+    Cursor mode: ?cursor= (empty for the first page) returns next_cursor and skips the total count.
+    """
     try:
-        page = int(request.GET.get('page', 1))
         per_page = int(request.GET.get('limit', 10))
-        
+
+        if 'cursor' in request.GET:
+            posts, next_cursor = get_for_you_posts_by_cursor(request.user, request.GET.get('cursor'), per_page)
+            serializer = PostListSerializer(prefetch_author_profiles(posts), many=True, context={'request': request})
+            return Response({
+                "posts": serializer.data,
+                "has_next": next_cursor is not None,
+                "next_cursor": next_cursor
+            })
+
+        page = int(request.GET.get('page', 1))
         posts, page_obj = get_for_you_posts(request.user, page, per_page)
-        serializer = PostListSerializer(posts, many=True, context={'request': request})
+        serializer = PostListSerializer(prefetch_author_profiles(posts), many=True, context={'request': request})
         
         return Response({
             "posts": serializer.data,
@@ -23,6 +39,8 @@ def api_for_you(request):
             "page": page_obj.number,
             "total_pages": page_obj.paginator.num_pages
         })
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -30,14 +48,29 @@ def api_for_you(request):
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
 def api_all_posts(request):
+    """
+    Page mode: ?page=N returns page/total_pages.
+    Cursor mode: ?cursor= (empty for the first page) returns next_cursor and skips the total count.
+    """
     try:
-        page = int(request.GET.get('page', 1))
         per_page = int(request.GET.get('limit', 10))
         query = request.GET.get('q', '')
 
+        if 'cursor' in request.GET:
+            posts, next_cursor = get_all_posts_by_cursor(request.user, query, request.GET.get('cursor'), per_page)
+            serializer = PostListSerializer(prefetch_author_profiles(posts), many=True, context={'request': request})
+            return Response({
+                "posts": serializer.data,
+                "has_next": next_cursor is not None,
+                "next_cursor": next_cursor,
+                "query": query
+            })
+
+        page = int(request.GET.get('page', 1))
+
         posts, page_obj = get_all_posts(request.user, query, page, per_page)
 
-        serializer = PostListSerializer(posts, many=True, context={'request': request})
+        serializer = PostListSerializer(prefetch_author_profiles(posts), many=True, context={'request': request})
 
         return Response({
             "posts": serializer.data,
@@ -46,5 +79,7 @@ def api_all_posts(request):
             "total_pages": page_obj.paginator.num_pages,
             "query": query
         })
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -11,6 +11,7 @@ from rest_framework import status
 from forum.models import Notification
 from forum.services.notification_services import (
     all_notifications_service,
+    notifications_page_service,
     mark_notification_read_service
 )
 
@@ -21,12 +22,31 @@ logger = logging.getLogger(__name__)
 @permission_classes([IsAuthenticated])
 def notifications_api(request):
     """
-    Get all notifications for the authenticated user
+    Get all notifications for the authenticated user.
+
+    Passing ?cursor= (empty for the first page) switches to cursor mode: only
+    ?limit= notifications are returned along with next_cursor.
     """
     try:
         from forum.services.deep_link_service import create_notification_deep_link
         
-        notifications = all_notifications_service(request.user)
+        next_cursor = None
+        cursor_mode = 'cursor' in request.GET
+        if cursor_mode:
+            try:
+                limit = int(request.GET.get('limit', 20))
+                notifications, next_cursor = notifications_page_service(
+                    request.user, request.GET.get('cursor'), limit
+                )
+            except ValueError as e:
+                return Response({
+                    'success': False,
+                    'error': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            unread_count = request.user.notifications.filter(is_read=False).count()
+        else:
+            notifications = all_notifications_service(request.user)
+            unread_count = notifications.filter(is_read=False).count()
         
         notification_data = []
         for notification in notifications:
@@ -62,12 +82,17 @@ def notifications_api(request):
             }
             notification_data.append(data)
         
+        data = {
+            'notifications': notification_data,
+            'unread_count': unread_count
+        }
+        if cursor_mode:
+            data['has_next'] = next_cursor is not None
+            data['next_cursor'] = next_cursor
+
         return Response({
             'success': True,
-            'data': {
-                'notifications': notification_data,
-                'unread_count': notifications.filter(is_read=False).count()
-            }
+            'data': data
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
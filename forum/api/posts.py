@@ -8,6 +8,7 @@ import json
 
 from forum.models import Post, Course
 from forum.services.feed_services import get_for_you_posts, get_all_posts, paginate_posts
+from forum.services.view_count_services import record_post_view
 from forum.services.post_services import (
     create_post_service,
     update_post_service,
@@ -96,8 +97,7 @@ def post_detail_api(request, post_id):
     try:
         post = get_object_or_404(Post, id=post_id)
         serializer = PostDetailSerializer(post, context={'request': request})
-        post.views += 1
-        post.save()
+        record_post_view(post.id)
         return Response(serializer.data)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -114,7 +114,7 @@ def get_profile_api(request, username=None):
                     'title': post.title,
                     'created_at': post.created_at.isoformat(),
                     'likes_count': post.like_count(),
-                    'solutions_count': post.solutions.count()
+                    'solutions_count': post.solution_count
                 } for post in context['recent_posts']
             ],
             'can_compare': context['can_compare']
@@ -1,10 +1,14 @@
 import datetime
+import hashlib
+import json
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.contrib.auth.decorators import login_required
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
-from rest_framework.authentication import TokenAuthentication
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.authentication import TokenAuthentication, SessionAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -12,6 +16,7 @@ from forum.services.schedule_services import (
     get_block_order_for_day,
     _parse_iso_date,
     _convert_to_sheet_date_format,
+    get_schedule_range,
     is_ceremonial_uniform_required
 )
 
@@ -83,4 +88,53 @@ def check_ceremonial_uniform(request, target_date):
         return Response({
             'error': 'Internal server error',
             'details': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# Most dates one schedule request may cover, start and end included (a month plus
+# both partial weeks)
+MAX_SCHEDULE_RANGE_DAYS = 62
+SCHEDULE_MAX_AGE = 5 * 60
+
+@api_view(['GET'])
+@authentication_classes([TokenAuthentication, SessionAuthentication])
+@permission_classes([IsAuthenticated])
+def get_schedule_range_api(request):
+    """
+    Processed schedule, ceremonial uniform flags and school days for every date in
+    ?start=YYYY-MM-DD&end=YYYY-MM-DD (end defaults to start + 6 days). Responses carry
+    ETag and Last-Modified so clients can revalidate with a 304.
+    """
+    try:
+        start_date = _parse_iso_date(request.query_params.get('start', ''))
+        end_param = request.query_params.get('end')
+        end_date = _parse_iso_date(end_param) if end_param else start_date + datetime.timedelta(days=6)
+    except ValueError as e:
+        return Response({
+            'error': 'Invalid date format. Expected YYYY-MM-DD',
+            'details': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if end_date < start_date or (end_date - start_date).days + 1 > MAX_SCHEDULE_RANGE_DAYS:
+        return Response({
+            'error': f'end must be on or after start and the range at most {MAX_SCHEDULE_RANGE_DAYS} days, start and end included'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    days, modified = get_schedule_range(request.user, start_date, end_date)
+    payload = {
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'days': days,
+    }
+
+    # Course names make the body per-user, so the ETag hashes the body itself
+    etag = quote_etag(hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest())
+    last_modified = int(modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = Response(payload, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, max_age=SCHEDULE_MAX_AGE)
+    patch_vary_headers(response, ['Authorization', 'Cookie'])
+    return response
@@ -11,7 +11,7 @@ from forum.services.auto_complete_service import (
     auto_complete_user_courses_service,
     auto_complete_courses_registration_service
 )
-from forum.tasks import check_wolfnet_password
+from forum.services.wolfnet_job_service import get_wolfnet_job_status
 
 
 logger = logging.getLogger(__name__)
@@ -27,13 +27,15 @@ def auto_complete_courses_api(request):
         - wolfnet_password (optional): WolfNet password to use instead of stored one
     
     Returns:
-        Response: Auto-completion result with courses or error
+        Response: 202 with a job_id to poll at api/wolfnet-jobs/<job_id>/, or an error
     """
     try:
         wolfnet_password = request.data.get('wolfnet_password')
         result = auto_complete_user_courses_service(request.user, wolfnet_password)
         
-        if result['success']:
+        if 'job_id' in result:
+            return Response(result, status=status.HTTP_202_ACCEPTED)
+        elif result['success']:
             return Response(result, status=status.HTTP_200_OK)
         else:
             return Response(result, status=status.HTTP_400_BAD_REQUEST)
@@ -58,7 +60,7 @@ def auto_complete_courses_registration_api(request):
         - school_email: User's school email
     
     Returns:
-        Response: Auto-completion result with courses or error
+        Response: 202 with a job_id to poll at api/wolfnet-jobs/<job_id>/, or an error
     """
     try:
         wolfnet_password = request.data.get('wolfnet_password')
@@ -66,7 +68,9 @@ def auto_complete_courses_registration_api(request):
         
         result = auto_complete_courses_registration_service(school_email, wolfnet_password)
         
-        if result['success']:
+        if 'job_id' in result:
+            return Response(result, status=status.HTTP_202_ACCEPTED)
+        elif result['success']:
             return Response(result, status=status.HTTP_200_OK)
         else:
             return Response(result, status=status.HTTP_400_BAD_REQUEST)
@@ -77,3 +81,27 @@ def auto_complete_courses_registration_api(request):
             'success': False,
             'error': f'An error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([])  # Registration jobs have no user; jobs with one check it
+def wolfnet_job_status_api(request, job_id):
+    """
+    Status of a background WolfNet job started by the endpoints above
+
+    Query params:
+        - wait (optional): Seconds to hold the request until the job finishes or reports progress
+
+    Returns:
+        Response: {"status": "pending"|"running", "progress"} while running, the job's
+                  result with "status": "complete" when done, or 404 for unknown jobs
+    """
+    try:
+        wait = float(request.query_params.get('wait', 0))
+    except ValueError:
+        wait = 0
+    result = get_wolfnet_job_status(job_id, request.user, wait)
+    if result is None:
+        return Response({'success': False, 'error': 'Unknown or expired job'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(result, status=status.HTTP_200_OK)
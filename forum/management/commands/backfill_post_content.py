@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from forum.models import Post
+from forum.services.utils import extract_post_content
+
+class Command(BaseCommand):
+    help = 'Fill Post preview text, first image and body text from content in id-ordered batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Posts loaded and updated per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        last_id = 0
+        updated = 0
+        while True:
+            posts = list(Post.objects.filter(id__gt=last_id).order_by('id').only('id', 'content')[:batch_size])
+            if not posts:
+                break
+
+            for post in posts:
+                for field, value in extract_post_content(post.content).items():
+                    setattr(post, field, value)
+            Post.objects.bulk_update(posts, Post.CONTENT_DERIVED_FIELDS)
+
+            updated += len(posts)
+            last_id = posts[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled content columns for {updated} posts.'))
@@ -0,0 +1,47 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from forum.models import Course
+from forum.services.course_search_index import CourseSearchIndex, get_course_search_index
+from forum.services.course_services import search_courses_db
+
+class Command(BaseCommand):
+    help = 'Compare course autocomplete latency: in-memory CourseSearchIndex vs the database query'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Times each query is repeated')
+        parser.add_argument('--queries', nargs='*', help='Queries to run (default: keystroke prefixes of a few course names)')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        queries = options['queries'] or self._default_queries()
+        if not queries:
+            self.stdout.write(self.style.WARNING('No courses to search.'))
+            return
+
+        started = time.perf_counter()
+        CourseSearchIndex.build()
+        self.stdout.write(f'Index build: {(time.perf_counter() - started) * 1000:.1f} ms')
+
+        index = get_course_search_index()
+        for label, search in (('database', search_courses_db), ('in-memory', lambda q: index.search(q))):
+            timings = []
+            for _ in range(iterations):
+                for query in queries:
+                    started = time.perf_counter()
+                    search(query)
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f'{label:>10}: {len(timings)} searches, '
+                f'median {statistics.median(timings):.3f} ms, '
+                f'p95 {timings[int(len(timings) * 0.95) - 1]:.3f} ms'
+            )
+
+    def _default_queries(self):
+        # Simulate typing: every prefix of the first word of a handful of course names
+        queries = []
+        for name in Course.objects.order_by('id').values_list('name', flat=True)[:5]:
+            word = name.split()[0].lower() if name.split() else ''
+            queries.extend(word[:length] for length in range(1, len(word) + 1))
+        return queries
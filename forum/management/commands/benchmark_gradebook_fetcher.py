@@ -0,0 +1,105 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import requests
+from django.core.management.base import BaseCommand
+from forum.services.gradebook_fetcher import fetch_gradebooks
+
+HYDRATE_BODY = json.dumps({"Roster": [{"AssignmentGrades": [
+    {"AssignmentId": i, "AssignmentType": "Quiz", "PointsEarned": 8, "MaxPoints": 10, "Comment": "", "AssignmentSkillList": []}
+    for i in range(30)
+]}]}).encode()
+PERFORMANCE_BODY = json.dumps([{"AssignmentId": i, "AssignmentShortDescription": f"Quiz {i}"} for i in range(30)]).encode()
+
+
+class MockWolfNetHandler(BaseHTTPRequestHandler):
+    """Gradebook endpoints with fixed latency and an optional share of 503s"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        if random.random() < self.server.error_rate:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = HYDRATE_BODY if urlparse(self.path).path.endswith('hydrategradebook') else PERFORMANCE_BODY
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Compare gradebook fetching against a local mock WolfNet: serial requests vs the concurrent async fetcher'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--sections', type=int, default=7, help='Sections per user')
+        parser.add_argument('--latency', type=float, default=100, help='Mock response latency in ms')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 503')
+        parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight per host for the async fetcher')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), MockWolfNetHandler)
+        server.daemon_threads = True
+        server.latency = options['latency'] / 1000
+        server.error_rate = options['error_rate']
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+
+        jobs = [
+            {
+                "key": f"user{u}@wpga.ca",
+                "cookies": {"t": f"token-{u}"},
+                "student_id": str(1000 + u),
+                "marking_period_id": "1",
+                "section_ids": [str(100000 + s) for s in range(options['sections'])],
+            }
+            for u in range(options['users'])
+        ]
+        gradebooks = len(jobs) * options['sections']
+        self.stdout.write(
+            f"{len(jobs)} users x {options['sections']} sections ({gradebooks * 2} requests), "
+            f"{options['latency']:.0f} ms latency, {options['error_rate']:.0%} errors"
+        )
+
+        try:
+            started = time.perf_counter()
+            serial_ok = self._fetch_serially(base_url, jobs)
+            self._report('serial', started, serial_ok, gradebooks)
+
+            started = time.perf_counter()
+            results = fetch_gradebooks(jobs, base_url=base_url, max_requests_per_host=options['concurrency'])
+            async_ok = sum(
+                section["gradebook"] is not None
+                for result in results.values() if isinstance(result, dict)
+                for section in result.values()
+            )
+            self._report('async', started, async_ok, gradebooks)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _fetch_serially(self, base_url, jobs):
+        """The pre-fetcher behaviour: one requests.Session per user, sections one after another"""
+        ok = 0
+        for job in jobs:
+            with requests.Session() as http_session:
+                http_session.cookies.update(job["cookies"])
+                for section_id in job["section_ids"]:
+                    gradebook = http_session.get(f'{base_url}/api/gradebook/hydrategradebook?sectionId={section_id}', timeout=20)
+                    http_session.get(f'{base_url}/api/gradebook/AssignmentPerformanceStudent?sectionId={section_id}', timeout=20)
+                    ok += gradebook.status_code == 200
+        return ok
+
+    def _report(self, label, started, ok, total):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{label:>7}: {elapsed * 1000:.0f} ms, {ok}/{total} gradebooks fetched')
@@ -0,0 +1,80 @@
+import re
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from forum.services.utils import EDITORJS_TEXT_KEYS, _collect_strings, detect_bad_words, get_moderation_filter, leet_mapping
+
+# One of each block type detect_bad_words reads, with clean text so every scan runs to the end
+SAMPLE_BLOCKS = (
+    {'type': 'header', 'data': {'text': 'Chapter <b>review</b> for the unit test', 'level': 2}},
+    {'type': 'paragraph', 'data': {'text': 'Can someone explain how the class assignment on kinematics is graded? I passed the first part&nbsp;but not the second.'}},
+    {'type': 'quote', 'data': {'text': 'Show all of your work for full marks', 'caption': 'Ms. Smith'}},
+    {'type': 'list', 'data': {'style': 'unordered', 'items': [{'content': 'Velocity vs time graphs', 'items': []}, {'content': 'Free body diagrams', 'items': []}]}},
+    {'type': 'table', 'data': {'content': [['Question', 'Marks'], ['1a', '4'], ['1b', '6']]}},
+)
+
+# The implementation detect_bad_words replaced: normalize and search every block text and
+# list item separately, with a plain alternation. It never read header captions, quotes'
+# captions or tables, so it also does less work per document than the current scan.
+BASELINE_WORDS = ['fuck', 'bitch', 'shit', 'ass', 'dick', 'cunt', 'cock', 'pussy']
+BASELINE_PATTERN = re.compile(r'\b(' + '|'.join(map(re.escape, BASELINE_WORDS)) + r')\b', re.IGNORECASE)
+
+def baseline_normalize_text(text):
+    if not text:
+        return ""
+    text = text.translate(leet_mapping)
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'(.)\1{2,}', r'\1', text)
+    return text.lower()
+
+def baseline_detect_bad_words(content):
+    for block in content['blocks']:
+        data = block.get("data", {})
+        text = data.get("text", "")
+        if text and BASELINE_PATTERN.search(baseline_normalize_text(text)):
+            raise ValueError(f"Bad word detected in block of type '{block.get('type')}'.")
+        for item in data.get("items", []):
+            if BASELINE_PATTERN.search(baseline_normalize_text(item.get("content"))):
+                raise ValueError(f"Bad word detected in list item in block of type '{block.get('type')}'.")
+
+class Command(BaseCommand):
+    help = 'Time detect_bad_words against the per-block implementation it replaced, on large Editor.js documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--blocks', type=int, default=2000, help='Blocks per document')
+        parser.add_argument('--iterations', type=int, default=20, help='Documents scanned per implementation')
+
+    def handle(self, *args, **options):
+        blocks = [SAMPLE_BLOCKS[i % len(SAMPLE_BLOCKS)] for i in range(options['blocks'])]
+        document = {'blocks': blocks}
+        texts = []
+        for block in blocks:
+            for key in EDITORJS_TEXT_KEYS:
+                if key in block['data']:
+                    _collect_strings(block['data'][key], texts)
+        size_mb = sum(len(text) for text in texts) / 1_000_000
+
+        started = time.perf_counter()
+        get_moderation_filter()
+        self.stdout.write(f'Wordlist compile: {(time.perf_counter() - started) * 1000:.1f} ms')
+        self.stdout.write(f'Document: {len(blocks)} blocks, {len(texts)} strings, {size_mb * 1000:.0f} KB of text')
+
+        medians = {}
+        for label, scan in (('baseline', baseline_detect_bad_words), ('current', detect_bad_words)):
+            timings = []
+            for _ in range(options['iterations']):
+                started = time.perf_counter()
+                scan(document)
+                timings.append(time.perf_counter() - started)
+            medians[label] = statistics.median(timings)
+            self.stdout.write(
+                f'{label:>10}: median {medians[label] * 1000:.2f} ms, '
+                f'{size_mb / medians[label]:.1f} MB/s of document text'
+            )
+
+        ratio = medians['baseline'] / medians['current']
+        if ratio >= 1:
+            self.stdout.write(self.style.SUCCESS(f'Current scan is {ratio:.1f}x faster than the baseline.'))
+        else:
+            self.stdout.write(self.style.WARNING(f'Current scan is {1 / ratio:.1f}x slower than the baseline.'))
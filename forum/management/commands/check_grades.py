@@ -1,16 +1,25 @@
 from django.core.management.base import BaseCommand
 from forum.tasks import periodic_grade_check_trigger, check_single_user_grades
+from forum.services.grade_check_schedule_services import grade_check_stats
 
 class Command(BaseCommand):
     help = 'Manually trigger grade checking for users'
 
     def add_arguments(self, parser):
         parser.add_argument('--user-email', type=str, help='Check grades for a specific user by email')
+        parser.add_argument('--stats', action='store_true', help='Show adaptive scheduler stats instead of checking')
 
     def handle(self, *args, **options):
         user_email = options.get('user_email')
 
-        if user_email:
+        if options.get('stats'):
+            stats = grade_check_stats()
+            self.stdout.write(
+                f"{stats['users']} scheduled users, {stats['due_now']} due now: "
+                f"{stats['checks']} checks found {stats['changes_detected']} changes "
+                f"({stats['checks_per_change'] or '-'} checks per change)"
+            )
+        elif user_email:
             self.stdout.write(f'Checking grades for {user_email}...')
             task = check_single_user_grades.delay(user_email)
             self.stdout.write(self.style.SUCCESS(f'Task scheduled with ID: {task.id}'))
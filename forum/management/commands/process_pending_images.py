@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from forum.models import ImageAsset
+from forum.services.image_services import process_image_asset
+
+class Command(BaseCommand):
+    help = 'Make the variants of image uploads whose processing task never ran (or failed, with --retry-failed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry assets that failed to process')
+
+    def handle(self, *args, **options):
+        statuses = [ImageAsset.PENDING]
+        if options['retry_failed']:
+            statuses.append(ImageAsset.FAILED)
+
+        counts = {ImageAsset.READY: 0, ImageAsset.FAILED: 0}
+        for asset_id in ImageAsset.objects.filter(status__in=statuses).order_by('id').values_list('id', flat=True):
+            asset = process_image_asset(asset_id)
+            counts[asset.status] = counts.get(asset.status, 0) + 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {counts[ImageAsset.READY]} images, {counts[ImageAsset.FAILED]} failed."
+        ))
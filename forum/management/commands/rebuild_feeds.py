@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from forum.models import User
+from forum.services.feed_services import rebuild_user_feed
+
+class Command(BaseCommand):
+    help = 'Materialize the For You feed of every user (or a single user)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-email', type=str, help='Rebuild the feed for a specific user by email')
+
+    def handle(self, *args, **options):
+        user_email = options.get('user_email')
+
+        users = User.objects.select_related('userprofile')
+        if user_email:
+            users = users.filter(school_email=user_email)
+
+        count = 0
+        for user in users.iterator():
+            rebuild_user_feed(user)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt feeds for {count} users.'))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Max
+
+from forum.models import Post, User
+
+# Table -> SQL expression computing the vector; both functions are created by migration 0042
+SEARCH_VECTOR_TARGETS = (
+    (Post, 'forum_post_search_vector(title, content)'),
+    (User, 'forum_user_search_vector(first_name, last_name)'),
+)
+
+class Command(BaseCommand):
+    help = 'Recompute Post and User search vectors in id-range batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows updated per statement')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        for model, expression in SEARCH_VECTOR_TARGETS:
+            table = model._meta.db_table
+            max_id = model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+            updated = 0
+
+            for start in range(0, max_id, batch_size):
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'UPDATE {table} SET search_vector = {expression} WHERE id > %s AND id <= %s',
+                        [start, start + batch_size]
+                    )
+                    updated += cursor.rowcount
+
+            self.stdout.write(f'{table}: {updated} rows')
+
+        self.stdout.write(self.style.SUCCESS('Search vectors rebuilt.'))
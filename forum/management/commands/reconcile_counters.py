@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from forum.services.counter_services import reconcile_counters
+
+class Command(BaseCommand):
+    help = 'Repair drift in the denormalized like/follower/solution/comment/vote counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows have drifted')
+
+    def handle(self, *args, **options):
+        dry_run = options.get('dry_run')
+        drift = reconcile_counters(dry_run=dry_run)
+
+        for counter, rows in drift.items():
+            self.stdout.write(f'{counter}: {rows} rows {"drifted" if dry_run else "fixed"}')
+
+        self.stdout.write(self.style.SUCCESS(f'Reconciled counters ({sum(drift.values())} rows).'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from forum.services.schedule_services import sync_daily_schedules
+
+class Command(BaseCommand):
+    help = 'Import the block order sheet and school calendar into DailySchedule'
+
+    def handle(self, *args, **options):
+        counts = sync_daily_schedules()
+        self.stdout.write(self.style.SUCCESS(
+            f"Synced daily schedules: {counts['created']} created, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged."
+        ))
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:09
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_field):
+    counts = queryset.order_by().values(group_field).annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model('forum', 'Post')
+    Solution = apps.get_model('forum', 'Solution')
+    Comment = apps.get_model('forum', 'Comment')
+    PostLike = apps.get_model('forum', 'PostLike')
+    FollowedPost = apps.get_model('forum', 'FollowedPost')
+
+    Post.objects.update(
+        likes_count=_count(PostLike.objects.filter(post=OuterRef('pk')), 'post'),
+        followers_count=_count(FollowedPost.objects.filter(post=OuterRef('pk')), 'post'),
+        solution_count=_count(Solution.objects.filter(post=OuterRef('pk')), 'post'),
+        comment_count=_count(Comment.objects.filter(solution__post=OuterRef('pk')), 'solution__post'),
+    )
+    Solution.objects.update(
+        comment_count=_count(Comment.objects.filter(solution=OuterRef('pk')), 'solution'),
+        root_comment_count=_count(Comment.objects.filter(solution=OuterRef('pk'), parent__isnull=True), 'solution'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0039_feedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='followers_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='solution_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='root_comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_votes(apps, schema_editor):
+    SolutionUpvote = apps.get_model('forum', 'SolutionUpvote')
+    SolutionDownvote = apps.get_model('forum', 'SolutionDownvote')
+    SolutionVote = apps.get_model('forum', 'SolutionVote')
+
+    for model, value in ((SolutionUpvote, 1), (SolutionDownvote, -1)):
+        votes = [
+            SolutionVote(solution_id=solution_id, user_id=user_id, value=value)
+            for solution_id, user_id in model.objects.values_list('solution_id', 'user_id').iterator()
+        ]
+        SolutionVote.objects.bulk_create(votes, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0040_post_solution_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolutionVote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(choices=[(1, 'Upvote'), (-1, 'Downvote')])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('solution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='forum.solution')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solution_votes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('solution', 'user')},
+            },
+        ),
+        migrations.RunPython(copy_votes, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='SolutionDownvote',
+        ),
+        migrations.DeleteModel(
+            name='SolutionUpvote',
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:20
+
+from django.db import migrations
+
+# Plain text of an Editor.js document: only the text-bearing fields of each block
+# (paragraph/header/quote text, captions, list and checklist items, table cells),
+# with inline HTML stripped. Keys, URLs and block metadata never reach the index.
+EDITORJS_TEXT_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION forum_editorjs_text(content jsonb) RETURNS text AS $$
+DECLARE
+    doc jsonb := content;
+    result text;
+BEGIN
+    IF doc IS NULL THEN
+        RETURN '';
+    END IF;
+
+    -- Older posts store the Editor.js document as a JSON-encoded string
+    IF jsonb_typeof(doc) = 'string' THEN
+        BEGIN
+            doc := (doc #>> '{}')::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN regexp_replace(doc #>> '{}', '<[^>]*>', ' ', 'g');
+        END;
+    END IF;
+
+    SELECT string_agg(t, ' ') INTO result FROM (
+        SELECT jsonb_path_query(doc, 'lax $.blocks[*].data.text') #>> '{}' AS t
+        UNION ALL
+        SELECT jsonb_path_query(doc, 'lax $.blocks[*].data.caption') #>> '{}'
+        UNION ALL
+        SELECT jsonb_path_query(doc, 'lax $.blocks[*].data.title') #>> '{}'
+        UNION ALL
+        SELECT jsonb_path_query(doc, 'lax $.blocks[*].data.message') #>> '{}'
+        UNION ALL
+        SELECT jsonb_path_query(doc, 'lax $.blocks[*].data.code') #>> '{}'
+        UNION ALL
+        -- strict mode: lax .** also unwraps nested arrays and yields table cells twice
+        SELECT jsonb_path_query(doc, 'strict $.blocks[*] ? (exists(@.data.items)).data.items.** ? (@.type() == "string")', '{}', true) #>> '{}'
+        UNION ALL
+        SELECT jsonb_path_query(doc, 'strict $.blocks[*] ? (exists(@.data.content)).data.content.** ? (@.type() == "string")', '{}', true) #>> '{}'
+    ) AS texts;
+
+    RETURN replace(regexp_replace(coalesce(result, ''), '<[^>]*>', ' ', 'g'), '&nbsp;', ' ');
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+"""
+
+POST_SEARCH_VECTOR_SQL = r"""
+CREATE OR REPLACE FUNCTION forum_post_search_vector(title text, content jsonb) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector(coalesce(title, '')), 'A') ||
+           setweight(to_tsvector(forum_editorjs_text(content)), 'B');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION forum_post_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.title IS DISTINCT FROM OLD.title OR NEW.content IS DISTINCT FROM OLD.content THEN
+        NEW.search_vector := forum_post_search_vector(NEW.title, NEW.content);
+    ELSE
+        -- Full-row saves write back whatever vector the instance was loaded with
+        NEW.search_vector := OLD.search_vector;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS forum_post_search_vector_update ON forum_post;
+CREATE TRIGGER forum_post_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, content ON forum_post
+    FOR EACH ROW EXECUTE FUNCTION forum_post_search_vector_trigger();
+"""
+
+USER_SEARCH_VECTOR_SQL = r"""
+CREATE OR REPLACE FUNCTION forum_user_search_vector(first_name text, last_name text) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector(coalesce(first_name, '')), 'A') ||
+           setweight(to_tsvector(coalesce(last_name, '')), 'A');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION forum_user_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.first_name IS DISTINCT FROM OLD.first_name OR NEW.last_name IS DISTINCT FROM OLD.last_name THEN
+        NEW.search_vector := forum_user_search_vector(NEW.first_name, NEW.last_name);
+    ELSE
+        NEW.search_vector := OLD.search_vector;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS forum_user_search_vector_update ON forum_user;
+CREATE TRIGGER forum_user_search_vector_update
+    BEFORE INSERT OR UPDATE OF first_name, last_name ON forum_user
+    FOR EACH ROW EXECUTE FUNCTION forum_user_search_vector_trigger();
+"""
+
+DROP_SQL = """
+DROP TRIGGER IF EXISTS forum_post_search_vector_update ON forum_post;
+DROP TRIGGER IF EXISTS forum_user_search_vector_update ON forum_user;
+DROP FUNCTION IF EXISTS forum_post_search_vector_trigger();
+DROP FUNCTION IF EXISTS forum_user_search_vector_trigger();
+DROP FUNCTION IF EXISTS forum_post_search_vector(text, jsonb);
+DROP FUNCTION IF EXISTS forum_user_search_vector(text, text);
+DROP FUNCTION IF EXISTS forum_editorjs_text(jsonb);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0041_solutionvote'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            EDITORJS_TEXT_FUNCTION + POST_SEARCH_VECTOR_SQL + USER_SEARCH_VECTOR_SQL,
+            DROP_SQL,
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:14
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.text
+
+# Matches forum.services.search_services.FullName; CONCAT() is not IMMUTABLE, so the
+# expression has to use || to be indexable.
+USER_FULL_NAME_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS forum_user_full_name_trgm
+    ON forum_user USING gin ((first_name || ' ' || last_name) gin_trgm_ops);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0042_search_vector_triggers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('name', name='gin_trgm_ops'), name='course_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='course_name_upper_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='coursealias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('name', name='gin_trgm_ops'), name='coursealias_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='coursealias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='coursealias_name_upper_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('title', name='gin_trgm_ops'), name='post_title_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='user_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('first_name', name='gin_trgm_ops'), name='user_first_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('last_name', name='gin_trgm_ops'), name='user_last_name_trgm'),
+        ),
+        migrations.RunSQL(
+            USER_FULL_NAME_INDEX_SQL,
+            'DROP INDEX IF EXISTS forum_user_full_name_trgm;',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0044_pushticket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WolfNetSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('encrypted_cookies', models.TextField()),
+                ('student_id', models.CharField(max_length=32)),
+                ('sections', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('validated_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='wolfnet_session', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
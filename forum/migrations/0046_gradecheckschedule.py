@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0045_wolfnetsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeCheckSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('next_check_at', models.DateTimeField(db_index=True)),
+                ('interval', models.DurationField()),
+                ('last_checked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_change_at', models.DateTimeField(blank=True, null=True)),
+                ('checks', models.PositiveIntegerField(default=0)),
+                ('changes_detected', models.PositiveIntegerField(default=0)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='grade_check_schedule', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
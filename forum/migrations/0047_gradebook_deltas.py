@@ -0,0 +1,40 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0046_gradecheckschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradebookDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.JSONField()),
+                ('content_hash', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='gradebooksnapshot',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='gradebooksnapshot',
+            index=models.Index(fields=['user', 'section_id', 'marking_period_id', '-timestamp'], name='gradebook_snapshot_latest'),
+        ),
+        migrations.AddField(
+            model_name='gradebookdelta',
+            name='snapshot',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deltas', to='forum.gradebooksnapshot'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0047_gradebook_deltas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyschedule',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:41
+
+from django.db import migrations, models
+
+
+# Walks every thread from its root in one statement; segments match Comment.make_path
+BACKFILL_COMMENT_PATHS = """
+WITH RECURSIVE tree (id, path, depth) AS (
+    SELECT id, lpad(id::text, 10, '0') || '/', 0
+    FROM forum_comment
+    WHERE parent_id IS NULL
+  UNION ALL
+    SELECT c.id, tree.path || lpad(c.id::text, 10, '0') || '/', tree.depth + 1
+    FROM forum_comment c
+    JOIN tree ON c.parent_id = tree.id
+)
+UPDATE forum_comment
+SET path = tree.path, depth = tree.depth
+FROM tree
+WHERE forum_comment.id = tree.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0048_dailyschedule_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.TextField(db_index=True, default='', editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_COMMENT_PATHS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.16 on 2026-10-17 23:42
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+CONTENT_DERIVED_FIELDS = ('preview_text', 'first_image_url', 'body_text')
+
+
+def backfill_post_content(apps, schema_editor):
+    # Same extraction as Post.save() and `manage.py backfill_post_content`, so existing
+    # posts have their columns as soon as the code that reads them is deployed
+    from forum.services.utils import extract_post_content
+    Post = apps.get_model('forum', 'Post')
+
+    last_id = 0
+    while True:
+        posts = list(Post.objects.filter(id__gt=last_id).order_by('id').only('id', 'content')[:BATCH_SIZE])
+        if not posts:
+            break
+        for post in posts:
+            for field, value in extract_post_content(post.content).items():
+                setattr(post, field, value)
+        Post.objects.bulk_update(posts, CONTENT_DERIVED_FIELDS)
+        last_id = posts[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0049_comment_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='body_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='first_image_url',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='preview_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(backfill_post_content, migrations.RunPython.noop),
+    ]
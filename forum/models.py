@@ -1,14 +1,17 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
-from django.contrib.postgres.search import SearchVectorField, SearchVector
+from django.contrib.postgres.search import SearchVectorField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from django.urls import reverse
 import os
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import BaseUserManager
 from django.utils import timezone
 import base64
+import json
 from django.conf import settings
 from cryptography.fernet import Fernet
 import logging
@@ -120,29 +123,98 @@ class User(AbstractUser):
     def get_absolute_url(self):
         return reverse('profile', args=[str(self.username)]) 
     
+    # Maintained by the forum_user_search_vector_trigger database trigger (migration 0042)
     search_vector = SearchVectorField(null=True, blank=True)
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        search_vector = (
-            SearchVector('first_name', weight='A') +
-            SearchVector('last_name', weight='A')
-        )
-        User.objects.filter(id=self.id).update(search_vector=search_vector)
+    class Meta(AbstractUser.Meta):
+        # Full-name trigram index (first_name || ' ' || last_name) is created in migration 0043
+        indexes = [
+            GinIndex(fields=['search_vector'], name='user_search_vector_gin'),
+            GinIndex(OpClass('first_name', name='gin_trgm_ops'), name='user_first_name_trgm'),
+            GinIndex(OpClass('last_name', name='gin_trgm_ops'), name='user_last_name_trgm'),
+        ]
 
 class GradebookSnapshot(models.Model):
+    """
+    Latest known assignments of a user's section in a marking period. Rewritten only when
+    content_hash changes; each rewrite appends a GradebookDelta.
+    """
     user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='gradebook_snapshots')
     section_id = models.CharField(max_length=32)
     marking_period_id = models.CharField(max_length=32)
     json_data = models.JSONField()
+    # forum.services.gradebook_diff.content_hash of json_data; blank for rows saved before hashing
+    content_hash = models.CharField(max_length=64, blank=True, default='')
     timestamp = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ('user', 'section_id', 'marking_period_id', 'timestamp')
+        indexes = [
+            models.Index(fields=['user', 'section_id', 'marking_period_id', '-timestamp'], name='gradebook_snapshot_latest'),
+        ]
 
     def __str__(self):
         return f"Snapshot for {self.user.school_email} | Section {self.section_id} | MP {self.marking_period_id} @ {self.timestamp}"
+
+class GradebookDelta(models.Model):
+    """
+    Append-only history of a snapshot. Each row holds what one rewrite changed, both
+    ways (forum.services.gradebook_diff.build_delta): the new versions to replay it and
+    the old versions to undo it, so rebuild_states can step the latest json_data back
+    to any earlier state. Unchanged assignments are never stored.
+    """
+    snapshot = models.ForeignKey(GradebookSnapshot, on_delete=models.CASCADE, related_name='deltas')
+    delta = models.JSONField()
+    content_hash = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"Delta for snapshot {self.snapshot_id} @ {self.created_at}"
     
+class WolfNetSession(models.Model):
+    """
+    Authenticated WolfNet (myschoolapp) session captured after a Selenium login, so
+    grade checks can poll the gradebook API over plain HTTP until the session dies.
+    Cookies are stored Fernet-encrypted with settings.FERNET_KEY.
+    """
+    user = models.OneToOneField('User', on_delete=models.CASCADE, related_name='wolfnet_session')
+    encrypted_cookies = models.TextField()
+    student_id = models.CharField(max_length=32)
+    # [{"section_id": "114310942", "course_name": "Math 10"}, ...] as listed on the progress page
+    sections = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    validated_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    def set_cookies(self, cookies):
+        self.encrypted_cookies = Fernet(settings.FERNET_KEY.encode()).encrypt(json.dumps(cookies).encode()).decode()
+
+    def get_cookies(self):
+        return json.loads(Fernet(settings.FERNET_KEY.encode()).decrypt(self.encrypted_cookies.encode()))
+
+    def __str__(self):
+        return f"WolfNet session for {self.user.school_email} (expires {self.expires_at})"
+
+class GradeCheckSchedule(models.Model):
+    """
+    When a user's grades are next checked. The interval shrinks when checks find changes
+    and grows while they don't (forum/services/grade_check_schedule_services.py).
+    """
+    user = models.OneToOneField('User', on_delete=models.CASCADE, related_name='grade_check_schedule')
+    next_check_at = models.DateTimeField(db_index=True)
+    interval = models.DurationField()
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    last_change_at = models.DateTimeField(null=True, blank=True)
+    checks = models.PositiveIntegerField(default=0)
+    # Checks that found at least one grade change
+    changes_detected = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Grade checks for {self.user.school_email} every {self.interval} (next {self.next_check_at})"
+
 class Block(models.Model):
     code = models.CharField(max_length=8, unique=True)  # e.g. '1A', '2C'
     label = models.CharField(max_length=64, blank=True)
@@ -158,23 +230,44 @@ class Course(models.Model):
     max_grade = models.IntegerField(null=True, blank=True)
     blocks = models.ManyToManyField(Block, blank=True, related_name='courses')
     
+    class Meta:
+        indexes = [
+            GinIndex(OpClass('name', name='gin_trgm_ops'), name='course_name_trgm'),
+            # istartswith/icontains compile to UPPER(name) LIKE ...
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='course_name_upper_trgm'),
+        ]
+
     def __str__(self):
         return f"{self.name}"
     
 class CourseAlias(models.Model):
     name = models.CharField(max_length=100)
     course = models.ForeignKey(Course, related_name='aliases', on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [
+            GinIndex(OpClass('name', name='gin_trgm_ops'), name='coursealias_name_trgm'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='coursealias_name_upper_trgm'),
+        ]
     
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.JSONField() 
     created_at = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    # Maintained by the forum_post_search_vector_trigger database trigger (migration 0042)
     search_vector = SearchVectorField(null=True, blank=True)
     courses = models.ManyToManyField(Course, related_name='posts', blank=True)
     solved = models.BooleanField(default = False)
     views = models.IntegerField(default = 0)
     is_anonymous = models.BooleanField(default=False)
+
+    # Denormalized counters, kept in sync with F() updates by the like/follow/solution/comment
+    # services. `manage.py reconcile_counters` repairs any drift.
+    likes_count = models.IntegerField(default=0)
+    followers_count = models.IntegerField(default=0)
+    solution_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
     
     accepted_solution = models.OneToOneField(
         'Solution',
@@ -184,22 +277,42 @@ class Post(models.Model):
         related_name='accepted_for'
     )
 
+    # Derived from content on every save that writes content (see save());
+    # migration 0050 filled existing rows; `manage.py backfill_post_content` re-derives them
+    preview_text = models.TextField(blank=True, default='')
+    first_image_url = models.TextField(null=True, blank=True)
+    body_text = models.TextField(blank=True, default='')
+
+    CONTENT_DERIVED_FIELDS = ('preview_text', 'first_image_url', 'body_text')
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+            GinIndex(OpClass('title', name='gin_trgm_ops'), name='post_title_trgm'),
+        ]
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            from forum.services.utils import extract_post_content
+            for field, value in extract_post_content(self.content).items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.CONTENT_DERIVED_FIELDS)
         super().save(*args, **kwargs)
-        search_vector = (
-            SearchVector('title', weight='A') +
-            SearchVector('content', weight='B')
-        )
-        Post.objects.filter(id=self.id).update(search_vector=search_vector)
 
     def get_absolute_url(self):
         return reverse('post_detail', args=[self.id])
 
     def like_count(self):
-        return self.likes.count()
+        return self.likes_count
+
+    @property
+    def total_response_count(self):
+        return self.solution_count + self.comment_count
 
     def is_liked_by(self, user):
         if not user.is_authenticated:
@@ -210,30 +323,8 @@ class Post(models.Model):
         return "Anonymous" if self.is_anonymous else self.author
     
     def get_first_image_url(self):
-        """Extract the first image URL from the post content JSON"""
-        try:
-            import json
-            
-            content = self.content
-            if isinstance(content, str):
-                content = json.loads(content)
-            
-            if not isinstance(content, dict) or 'blocks' not in content:
-                return None
-            
-            for block in content.get('blocks', []):
-                if isinstance(block, dict) and block.get('type') == 'image':
-                    if 'data' in block and 'file' in block['data']:
-                        file_data = block['data']['file']
-                        if isinstance(file_data, dict) and 'url' in file_data:
-                            return file_data['url']
-                        elif isinstance(file_data, str):
-                            return file_data
-            
-            return None
-            
-        except (json.JSONDecodeError, AttributeError, TypeError):
-            return None
+        """First image URL in the post content, stored on save"""
+        return self.first_image_url
     
 class SavedPost(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="saved_posts")
@@ -257,6 +348,24 @@ class FollowedPost(models.Model):
     def __str__(self):
         return f"{self.user.username} follows {self.post.title}"
 
+class FeedEntry(models.Model):
+    """
+    Materialized row of a user's For You feed. created_at mirrors the post's
+    creation time so a feed page is a single range scan over the user's index.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="feed_entries")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="feed_entries")
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'post')
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-post'], name='feedentry_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} in {self.user_id}'s feed"
+
 class File(models.Model):
     post = models.ForeignKey('Post', related_name='files', on_delete=models.CASCADE, null=True, blank=True)
     file = models.FileField(upload_to='uploads/')
@@ -278,6 +387,36 @@ class File(models.Model):
     def filename(self):
         return os.path.basename(self.file.name)
 
+class ImageAsset(models.Model):
+    """
+    An Editor.js image upload. The original is stored as uploaded and replaced by
+    resized WebP/JPEG variants once process_image_asset_task has run
+    (forum/services/image_services.py).
+    """
+    PENDING = 'pending'
+    READY = 'ready'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (READY, 'Ready'),
+        (FAILED, 'Failed'),
+    ]
+
+    key = models.CharField(max_length=32, unique=True)
+    # Storage path of the upload as received; emptied once the variants exist
+    original = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # {variant: {"width", "height", "webp": url, "jpeg": url}}
+    variants = models.JSONField(default=dict, blank=True)
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='image_assets')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.key} ({self.status})"
+
 class Solution(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='solutions')
     author = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -285,6 +424,9 @@ class Solution(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     upvotes = models.IntegerField(default=0)
     downvotes = models.IntegerField(default=0)
+    # Denormalized counters, see Post
+    comment_count = models.IntegerField(default=0)
+    root_comment_count = models.IntegerField(default=0)
 
     def __str__(self):
         return f'Solution by {self.author.username} for {self.post.title}'
@@ -296,7 +438,7 @@ class Solution(models.Model):
         return f"{self.post.get_absolute_url()}#solution-{self.id}"
     
     def root_comments_count(self):
-        return self.comments.filter(parent__isnull=True).count()
+        return self.root_comment_count
 
         
 
@@ -317,6 +459,12 @@ class Comment(models.Model):
     content = models.JSONField() 
     created_at = models.DateTimeField(auto_now_add=True)
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies') 
+    # Materialized path: the zero-padded ids of the root down to this comment, each followed
+    # by "/". A subtree is a prefix range and sorting by path gives thread order.
+    path = models.TextField(default='', db_index=True, editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
+
+    PATH_SEGMENT_WIDTH = 10
 
     class Meta:
         ordering = ['created_at']
@@ -324,32 +472,49 @@ class Comment(models.Model):
     def __str__(self):
         return f'Comment by {self.author.username}'
     
+    @classmethod
+    def make_path(cls, parent_path, comment_id):
+        return f"{parent_path}{comment_id:0{cls.PATH_SEGMENT_WIDTH}d}/"
+
+    def save(self, *args, **kwargs):
+        # The path ends in the comment's own id, so it is written right after the insert
+        creating = self._state.adding
+        if creating and self.parent_id:
+            self.depth = self.parent.depth + 1
+        super().save(*args, **kwargs)
+        if creating and not self.path:
+            self.path = Comment.make_path(self.parent.path if self.parent_id else '', self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
+
     @property
     def replies(self):
         return Comment.objects.filter(parent=self).order_by('created_at')
+
+    def subtree(self):
+        """This comment and all its nested replies in thread order, as one range query"""
+        return Comment.objects.filter(
+            solution_id=self.solution_id, path__startswith=self.path
+        ).order_by('path')
     
     def get_absolute_url(self):
         return f'#comment-{self.id}'
     
     def get_depth(self):
-        """Calculate the nesting depth of this comment"""
-        depth = 0
-        parent = self.parent
-        while parent:
-            depth += 1
-            parent = parent.parent
-        return min(depth, 5)  # Limit maximum nesting depth to 5
-
-class SolutionUpvote(models.Model):
-    solution = models.ForeignKey(Solution, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-
-    class Meta:
-        unique_together = ('solution', 'user')
+        """Nesting depth of this comment"""
+        return min(self.depth, 5)  # Limit maximum nesting depth to 5
+
+class SolutionVote(models.Model):
+    UPVOTE = 1
+    DOWNVOTE = -1
+    VALUE_CHOICES = (
+        (UPVOTE, 'Upvote'),
+        (DOWNVOTE, 'Downvote'),
+    )
 
-class SolutionDownvote(models.Model):
-    solution = models.ForeignKey(Solution, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    solution = models.ForeignKey(Solution, on_delete=models.CASCADE, related_name='votes')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='solution_votes')
+    value = models.SmallIntegerField(choices=VALUE_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ('solution', 'user')
@@ -418,6 +583,9 @@ class UserProfile(models.Model):
         help_text="Expo push notification token for mobile app notifications"
     )
 
+    # Set once the user's For You feed has been materialized into FeedEntry rows
+    feed_materialized_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         return f"{self.user.username}'s profile"
 
@@ -441,6 +609,8 @@ class DailySchedule(models.Model):
     block_8_time = models.CharField(max_length=50, blank=True, null=True)
     ceremonial_uniform = models.BooleanField(null = True)
     is_school = models.BooleanField(null = True)
+    # Last-Modified of the schedule API; bulk updates from the sheet sync set it explicitly
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Schedule for {self.date}"
@@ -477,6 +647,46 @@ def save_user_profile(sender, instance, **kwargs):
     except UserProfile.DoesNotExist:
         UserProfile.objects.create(user=instance)
 
+@receiver([post_save, post_delete], sender=DailySchedule)
+def invalidate_cached_day_schedules(sender, instance, **kwargs):
+    """Admin edits and deletes of a day must reach the cached block orders"""
+    from forum.services.schedule_services import invalidate_day_schedules
+    invalidate_day_schedules()
+
+@receiver(post_save, sender=Post)
+def fan_out_created_post(sender, instance, created, **kwargs):
+    """Add a newly created post to the feeds of everyone who should see it"""
+    if created:
+        from forum.services.feed_services import schedule_post_fan_out
+        schedule_post_fan_out(instance.id)
+
+@receiver(m2m_changed, sender=Post.courses.through)
+def fan_out_post_course_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Re-target a post's feed entries when its courses change"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    from forum.services.feed_services import schedule_post_fan_out
+    if not reverse:
+        schedule_post_fan_out(instance.id)
+    else:
+        for post_id in pk_set or []:
+            schedule_post_fan_out(post_id)
+
+@receiver([post_save, post_delete], sender=UserCourseExperience)
+@receiver([post_save, post_delete], sender=UserCourseHelp)
+def rebuild_feed_on_course_interest_change(sender, instance, **kwargs):
+    """Experience and help courses decide which posts land in a user's feed"""
+    from forum.services.feed_services import schedule_user_feed_rebuild
+    schedule_user_feed_rebuild(instance.user_id)
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=CourseAlias)
+@receiver([post_save, post_delete], sender=UserCourseExperience)
+def invalidate_course_search_index_on_change(sender, instance, **kwargs):
+    """Course autocomplete serves names, aliases and experienced counts from memory"""
+    from forum.services.course_search_index import invalidate_course_search_index
+    invalidate_course_search_index()
+
 @receiver(pre_delete, sender='forum.Solution')
 def delete_solution_files(sender, instance, **kwargs):
     """Delete files referenced in solution content before deleting the solution"""
@@ -529,6 +739,17 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+
+class PushTicket(models.Model):
+    """An Expo push ticket awaiting its delivery receipt"""
+    ticket_id = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='push_tickets')
+    # Token the message was sent to; only this token is cleared if Expo reports it dead
+    expo_push_token = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Push ticket {self.ticket_id} for user {self.user_id}"
         
 class UpdateAnnouncement(models.Model):
     title = models.CharField(max_length=200)
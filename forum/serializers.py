@@ -1,7 +1,6 @@
 from rest_framework import serializers
 from .models import Post, Solution, Comment, User, UserProfile, Course
 from django.utils.timezone import localtime
-from .services.utils import process_post_preview
 
 class CourseSerializer(serializers.ModelSerializer):
     is_experienced = serializers.SerializerMethodField()
@@ -166,6 +165,7 @@ class PostListSerializer(serializers.ModelSerializer):
     comment_count = serializers.SerializerMethodField()
     solved = serializers.SerializerMethodField()
     first_image_url = serializers.SerializerMethodField()
+    card_image_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Post
@@ -173,7 +173,7 @@ class PostListSerializer(serializers.ModelSerializer):
             'id', 'title', 'author', 'author_name', 'preview_text', 
             'created_at', 'courses', 'reply_count', 'views', 'like_count', 
             'is_liked', 'solution_count', 'comment_count', 'solved', 'is_following',
-            'first_image_url'
+            'first_image_url', 'card_image_url'
         ]
     
     def get_author_name(self, obj):
@@ -182,18 +182,23 @@ class PostListSerializer(serializers.ModelSerializer):
         return obj.author.get_full_name() if obj.author else "Unknown"
     
     def get_preview_text(self, obj):
-        return process_post_preview(obj)
+        return obj.preview_text
     
     def get_created_at(self, obj):
         return localtime(obj.created_at).isoformat()
     
     def get_courses(self, obj):
+        # Posts from hydrate_post_cards already carry the serialized course context
+        if hasattr(obj, 'course_context'):
+            return obj.course_context
         return CourseSerializer(obj.courses.all(), many=True, context=self.context).data
     
     def get_reply_count(self, obj):
-        return getattr(obj, 'total_response_count', 0)
+        return obj.total_response_count
     
     def get_is_liked(self, obj):
+        if hasattr(obj, 'is_liked_by_user'):
+            return obj.is_liked_by_user
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.is_liked_by(request.user)
@@ -201,6 +206,8 @@ class PostListSerializer(serializers.ModelSerializer):
     
     def get_is_following(self, obj):
         """Check if the current user is following this post"""
+        if hasattr(obj, 'is_following'):
+            return obj.is_following
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             from .models import FollowedPost
@@ -208,20 +215,24 @@ class PostListSerializer(serializers.ModelSerializer):
         return False
     
     def get_like_count(self, obj):
-        return obj.like_count()
+        return obj.likes_count
     
     def get_solution_count(self, obj):
-        return getattr(obj, 'solution_count', obj.solutions.count())
+        return obj.solution_count
     
     def get_comment_count(self, obj):
-        return getattr(obj, 'comment_count', 0)
+        return obj.comment_count
     
     def get_solved(self, obj):
         return obj.solved
     
     def get_first_image_url(self, obj):
-        """Extract the first image URL from the post content JSON"""
-        return obj.get_first_image_url()
+        return obj.first_image_url
+
+    def get_card_image_url(self, obj):
+        """Card-sized JPEG of the first image once processed, else the first image itself"""
+        variants = getattr(obj, 'image_variants', None)
+        return variants['card']['jpeg'] if variants else obj.first_image_url
 
 class PostDetailSerializer(serializers.ModelSerializer):
     """Serializer for individual post views"""
@@ -268,10 +279,10 @@ class PostDetailSerializer(serializers.ModelSerializer):
         return False
     
     def get_solution_count(self, obj):
-        return getattr(obj, 'solution_count', obj.solutions.count())
+        return obj.solution_count
     
     def get_comment_count(self, obj):
-        return getattr(obj, 'comment_count', 0)
+        return obj.comment_count
     
     def get_solutions(self, obj):
         """Return solutions using SolutionSerializer with proper ordering"""
@@ -323,9 +334,9 @@ class CommentSerializer(serializers.ModelSerializer):
         return localtime(obj.created_at).isoformat()
     
     def get_replies(self, obj):
-        if hasattr(obj, 'replies'):
-            return CommentSerializer(obj.replies.all(), many=True, context=self.context).data
-        return []
+        # Threads loaded with build_comment_trees already carry their replies
+        replies = obj.children if hasattr(obj, 'children') else obj.replies.all()
+        return CommentSerializer(replies, many=True, context=self.context).data
     
     def get_depth(self, obj):
         return obj.get_depth()
@@ -369,7 +380,9 @@ class SolutionSerializer(serializers.ModelSerializer):
     
     def get_comments(self, obj):
         """Get formatted comments for this solution"""
-        comments = obj.comments.select_related('author').order_by('created_at')
+        from .services.post_detail_services import build_comment_trees
+        comments = list(obj.comments.select_related('author__userprofile').order_by('path'))
+        build_comment_trees(comments)
         return CommentSerializer(comments, many=True, context=self.context).data
     
     def get_is_accepted(self, obj):
@@ -2,6 +2,7 @@ from django.contrib.auth import login
 from django.http import JsonResponse
 from django.views.decorators.csrf import ensure_csrf_cookie
 from forum.models import User, UserCourseHelp, UserCourseExperience
+from forum.services.schedule_services import invalidate_block_course_names
 
 def authenticate_user(request, school_email, password):
     try:
@@ -53,6 +54,7 @@ def register_user(request, form, help_courses, experience_courses, wolfnet_passw
                     except Course.DoesNotExist:
                         pass
             user.userprofile.save()
+            invalidate_block_course_names(user.id)
         
         # Add help courses
         for course_id in help_courses:
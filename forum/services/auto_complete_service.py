@@ -2,28 +2,12 @@
 Service for handling auto-completion of courses from WolfNet
 """
 import logging
-from django.http import JsonResponse
 from forum.tasks import auto_complete_courses
-from django.conf import settings
+from forum.services.wolfnet_job_service import start_wolfnet_job
 
 logger = logging.getLogger(__name__)
 
 
-def _execute_task_with_result(task_func, *args, **kwargs):
-    """
-    Execute a Celery task either synchronously or asynchronously based on result backend configuration.
-    """
-    result_backend_disabled = getattr(settings, 'CELERY_RESULT_BACKEND', None) is None
-    
-    if result_backend_disabled:
-        # Run task synchronously when result backend is disabled
-        return task_func(*args, **kwargs)
-    else:
-        # Run asynchronously with result retrieval
-        task = task_func.delay(*args, **kwargs)
-        return task.get(timeout=60)
-
-
 def auto_complete_user_courses_service(user, wolfnet_password=None):
     """
     Auto-complete courses for a logged-in user from their WolfNet schedule
@@ -38,6 +22,9 @@ def auto_complete_user_courses_service(user, wolfnet_password=None):
                                         If not provided, will use the password stored
                                         in the user's profile. Defaults to None.
 
+    Returns:
+        dict: {"job_id", "status": "pending"} to poll with get_wolfnet_job_status,
+              or an error with "success": False
     """
     try:
         # Use provided password or get from user profile
@@ -61,11 +48,11 @@ def auto_complete_user_courses_service(user, wolfnet_password=None):
         
         # Start the auto-complete task
         if password:
-            result = _execute_task_with_result(auto_complete_courses, school_email, password)
+            result = start_wolfnet_job(auto_complete_courses, school_email, password, user=user)
         else:
-            result = _execute_task_with_result(auto_complete_courses, school_email)
+            result = start_wolfnet_job(auto_complete_courses, school_email, user=user)
         
-        logger.info(f"Auto-complete courses result for {user.username}: {result}")
+        logger.info(f"Auto-complete courses job for {user.username}: {result.get('status')}")
         
         return result
         
@@ -94,6 +81,10 @@ def auto_complete_courses_registration_service(school_email, wolfnet_password):
                               This is required and must be a valid, non-empty string.
                               The password is used only for this operation and is not
                               stored permanently during registration.
+
+    Returns:
+        dict: {"job_id", "status": "pending"} to poll with get_wolfnet_job_status,
+              or an error with "success": False
     """
     try:
         if not wolfnet_password:
@@ -109,9 +100,9 @@ def auto_complete_courses_registration_service(school_email, wolfnet_password):
             }
         
         # Start the auto-complete task
-        result = _execute_task_with_result(auto_complete_courses, school_email, wolfnet_password)
+        result = start_wolfnet_job(auto_complete_courses, school_email, wolfnet_password)
         
-        logger.info(f"Auto-complete courses result for registration {school_email}: {result}")
+        logger.info(f"Auto-complete courses job for registration {school_email}: {result.get('status')}")
         
         return result
         
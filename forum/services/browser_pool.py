@@ -0,0 +1,383 @@
+import atexit
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import threading
+import time
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from django.conf import settings
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+logger = logging.getLogger(__name__)
+
+# Origins a WolfNet login leaves storage on; cleared between users along with all cookies
+RESET_ORIGINS = [
+    "https://wpga.myschoolapp.com",
+    "https://app.blackbaud.com",
+    "https://login.microsoftonline.com",
+    "https://login.live.com",
+]
+
+
+def get_memory_optimized_chrome_options():
+    """
+    Get Chrome options optimized for low memory usage and crash prevention
+    
+    Returns:
+        Options: Configured Chrome options
+    """
+    chrome_options = Options()
+    
+    # Check if running locally vs Heroku to prevent segfaults in local dev
+    is_heroku = os.environ.get('CHROME_BIN') is not None
+    
+    if is_heroku:
+        chrome_options.add_argument("--headless=new")  # Force headless mode for production
+    else:
+        # Local development - avoid headless to prevent segfaults
+        logger.info("Running locally - GUI mode enabled to prevent segmentation faults")
+    
+    # Essential crash prevention flags
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    
+    # Critical flags to prevent segfaults in fork processes
+    # Only add zygote/single-process flags on Linux/Heroku where forking issues are common.
+    # These flags are known to cause Chrome to crash or close the DevTools connection on macOS.
+    try:
+        system_name = platform.system().lower()
+    except Exception:
+        system_name = ''
+
+    add_isolation_flags = False
+    # If running on Heroku (CHROME_BIN set) or on Linux, enable these isolation flags
+    if os.environ.get('CHROME_BIN') is not None or system_name == 'linux':
+        add_isolation_flags = True
+
+    if add_isolation_flags:
+        chrome_options.add_argument("--no-zygote")  # Disable zygote process
+        chrome_options.add_argument("--single-process")  # Force single process mode
+    else:
+        logger.debug(f"Skipping --no-zygote/--single-process flags on platform={system_name}")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    
+    # Disable problematic features that can cause crashes
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-software-rasterizer")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-translate")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+    chrome_options.add_argument("--disable-ipc-flooding-protection")
+    
+    # Memory and stability
+    # chrome_options.add_argument("--max_old_space_size=4096")
+    # chrome_options.add_argument("--no-first-run")
+    # chrome_options.add_argument("--no-default-browser-check")
+    
+    # Only disable images if not causing redirect issues
+    # chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
+    # Set a safer page load strategy (normal) to ensure redirects complete
+    chrome_options.set_capability("pageLoadStrategy", "normal")
+    
+    # Configure Chrome binary location for Heroku
+    chrome_bin = os.environ.get('CHROME_BIN')
+    if chrome_bin:
+        chrome_options.binary_location = chrome_bin
+        logger.info(f"Using Chrome binary from environment: {chrome_bin}")
+    
+    return chrome_options
+
+
+def create_webdriver_with_cleanup():
+    """
+    Create a WebDriver with proper cleanup handling using enhanced isolation
+    
+    Returns:
+        tuple: (driver, temp_user_data_dir)
+    """
+    # Create a unique temporary user-data-dir per run to avoid conflicts
+    # when multiple WebDriver instances are created concurrently.
+    chrome_options = get_memory_optimized_chrome_options()
+
+    temp_user_data_dir = None
+    try:
+        temp_user_data_dir = tempfile.mkdtemp(prefix='chrome_user_data_')
+        # Ensure directory was created
+        if temp_user_data_dir and os.path.isdir(temp_user_data_dir):
+            chrome_options.add_argument(f"--user-data-dir={temp_user_data_dir}")
+    except Exception:
+        # If creation fails, proceed without explicitly setting user-data-dir.
+        temp_user_data_dir = None
+
+    chrome_options.add_argument("--incognito")
+
+    # Create ChromeDriver service
+    from selenium.webdriver.chrome.service import Service
+    service = Service()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_window_size(1000, 1000)
+    logger.info(f"Created WebDriver using temp user-data-dir: {temp_user_data_dir}")
+    return driver, temp_user_data_dir
+
+
+def _process_tree_rss_mb(root_pid):
+    """
+    Resident memory of a process and all of its descendants, read from /proc.
+    Returns None where /proc is unavailable (local development on macOS).
+    """
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; ppid is the second field after it
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except OSError:
+            pass
+        stack.extend(children.get(pid, []))
+    return total / (1024 * 1024)
+
+
+class PooledBrowser:
+    """A Chrome instance owned by a BrowserPool, with the bookkeeping used to recycle it"""
+
+    def __init__(self, driver, temp_user_data_dir):
+        self.driver = driver
+        self.temp_user_data_dir = temp_user_data_dir
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+    @property
+    def pid(self):
+        process = getattr(self.driver.service, 'process', None)
+        return process.pid if process else None
+
+    def is_healthy(self):
+        """chromedriver is running and the browser still executes scripts"""
+        try:
+            process = getattr(self.driver.service, 'process', None)
+            if process is not None and process.poll() is not None:
+                return False
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset(self):
+        """Leave the browser as a fresh profile would be: one blank tab, no cookies or site storage"""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+        self.driver.get("about:blank")
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        for origin in RESET_ORIGINS:
+            self.driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+    def rss_mb(self):
+        pid = self.pid
+        return _process_tree_rss_mb(pid) if pid else None
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting driver: {e}")
+        if self.temp_user_data_dir:
+            shutil.rmtree(self.temp_user_data_dir, ignore_errors=True)
+            logger.info(f"Removed temp user-data-dir: {self.temp_user_data_dir}")
+
+
+class BrowserPool:
+    """
+    Per-process pool of warm Chrome instances for the Selenium WolfNet tasks. Browsers
+    are reset between users and replaced when they fail a health check or exceed their
+    use count, age or resident memory.
+
+    Usage:
+        browser = pool.acquire()
+        try:
+            ... browser.driver ...
+        finally:
+            pool.release(browser)
+    """
+
+    def __init__(self, size=1, max_uses=25, max_rss_mb=450, max_age=3600, keep_warm=True,
+                 factory=create_webdriver_with_cleanup):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.max_age = max_age
+        self.keep_warm = keep_warm
+        self.factory = factory
+        # Most recently used first: it is the one most likely to still be healthy
+        self._idle = []
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _create(self):
+        started = time.monotonic()
+        browser = PooledBrowser(*self.factory())
+        logger.info(f"Started pooled browser in {time.monotonic() - started:.1f}s")
+        return browser
+
+    def _forget(self, count=1):
+        with self._condition:
+            self._created -= count
+            self._condition.notify()
+
+    def warm(self):
+        """Start browsers until the pool is full"""
+        with self._condition:
+            missing = max(self.size - self._created, 0) if not self._closed else 0
+            self._created += missing
+        for _ in range(missing):
+            try:
+                browser = self._create()
+            except Exception as e:
+                logger.error(f"Could not start pooled browser: {str(e)}")
+                self._forget()
+                continue
+            with self._condition:
+                self._idle.append(browser)
+                self._condition.notify()
+
+    def acquire(self, timeout=None):
+        """
+        Take a healthy browser, starting one if the pool has room.
+
+        Raises:
+            TimeoutError: Every browser stayed busy for `timeout` seconds
+        """
+        with self._condition:
+            while True:
+                if self._idle:
+                    browser = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    browser = None
+                    break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("No pooled browser became available")
+
+        if browser is not None and not browser.is_healthy():
+            logger.warning(f"Replacing unhealthy pooled browser after {browser.uses} uses")
+            browser.quit()
+            browser = None
+        if browser is None:
+            try:
+                browser = self._create()
+            except Exception:
+                self._forget()
+                raise
+        browser.uses += 1
+        return browser
+
+    def release(self, browser):
+        """Reset the browser for the next user, or quit it if it is due for recycling"""
+        reason = self._recycle_reason(browser)
+        if reason is None:
+            try:
+                browser.reset()
+            except Exception as e:
+                reason = f"reset failed: {str(e)}"
+
+        if reason is None:
+            with self._condition:
+                if not self._closed:
+                    self._idle.append(browser)
+                    self._condition.notify()
+                    return
+            reason = "pool closed"
+
+        logger.info(f"Recycling pooled browser after {browser.uses} uses: {reason}")
+        browser.quit()
+        self._forget()
+        if self.keep_warm:
+            self.warm()
+
+    def _recycle_reason(self, browser):
+        if browser.uses >= self.max_uses:
+            return f"{browser.uses} uses"
+        age = time.monotonic() - browser.created_at
+        if age >= self.max_age:
+            return f"{age:.0f}s old"
+        rss = browser.rss_mb()
+        if rss is not None and rss >= self.max_rss_mb:
+            return f"{rss:.0f} MB resident"
+        return None
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            browser.quit()
+        self._forget(len(idle))
+
+
+_pool = None
+_pool_pid = None
+
+
+def get_browser_pool():
+    """This process's BrowserPool, configured from the BROWSER_POOL_* settings"""
+    global _pool, _pool_pid
+    # A forked worker child must not drive its parent's browsers
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = BrowserPool(
+            size=settings.BROWSER_POOL_SIZE,
+            max_uses=settings.BROWSER_MAX_USES,
+            max_rss_mb=settings.BROWSER_MAX_RSS_MB,
+            max_age=settings.BROWSER_MAX_AGE_SECONDS,
+            keep_warm=settings.BROWSER_POOL_PREWARM,
+        )
+        _pool_pid = os.getpid()
+    return _pool
+
+
+@worker_process_init.connect
+def warm_browser_pool(**kwargs):
+    if settings.BROWSER_POOL_PREWARM:
+        get_browser_pool().warm()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_browser_pool(**kwargs):
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close()
+
+
+atexit.register(close_browser_pool)
@@ -1,9 +1,20 @@
 from django.shortcuts import get_object_or_404
 from django.contrib import messages
-from forum.models import Solution, Comment
+from forum.models import Post, Solution, Comment
 from forum.services.notification_services import send_comment_notifications_service
 from forum.services.utils import process_messages_to_json, detect_bad_words
+from forum.services.post_detail_services import build_comment_trees
 from django.template.loader import render_to_string
+from django.db import transaction
+from django.db.models import F
+
+def _adjust_comment_counters(solution_id, delta, root_delta):
+    """Apply a comment count change to a solution and its post with F() updates."""
+    Solution.objects.filter(id=solution_id).update(
+        comment_count=F('comment_count') + delta,
+        root_comment_count=F('root_comment_count') + root_delta
+    )
+    Post.objects.filter(solutions__id=solution_id).update(comment_count=F('comment_count') + delta)
 
 def create_comment_service(request, solution_id, data):
     solution = get_object_or_404(Solution, id=solution_id)
@@ -23,12 +34,14 @@ def create_comment_service(request, solution_id, data):
         parent_comment = None
         if parent_id:
             parent_comment = get_object_or_404(Comment, id=parent_id)
-        comment = Comment.objects.create(
-            solution=solution,
-            author=request.user,
-            content=content,
-            parent=parent_comment
-        )
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                solution=solution,
+                author=request.user,
+                content=content,
+                parent=parent_comment
+            )
+            _adjust_comment_counters(solution.id, 1, 0 if parent_comment else 1)
         send_comment_notifications_service(comment, solution, parent_comment)
         messages.success(request, 'Comment created succesfully')
         return {'status': 'success', 'messages': process_messages_to_json(request)}
@@ -53,13 +66,20 @@ def edit_comment_service(request, comment_id, data):
 
 def delete_comment_service(request, comment_id):
     comment = get_object_or_404(Comment, id=comment_id, author=request.user)
-    comment.delete()
+    if not comment.path:
+        raise ValueError(f"Comment {comment.id} has no tree path")
+    with transaction.atomic():
+        # The whole subtree is one path-prefix range, so replies are not collected level by level
+        _, deleted = comment.subtree().delete()
+        removed = deleted.get(Comment._meta.label, 0)
+        _adjust_comment_counters(comment.solution_id, -removed, 0 if comment.parent_id else -1)
     messages.success(request, 'Solution deleted succesfully')
     return {'status': 'success', 'messages': process_messages_to_json(request)}
 
 def get_comments_service(request, solution_id):
     solution = get_object_or_404(Solution, id=solution_id)
-    comments = Comment.objects.filter(solution=solution).order_by('created_at')
+    comments = list(Comment.objects.filter(solution=solution).select_related('author__userprofile').order_by('created_at', 'id'))
+    root_comments = build_comment_trees(comments)
 
     def process_comment(comment):
         return {
@@ -70,17 +90,17 @@ def get_comments_service(request, solution_id):
                 'id': comment.author.id
             },
             'created_at': comment.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            'replies': [process_comment(reply) for reply in comment.replies.all()]
+            'replies': [process_comment(reply) for reply in comment.children]
         }
     comments_data = [process_comment(comment) for comment in comments]
 
     html = render_to_string('forum/components/comments_list.html', {
-        'comments': comments,
+        'comments': root_comments,
         'solution': solution
     }, request=request)
     return {
         'comments_data': comments_data,
         'html': html,
-        'comments': comments,
+        'comments': root_comments,
         'solution': solution
     }
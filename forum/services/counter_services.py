@@ -0,0 +1,50 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from forum.models import Post, Solution, SolutionVote, Comment, PostLike, FollowedPost
+
+
+def count_subquery(queryset, group_field):
+    """Correlated COUNT(*) subquery over queryset grouped by group_field, defaulting to 0."""
+    counts = queryset.order_by().values(group_field).annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _counter_definitions():
+    """(model, counter field, live count expression) for every denormalized counter."""
+    return [
+        (Post, 'likes_count', count_subquery(PostLike.objects.filter(post=OuterRef('pk')), 'post')),
+        (Post, 'followers_count', count_subquery(FollowedPost.objects.filter(post=OuterRef('pk')), 'post')),
+        (Post, 'solution_count', count_subquery(Solution.objects.filter(post=OuterRef('pk')), 'post')),
+        (Post, 'comment_count', count_subquery(Comment.objects.filter(solution__post=OuterRef('pk')), 'solution__post')),
+        (Solution, 'comment_count', count_subquery(Comment.objects.filter(solution=OuterRef('pk')), 'solution')),
+        (Solution, 'root_comment_count', count_subquery(
+            Comment.objects.filter(solution=OuterRef('pk'), parent__isnull=True), 'solution'
+        )),
+        (Solution, 'upvotes', count_subquery(
+            SolutionVote.objects.filter(solution=OuterRef('pk'), value=SolutionVote.UPVOTE), 'solution'
+        )),
+        (Solution, 'downvotes', count_subquery(
+            SolutionVote.objects.filter(solution=OuterRef('pk'), value=SolutionVote.DOWNVOTE), 'solution'
+        )),
+    ]
+
+
+def reconcile_counters(dry_run=False):
+    """
+    Compare every counter column against a live COUNT and fix the rows that drifted.
+    Each counter is checked and repaired with a single set-based UPDATE.
+
+    Returns:
+        dict: {'<Model>.<field>': number of drifted rows}
+    """
+    drift = {}
+    for model, field, live_count in _counter_definitions():
+        drifted = model.objects.annotate(live_count=live_count).exclude(**{field: F('live_count')})
+        key = f'{model.__name__}.{field}'
+        if dry_run:
+            drift[key] = drifted.count()
+        else:
+            drift[key] = model.objects.filter(
+                id__in=drifted.values('id')
+            ).update(**{field: live_count})
+    return drift
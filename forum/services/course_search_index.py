@@ -0,0 +1,216 @@
+import re
+import threading
+import time
+from collections import defaultdict, namedtuple
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from forum.models import Course, CourseAlias
+
+# Bumped on every catalog change so each worker process notices its copy is stale
+INDEX_VERSION_CACHE_KEY = 'course_search_index:version'
+RESULT_LIMIT = 10
+# Lower than pg_trgm's 0.6 default so partial words ("calc", "chem 1") still match
+WORD_SIMILARITY_THRESHOLD = 0.4
+ALIAS_WEIGHT = 1.25
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+CourseEntry = namedtuple('CourseEntry', ['id', 'name', 'category', 'experienced_count', 'terms', 'name_trigrams', 'alias_trigrams'])
+
+
+def trigrams(text):
+    """pg_trgm-style trigram set: each lower-cased word padded with two spaces in front and one behind."""
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(left, right):
+    """Share of trigrams two strings have in common, like pg_trgm's similarity()."""
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def word_similarity(token_grams, text):
+    """Best share of the token's trigrams found in a single word of text (pg_trgm's `<%`)."""
+    if not token_grams:
+        return 0.0
+    best = 0
+    for word in _WORD_RE.findall(text.lower()):
+        best = max(best, len(token_grams & trigrams(word)))
+    return best / len(token_grams)
+
+
+class PrefixTrie:
+    """Maps every prefix of the inserted terms to the ids of the courses they belong to."""
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, term, course_id):
+        node = self.root
+        for char in term:
+            node = node.setdefault(char, {})
+            node.setdefault(None, set()).add(course_id)
+
+    def lookup(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return node.get(None, set())
+
+
+class CourseSearchIndex:
+    """
+    Immutable snapshot of the course catalog for autocomplete: a prefix trie over
+    course names and aliases, a trigram inverted index, and experienced counts.
+    Ranking follows search_courses_db: prefix matches on the full query
+    first (alias 3, name 2), then summed name similarity + 1.25 x best alias similarity.
+    """
+
+    def __init__(self, courses, aliases):
+        self.entries = {}
+        self.ordered_ids = []
+        self.trie = PrefixTrie()
+        self.trigram_postings = defaultdict(set)
+
+        aliases_by_course = defaultdict(list)
+        for course_id, alias in aliases:
+            aliases_by_course[course_id].append(alias.lower())
+
+        for course_id, name, category, experienced_count in courses:
+            alias_names = aliases_by_course.get(course_id, [])
+            entry = CourseEntry(
+                id=course_id,
+                name=name,
+                category=category,
+                experienced_count=experienced_count,
+                terms=[name.lower()] + alias_names,
+                name_trigrams=trigrams(name),
+                alias_trigrams=[trigrams(alias) for alias in alias_names],
+            )
+            self.entries[course_id] = entry
+            self.ordered_ids.append(course_id)
+
+            for term in entry.terms:
+                self.trie.insert(term, course_id)
+                for gram in trigrams(term):
+                    self.trigram_postings[gram].add(course_id)
+
+    @classmethod
+    def build(cls):
+        """Load the catalog with two queries."""
+        courses = Course.objects.annotate(
+            experienced_count=Count('usercourseexperience')
+        ).order_by('id').values_list('id', 'name', 'category', 'experienced_count')
+        aliases = CourseAlias.objects.values_list('course_id', 'name')
+        return cls(list(courses), list(aliases))
+
+    def _candidates(self, tokens):
+        candidates = set()
+        for token in tokens:
+            candidates |= self.trie.lookup(token)
+
+            token_grams = trigrams(token)
+            sharing = set()
+            for gram in token_grams:
+                sharing |= self.trigram_postings.get(gram, set())
+            for course_id in sharing - candidates:
+                if any(word_similarity(token_grams, term) >= WORD_SIMILARITY_THRESHOLD
+                       for term in self.entries[course_id].terms):
+                    candidates.add(course_id)
+        return candidates
+
+    def _score(self, entry, query, token_grams):
+        if entry.terms[0].startswith(query):
+            starts_with_score = 2
+        elif any(alias.startswith(query) for alias in entry.terms[1:]):
+            starts_with_score = 3
+        else:
+            starts_with_score = 0
+
+        score = 0.0
+        for grams in token_grams:
+            best_alias = max((similarity(alias, grams) for alias in entry.alias_trigrams), default=0.0)
+            score += similarity(entry.name_trigrams, grams) + best_alias * ALIAS_WEIGHT
+        return starts_with_score, score
+
+    def search(self, query, limit=RESULT_LIMIT):
+        """Return up to `limit` course dicts (id, name, category, experienced_count) for query."""
+        query = query.strip().lower()
+        if not query:
+            return [self._as_dict(self.entries[course_id]) for course_id in self.ordered_ids[:limit]]
+
+        tokens = query.split()
+        candidates = self._candidates(tokens)
+
+        if candidates:
+            token_grams = [trigrams(token) for token in tokens]
+            scored = []
+            for course_id in candidates:
+                entry = self.entries[course_id]
+                starts_with_score, score = self._score(entry, query, token_grams)
+                scored.append((-starts_with_score, -score, entry.name, course_id))
+            scored.sort()
+            ids = [course_id for *_, course_id in scored[:limit]]
+        else:
+            # Fallback: substring match on any token
+            ids = [
+                course_id for course_id in self.ordered_ids
+                if any(token in term for token in tokens for term in self.entries[course_id].terms)
+            ][:limit]
+
+        return [self._as_dict(self.entries[course_id]) for course_id in ids]
+
+    @staticmethod
+    def _as_dict(entry):
+        return {
+            "id": entry.id,
+            "name": entry.name,
+            "category": entry.category,
+            "experienced_count": entry.experienced_count,
+        }
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def get_course_search_index():
+    """
+    This process's CourseSearchIndex, rebuilt when another process (or this one)
+    has invalidated it since it was built.
+    """
+    global _index, _index_version
+
+    version = cache.get(INDEX_VERSION_CACHE_KEY)
+    index = _index
+    if index is not None and version == _index_version:
+        return index
+
+    with _index_lock:
+        if _index is None or version != _index_version:
+            _index = CourseSearchIndex.build()
+            _index_version = version
+        return _index
+
+
+def invalidate_course_search_index():
+    """Drop every process's index once the surrounding transaction commits."""
+    def invalidate():
+        global _index
+        _index = None
+        cache.set(INDEX_VERSION_CACHE_KEY, time.time_ns(), None)
+
+    transaction.on_commit(invalidate)
+
+
+def search_courses(query, limit=RESULT_LIMIT):
+    return get_course_search_index().search(query, limit)
@@ -1,8 +1,9 @@
 from django.http import JsonResponse
-from forum.models import Course, UserCourseExperience, UserCourseHelp
+from forum.models import Course, CourseAlias, UserCourseExperience, UserCourseHelp
 from django.db.models import Q, F, Value, IntegerField, Case, When
-from django.db.models.functions import Concat
 from django.contrib.postgres.search import TrigramSimilarity
+from forum.services.trigram_utils import trigram_thresholds
+from forum.services.course_search_index import search_courses, WORD_SIMILARITY_THRESHOLD
 from functools import reduce
 from operator import or_
 
@@ -27,7 +28,15 @@ def get_user_courses(user):
     return experienced_courses, help_needed_courses
 
 def course_search(request):
-    query = request.GET.get('q', '').strip().lower()
+    """Course autocomplete, answered from the in-process CourseSearchIndex."""
+    return JsonResponse(search_courses(request.GET.get('q', '')), safe=False)
+
+def search_courses_db(query):
+    """
+    Database implementation of course autocomplete. No longer on the request path;
+    kept as the reference the CourseSearchIndex is benchmarked against.
+    """
+    query = query.strip().lower()
     
     if not query:
         courses = Course.objects.all().distinct()[:10]
@@ -40,10 +49,14 @@ def course_search(request):
             sim = TrigramSimilarity('name', token) + TrigramSimilarity('aliases__name', token) * 1.25
             similarity_score = sim if similarity_score is None else similarity_score + sim
 
-        # Build prefix (istartswith) Q object
-        starts_with_q = reduce(
+        # Candidate courses: prefix or fuzzy word match on the name or any alias. Each
+        # side is a single-table OR of `%>`/LIKE, answered by the gin_trgm_ops indexes.
+        name_match_q = reduce(
             or_,
-            [Q(name__istartswith=token) | Q(aliases__name__istartswith=token) for token in tokens]
+            [Q(name__istartswith=token) | Q(name__trigram_word_similar=token) for token in tokens]
+        )
+        candidates_q = name_match_q | Q(
+            id__in=CourseAlias.objects.filter(name_match_q).values('course_id')
         )
 
         # Build starts_with_score boost: exact prefix match on full query string
@@ -55,18 +68,19 @@ def course_search(request):
         )
 
         # First pass: fetch matching IDs with deduplication
-        course_ids = Course.objects.annotate(
+        course_ids = Course.objects.filter(
+            candidates_q
+        ).annotate(
             similarity=similarity_score,
             starts_with_score=starts_with_score
-        ).filter(
-            starts_with_q | Q(similarity__gt=0)
         ).order_by(
             '-starts_with_score', '-similarity'
         ).values_list('id', flat=True).distinct()[:10]
 
         # Fetch full course objects (deduplicated and ordered)
-        courses = Course.objects.filter(id__in=course_ids)
-        course_id_list = list(course_ids)  # preserve order
+        with trigram_thresholds(word_similarity=WORD_SIMILARITY_THRESHOLD):
+            course_id_list = list(course_ids)  # preserve order
+        courses = Course.objects.filter(id__in=course_id_list)
         courses = sorted(courses, key=lambda c: course_id_list.index(c.id))
 
         # Fallback if nothing matched
@@ -87,4 +101,4 @@ def course_search(request):
         "experienced_count": UserCourseExperience.objects.filter(course=course).count()
     } for course in courses]
 
-    return JsonResponse(data, safe=False)
\ No newline at end of file
+    return data
\ No newline at end of file
@@ -1,35 +1,85 @@
 """
 Expo Push Notification Service
+
+Pushes are never sent on the request path. Messages are queued in Redis, sent by
+flush_push_queue_task in Expo's 100-message batches over one keep-alive session,
+and their tickets are stored as PushTicket rows until check_push_receipts_task
+collects the receipts. Tokens Expo reports as DeviceNotRegistered are cleared.
 """
+import json
 import requests
 import logging
+from datetime import timedelta
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
+from forum.models import Notification, PushTicket, UserProfile
+from forum.services.utils import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+PUSH_QUEUE_KEY = 'expo_push:queue'
+# Expo accepts at most 100 messages per send request and 1000 ids per receipts request
+PUSH_BATCH_SIZE = 100
+RECEIPT_BATCH_SIZE = 1000
+# Receipts are usually ready within 15 minutes and Expo keeps them for 24 hours
+RECEIPT_DELAY = timedelta(minutes=15)
+TICKET_MAX_AGE = timedelta(hours=24)
+
 class ExpoPushNotificationService:
     """
     Service for sending push notifications via Expo Push Notification API
     """
-    
-    EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
-    
+
     def __init__(self):
         self.access_token = getattr(settings, 'EXPO_ACCESS_TOKEN', None)
-    
+        self._session = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive session shared by every request this process makes to Expo"""
+        if self._session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2))
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2))
+            session.headers.update({
+                'Accept': 'application/json',
+                'Accept-encoding': 'gzip, deflate',
+                'Content-Type': 'application/json',
+            })
+            if self.access_token:
+                session.headers['Authorization'] = f'Bearer {self.access_token}'
+            self._session = session
+        return self._session
+
+    @staticmethod
+    def build_message(to: str, title: str, body: str, data: Optional[Dict] = None, badge: Optional[int] = None, sound: str = 'default') -> Dict:
+        return {
+            'to': to,
+            'title': title,
+            'body': body,
+            'data': data or {},
+            'badge': badge,
+            'sound': sound,
+            'priority': 'high',
+            'channelId': 'default'
+        }
+
     def send_push_notification(
-        self, 
-        to: str, 
-        title: str, 
-        body: str, 
+        self,
+        to: str,
+        title: str,
+        body: str,
         data: Optional[Dict] = None,
         badge: Optional[int] = None,
         sound: str = 'default'
     ) -> Dict:
         """
         Send a push notification to a single Expo push token
-        
+
         Args:
             to: Expo push token
             title: Notification title
@@ -37,190 +87,260 @@ class ExpoPushNotificationService:
             data: Custom data to send with notification
             badge: Badge count to display on app icon
             sound: Sound to play ('default' or None for silent)
-        
+
         Returns:
             Dict with response from Expo API
         """
         if not to or not to.startswith('ExponentPushToken'):
             logger.warning(f"Invalid Expo push token format: {to}")
             return {'success': False, 'error': 'Invalid push token format'}
-        
-        payload = {
-            'to': to,
-            'title': title,
-            'body': body,
-            'data': data or {},
-            'badge': badge,
-            'sound': sound,
-            'priority': 'high',
-            'channelId': 'default'
-        }
-        
-        headers = {
-            'Accept': 'application/json',
-            'Accept-encoding': 'gzip, deflate',
-            'Content-Type': 'application/json',
-        }
-        
-        if self.access_token:
-            headers['Authorization'] = f'Bearer {self.access_token}'
-        
-        try:
-            response = requests.post(
-                self.EXPO_PUSH_URL,
-                json=payload,
-                headers=headers,
-                timeout=10
-            )
-            
-            response_data = response.json()
-            
-            if response.status_code == 200:
-                if 'data' in response_data and len(response_data['data']) > 0:
-                    ticket = response_data['data'][0]
-                    if ticket.get('status') == 'ok':
-                        logger.info(f"Push notification sent successfully to {to}")
-                        return {'success': True, 'ticket': ticket}
-                    else:
-                        error_msg = ticket.get('message', 'Unknown error')
-                        logger.error(f"Expo API error: {error_msg}")
-                        return {'success': False, 'error': error_msg}
-                else:
-                    logger.error("No data in Expo API response")
-                    return {'success': False, 'error': 'No data in response'}
-            else:
-                logger.error(f"HTTP error {response.status_code}: {response_data}")
-                return {'success': False, 'error': f'HTTP {response.status_code}'}
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Network error sending push notification: {str(e)}")
-            return {'success': False, 'error': f'Network error: {str(e)}'}
-        except Exception as e:
-            logger.error(f"Unexpected error sending push notification: {str(e)}")
-            return {'success': False, 'error': f'Unexpected error: {str(e)}'}
-    
+
+        return self.send_bulk_push_notifications([self.build_message(to, title, body, data, badge, sound)])[0]
+
     def send_bulk_push_notifications(self, notifications: List[Dict]) -> List[Dict]:
         """
-        Send multiple push notifications in a single request
-        
+        Send push notifications in as many PUSH_BATCH_SIZE requests as needed
+
         Args:
             notifications: List of notification dictionaries with 'to', 'title', 'body', etc.
-        
+
         Returns:
-            List of response dictionaries
+            List of response dictionaries, one per notification, in order
         """
-        if not notifications:
-            return []
-        
-        headers = {
-            'Accept': 'application/json',
-            'Accept-encoding': 'gzip, deflate',
-            'Content-Type': 'application/json',
-        }
-        
-        if self.access_token:
-            headers['Authorization'] = f'Bearer {self.access_token}'
-        
+        results = []
+        for start in range(0, len(notifications), PUSH_BATCH_SIZE):
+            results.extend(self._send_batch(notifications[start:start + PUSH_BATCH_SIZE]))
+        return results
+
+    def _send_batch(self, notifications: List[Dict]) -> List[Dict]:
         try:
-            response = requests.post(
-                self.EXPO_PUSH_URL,
-                json=notifications,
-                headers=headers,
-                timeout=30
-            )
-            
+            response = self.session.post(settings.EXPO_PUSH_URL, json=notifications, timeout=30)
             response_data = response.json()
-            
+
             if response.status_code == 200 and 'data' in response_data:
                 results = []
-                for i, ticket in enumerate(response_data['data']):
+                for ticket in response_data['data']:
                     if ticket.get('status') == 'ok':
                         results.append({'success': True, 'ticket': ticket})
                     else:
                         error_msg = ticket.get('message', 'Unknown error')
-                        results.append({'success': False, 'error': error_msg})
-                
+                        results.append({'success': False, 'error': error_msg, 'details': ticket.get('details', {})})
+
                 logger.info(f"Sent {len(notifications)} bulk push notifications")
                 return results
             else:
                 logger.error(f"Bulk push notification error: {response_data}")
                 return [{'success': False, 'error': 'Bulk request failed'} for _ in notifications]
-                
+
         except Exception as e:
             logger.error(f"Error sending bulk push notifications: {str(e)}")
             return [{'success': False, 'error': str(e)} for _ in notifications]
 
+    def get_receipts(self, ticket_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch delivery receipts for the given ticket ids
+
+        Returns:
+            Dict of ticket id -> receipt; tickets whose receipt is not ready are absent
+        """
+        receipts = {}
+        for start in range(0, len(ticket_ids), RECEIPT_BATCH_SIZE):
+            response = self.session.post(
+                settings.EXPO_RECEIPTS_URL,
+                json={'ids': ticket_ids[start:start + RECEIPT_BATCH_SIZE]},
+                timeout=30
+            )
+            response.raise_for_status()
+            receipts.update(response.json().get('data', {}))
+        return receipts
+
 
 expo_push_service = ExpoPushNotificationService()
 
+def _unread_counts(user_ids) -> Dict[int, int]:
+    return dict(
+        Notification.objects.filter(
+            recipient_id__in=user_ids, is_read=False
+        ).values('recipient_id').annotate(unread=Count('id')).values_list('recipient_id', 'unread')
+    )
+
+def enqueue_push_messages(entries: List[Dict]) -> int:
+    """
+    Queue push messages for delivery by flush_push_queue_task.
+
+    Args:
+        entries: List of {'user_id': int, 'message': Expo message dict}
+
+    Returns:
+        Number of messages queued
+    """
+    if not entries:
+        return 0
+
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.rpush(PUSH_QUEUE_KEY, *[json.dumps(entry) for entry in entries])
+            return len(entries)
+        except Exception as e:
+            logger.warning(f"Could not queue push messages in Redis, dispatching a task instead: {str(e)}")
+
+    # Without Redis each call gets its own delivery task
+    from forum.tasks import deliver_push_messages_task
+    try:
+        deliver_push_messages_task.delay(entries)
+    except Exception as e:
+        logger.error(f"Failed to queue push delivery: {str(e)}")
+        return 0
+    return len(entries)
+
+def deliver_push_messages(entries: List[Dict]) -> int:
+    """
+    Send queued messages, store a PushTicket for every accepted message and clear
+    tokens Expo rejects outright as DeviceNotRegistered.
+
+    Returns:
+        Number of messages Expo accepted
+    """
+    results = expo_push_service.send_bulk_push_notifications([entry['message'] for entry in entries])
+
+    tickets = []
+    dead_tokens = []
+    for entry, result in zip(entries, results):
+        if result.get('success') and result['ticket'].get('id'):
+            tickets.append(PushTicket(
+                ticket_id=result['ticket']['id'],
+                user_id=entry['user_id'],
+                expo_push_token=entry['message']['to'],
+            ))
+        elif result.get('details', {}).get('error') == 'DeviceNotRegistered':
+            dead_tokens.append((entry['user_id'], entry['message']['to']))
+
+    PushTicket.objects.bulk_create(tickets, ignore_conflicts=True)
+    _prune_tokens(dead_tokens)
+    return len(tickets)
+
+def flush_push_queue(max_batches: int = 20) -> int:
+    """
+    Drain up to max_batches * PUSH_BATCH_SIZE queued messages.
+
+    Returns:
+        Number of messages Expo accepted
+    """
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    limit = max_batches * PUSH_BATCH_SIZE
+    pipeline = client.pipeline()
+    pipeline.lrange(PUSH_QUEUE_KEY, 0, limit - 1)
+    pipeline.ltrim(PUSH_QUEUE_KEY, limit, -1)
+    raw_entries, _ = pipeline.execute()
+
+    entries = [json.loads(raw) for raw in raw_entries]
+    if not entries:
+        return 0
+    return deliver_push_messages(entries)
+
+def check_push_receipts() -> Dict[str, int]:
+    """
+    Collect receipts for tickets at least RECEIPT_DELAY old, clear tokens reported as
+    DeviceNotRegistered and drop tickets that are settled or older than TICKET_MAX_AGE.
+
+    Returns:
+        Dict with counts of 'checked', 'failed' and 'pruned' tickets
+    """
+    now = timezone.now()
+    tickets = list(
+        PushTicket.objects.filter(created_at__lte=now - RECEIPT_DELAY).values_list('ticket_id', 'user_id', 'expo_push_token')
+    )
+    if not tickets:
+        return {'checked': 0, 'failed': 0, 'pruned': 0}
+
+    receipts = expo_push_service.get_receipts([ticket_id for ticket_id, _, _ in tickets])
+
+    failed = 0
+    dead_tokens = []
+    for ticket_id, user_id, token in tickets:
+        receipt = receipts.get(ticket_id)
+        if receipt and receipt.get('status') == 'error':
+            failed += 1
+            error = receipt.get('details', {}).get('error')
+            logger.warning(f"Push ticket {ticket_id} failed: {error or receipt.get('message')}")
+            if error == 'DeviceNotRegistered':
+                dead_tokens.append((user_id, token))
+
+    pruned = _prune_tokens(dead_tokens)
+    PushTicket.objects.filter(ticket_id__in=list(receipts)).delete()
+    PushTicket.objects.filter(created_at__lte=now - TICKET_MAX_AGE).delete()
+    return {'checked': len(receipts), 'failed': failed, 'pruned': pruned}
+
+def _prune_tokens(dead_tokens) -> int:
+    """Clear dead tokens, unless the user has since registered a different one"""
+    pruned = 0
+    for user_id, token in set(dead_tokens):
+        pruned += UserProfile.objects.filter(user_id=user_id, expo_push_token=token).update(expo_push_token=None)
+    if pruned:
+        logger.info(f"Cleared {pruned} unregistered Expo push tokens")
+    return pruned
+
 def send_push_notification_to_user(user, title: str, body: str, data: Optional[Dict] = None) -> Dict:
     """
-    Send a push notification to a specific user
-    
+    Queue a push notification to a specific user
+
     Args:
         user: Django User instance
         title: Notification title
-        body: Notification body  
+        body: Notification body
         data: Custom data to send with notification
-    
+
     Returns:
-        Dict with response from Expo API
+        Dict with 'success' and 'queued'
     """
-    try:
-        user_profile = user.userprofile
-        if not user_profile.expo_push_token:
-            logger.info(f"User {user.get_full_name()} has no push token registered")
-            return {'success': False, 'error': 'No push token registered'}
-        
-        # Get unread notification count for badge
-        unread_count = user.notifications.filter(is_read=False).count()
-        
-        return expo_push_service.send_push_notification(
-            to=user_profile.expo_push_token,
-            title=title,
-            body=body,
-            data=data or {},
-            badge=unread_count
-        )
-        
-    except Exception as e:
-        logger.error(f"Error sending notification to user {user.id}: {str(e)}")
-        return {'success': False, 'error': str(e)}
+    return send_bulk_notifications_to_users([{'user': user, 'title': title, 'body': body, 'data': data}])[0]
 
 def send_bulk_notifications_to_users(users_data: List[Dict]) -> List[Dict]:
     """
-    Send push notifications to multiple users
-    
+    Queue push notifications to multiple users
+
     Args:
         users_data: List of dicts with 'user', 'title', 'body', 'data' keys
-    
+
     Returns:
-        List of response dictionaries
+        List of response dictionaries, one per entry
     """
-    notifications = []
-    
+    results = []
+    entries = []
+    tokens = {}
     for user_data in users_data:
         user = user_data['user']
         try:
-            user_profile = user.userprofile
-            if user_profile.expo_push_token:
-                unread_count = user.notifications.filter(is_read=False).count()
-                
-                notification = {
-                    'to': user_profile.expo_push_token,
-                    'title': user_data['title'],
-                    'body': user_data['body'],
-                    'data': user_data.get('data', {}),
-                    'badge': unread_count,
-                    'sound': 'default',
-                    'priority': 'high',
-                    'channelId': 'default'
-                }
-                notifications.append(notification)
+            tokens[user.id] = user.userprofile.expo_push_token
         except Exception as e:
             logger.error(f"Error preparing notification for user {user.id}: {str(e)}")
-    
-    if notifications:
-        return expo_push_service.send_bulk_push_notifications(notifications)
-    
-    return []
+            tokens[user.id] = None
+
+    # Badge counts for every recipient in one query
+    unread_counts = _unread_counts([user_id for user_id, token in tokens.items() if token])
+
+    for user_data in users_data:
+        user = user_data['user']
+        token = tokens[user.id]
+        if not token:
+            results.append({'success': False, 'error': 'No push token registered'})
+            continue
+        entries.append({
+            'user_id': user.id,
+            'message': ExpoPushNotificationService.build_message(
+                to=token,
+                title=user_data['title'],
+                body=user_data['body'],
+                data=user_data.get('data'),
+                badge=unread_counts.get(user.id, 0),
+            ),
+        })
+        results.append({'success': True, 'queued': True})
+
+    # Never push for a notification whose transaction rolled back
+    transaction.on_commit(lambda: enqueue_push_messages(entries))
+    return results
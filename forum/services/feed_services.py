@@ -1,53 +1,193 @@
-from django.db.models import Q, F, Count
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
-from forum.models import Post, Course
+from django.core.cache import cache
+from django.db.models import Q
+from django.db import transaction
+from django.utils import timezone
+from forum.models import Post, Course, FeedEntry, User, UserProfile
 from forum.services.course_services import get_user_courses
-from forum.services.utils import process_post_preview, add_course_context, annotate_post_card_context
+from forum.services.utils import paginate_by_cursor
+from forum.services.post_card_services import hydrate_post_cards
+from forum.services.search_services import search_posts_queryset
 from django.core.paginator import Paginator
 from django.utils.timezone import localtime
+import logging
 
-def get_for_you_posts(user, page=1, per_page=8):
+logger = logging.getLogger(__name__)
+
+BLOCK_FIELDS = (
+    'block_1A', 'block_1B', 'block_1D', 'block_1E',
+    'block_2A', 'block_2B', 'block_2C', 'block_2D', 'block_2E',
+)
+
+SCHOOL_LIFE_COURSE_NAME = "School Life"
+
+# Set while a rebuild is queued so a burst of course changes queues one task per user
+FEED_REBUILD_PENDING_KEY = 'feed_rebuild_pending:{user_id}'
+FEED_REBUILD_PENDING_TIMEOUT = 5 * 60
+# Lets the rest of a profile save (all experience/help rows) commit before the rebuild runs
+FEED_REBUILD_DELAY = 5
+
+
+def _build_for_you_queryset(user):
     """
-    Return a tuple of (annotated posts on the current page, page_obj).
+    The live For You query. Only used to (re)materialize a user's feed; reads go
+    through FeedEntry.
     """
     experienced_courses, help_needed_courses = get_user_courses(user)
     profile = user.userprofile
 
-    current_courses = list(filter(None, [
-        profile.block_1A, profile.block_1B, profile.block_1D, profile.block_1E,
-        profile.block_2A, profile.block_2B, profile.block_2C, profile.block_2D, profile.block_2E
-    ]))
+    current_courses = list(filter(None, [getattr(profile, f'{field}_id') for field in BLOCK_FIELDS]))
 
     try:
-        school_life_course = Course.objects.get(name="School Life")
+        school_life_course = Course.objects.get(name=SCHOOL_LIFE_COURSE_NAME)
     except Course.DoesNotExist:
         school_life_course = None
 
-    base_qs = Post.objects.filter(
-        Q(courses__in=experienced_courses) | 
-        Q(courses__in=help_needed_courses) | 
+    return Post.objects.filter(
+        Q(courses__in=experienced_courses) |
+        Q(courses__in=help_needed_courses) |
         Q(author=user) |
         Q(courses__in=current_courses) |
         Q(courses__isnull=True) |
         (Q(courses=school_life_course) if school_life_course else Q())
-    ).distinct().order_by('-created_at')
+    ).distinct()
 
-    paginator = Paginator(base_qs, per_page)
+
+def rebuild_user_feed(user):
+    """
+    Replace all of a user's FeedEntry rows with the result of the live query.
+    Called when the user's blocks, experience or help courses change.
+    """
+    rows = _build_for_you_queryset(user).values_list('id', 'created_at')
+    with transaction.atomic():
+        FeedEntry.objects.filter(user=user).delete()
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(user=user, post_id=post_id, created_at=created_at) for post_id, created_at in rows],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        UserProfile.objects.filter(user=user).update(feed_materialized_at=timezone.now())
+
+
+def ensure_user_feed(user):
+    """Materialize the user's feed on first read (new users, or before the backfill has run)."""
+    profile = user.userprofile
+    if profile.feed_materialized_at is None:
+        rebuild_user_feed(user)
+        profile.feed_materialized_at = timezone.now()
+
+
+def get_post_audience_ids(post):
+    """
+    Return the ids of users with a materialized feed that should see this post.
+    Mirrors the conditions in _build_for_you_queryset from the post's side.
+    """
+    materialized_users = User.objects.filter(userprofile__feed_materialized_at__isnull=False)
+    course_ids = list(post.courses.values_list('id', flat=True))
+
+    is_global = not course_ids or Course.objects.filter(
+        id__in=course_ids, name=SCHOOL_LIFE_COURSE_NAME
+    ).exists()
+    if is_global:
+        return set(materialized_users.values_list('id', flat=True))
+
+    block_filter = Q()
+    for field in BLOCK_FIELDS:
+        block_filter |= Q(**{f'userprofile__{field}__in': course_ids})
+
+    return set(materialized_users.filter(
+        Q(id=post.author_id) |
+        Q(experienced_courses__course__in=course_ids) |
+        Q(help_needed_courses__course__in=course_ids) |
+        block_filter
+    ).values_list('id', flat=True))
+
+
+def fan_out_post(post_id):
+    """
+    Sync a post's FeedEntry rows with its current audience. Idempotent, so it is
+    safe to run for both post creation and course edits.
+    """
+    try:
+        post = Post.objects.get(id=post_id)
+    except Post.DoesNotExist:
+        return 0
+
+    audience_ids = get_post_audience_ids(post)
+    with transaction.atomic():
+        FeedEntry.objects.filter(post=post).exclude(user_id__in=audience_ids).delete()
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(user_id=user_id, post=post, created_at=post.created_at) for user_id in audience_ids],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+    return len(audience_ids)
+
+
+def schedule_post_fan_out(post_id):
+    """Queue fan_out_post once the surrounding transaction commits."""
+    def enqueue():
+        from forum.tasks import fan_out_post_task
+        try:
+            fan_out_post_task.delay(post_id)
+        except Exception as e:
+            logger.error(f"Failed to queue feed fan-out for post {post_id}: {str(e)}")
+
+    transaction.on_commit(enqueue)
+
+
+def schedule_user_feed_rebuild(user_id):
+    """
+    Queue rebuild_user_feed once the surrounding transaction commits, unless one is
+    already queued for the user. rebuild_user_feed_task clears the pending key before
+    it reads, so changes made while it runs still queue another rebuild.
+    """
+    def enqueue():
+        from forum.tasks import rebuild_user_feed_task
+        pending_key = FEED_REBUILD_PENDING_KEY.format(user_id=user_id)
+        if not cache.add(pending_key, True, FEED_REBUILD_PENDING_TIMEOUT):
+            return
+        try:
+            rebuild_user_feed_task.apply_async(args=[user_id], countdown=FEED_REBUILD_DELAY)
+        except Exception as e:
+            cache.delete(pending_key)
+            logger.error(f"Failed to queue feed rebuild for user {user_id}: {str(e)}")
+
+    transaction.on_commit(enqueue)
+
+
+def clear_pending_feed_rebuild(user_id):
+    """Let the next course change queue a new rebuild; called as the rebuild starts."""
+    cache.delete(FEED_REBUILD_PENDING_KEY.format(user_id=user_id))
+
+
+def get_for_you_posts(user, page=1, per_page=8):
+    """
+    Return a tuple of (annotated posts on the current page, page_obj).
+    Reads the user's materialized FeedEntry rows with one index range scan; the
+    paginator's total is a COUNT over the same user_id index, with no joins.
+    """
+    ensure_user_feed(user)
+
+    feed_qs = FeedEntry.objects.filter(user=user).order_by('-created_at', '-post_id').values_list('post_id', flat=True)
+
+    paginator = Paginator(feed_qs, per_page)
     page_obj = paginator.get_page(page)
 
-    post_ids = [post.id for post in page_obj.object_list]
+    post_ids = list(page_obj.object_list)
+    return hydrate_post_cards(post_ids, user), page_obj
 
-    posts = Post.objects.filter(id__in=post_ids).annotate(
-        solution_count=Count('solutions', distinct=True),
-        comment_count=Count('solutions__comments', distinct=True),
-        total_response_count=Count('solutions', distinct=True) + Count('solutions__comments', distinct=True)
-    ).select_related('author').prefetch_related('courses', 'solutions__comments')
+def get_for_you_posts_by_cursor(user, cursor=None, per_page=8):
+    """
+    Cursor-mode variant of get_for_you_posts for infinite scroll.
+    Return a tuple of (annotated posts, next_cursor); next_cursor is None on the last page.
+    """
+    ensure_user_feed(user)
 
-    posts_dict = {post.id: post for post in posts}
-    ordered_posts = [posts_dict[pid] for pid in post_ids if pid in posts_dict]
-    ordered_posts = annotate_post_card_context(ordered_posts, user)
+    feed_qs = FeedEntry.objects.filter(user=user).only('post_id', 'created_at')
+    entries, next_cursor = paginate_by_cursor(feed_qs, cursor, per_page, id_field='post_id')
 
-    return ordered_posts, page_obj
+    post_ids = [entry.post_id for entry in entries]
+    return hydrate_post_cards(post_ids, user), next_cursor
 
 def get_all_posts(user, query='', page=1, per_page=8):
     """
@@ -56,29 +196,31 @@ def get_all_posts(user, query='', page=1, per_page=8):
     base_qs = Post.objects.all().order_by('-created_at')
 
     if query:
-        search_query = SearchQuery(query)
-        base_qs = base_qs.annotate(
-            rank=SearchRank(F('search_vector'), search_query) + TrigramSimilarity('title', query)
-        ).filter(rank__gte=0.3).order_by('-rank')
+        base_qs = search_posts_queryset(query).order_by('-rank')
 
     # Paginate the base queryset first to preserve ordering
     paginator = Paginator(base_qs, per_page)
     page_obj = paginator.get_page(page)
 
-    # Fetch the posts for this page with useful annotations and relations
     post_ids = [post.id for post in page_obj.object_list]
+    return hydrate_post_cards(post_ids, user), page_obj
 
-    posts_qs = Post.objects.filter(id__in=post_ids).annotate(
-        solution_count=Count('solutions', distinct=True),
-        comment_count=Count('solutions__comments', distinct=True),
-        total_response_count=Count('solutions', distinct=True) + Count('solutions__comments', distinct=True)
-    ).select_related('author').prefetch_related('courses', 'solutions__comments')
-    post_dic = {post.id: post for post in posts_qs}
-    ordered_posts = [post_dic[pid] for pid in post_ids if pid in post_dic]
+def get_all_posts_by_cursor(user, query='', cursor=None, per_page=8):
+    """
+    Cursor-mode variant of get_all_posts. Keys on (created_at, id), or on (rank, id)
+    when searching. Return a tuple of (annotated posts, next_cursor).
+    """
+    if query:
+        base_qs = search_posts_queryset(query).only('id')
+        order_field = 'rank'
+    else:
+        base_qs = Post.objects.only('id', 'created_at')
+        order_field = 'created_at'
 
-    ordered_posts = annotate_post_card_context(ordered_posts, user)
+    page_posts, next_cursor = paginate_by_cursor(base_qs, cursor, per_page, order_field=order_field)
 
-    return ordered_posts, page_obj
+    post_ids = [post.id for post in page_posts]
+    return hydrate_post_cards(post_ids, user), next_cursor
 
 def paginate_posts(posts_queryset, page=1, limit=10):
     """
@@ -104,6 +246,5 @@ def paginate_posts(posts_queryset, page=1, limit=10):
     }
 
 def get_user_posts(user):
-    posts = Post.objects.filter(author = user).order_by('-created_at')
-    posts = annotate_post_card_context(posts, user)
-    return posts
\ No newline at end of file
+    post_ids = Post.objects.filter(author = user).order_by('-created_at').values_list('id', flat=True)
+    return hydrate_post_cards(post_ids, user)
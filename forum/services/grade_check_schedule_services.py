@@ -0,0 +1,165 @@
+from datetime import time as dt_time, timedelta
+from zoneinfo import ZoneInfo
+import random
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from forum.models import User, GradebookSnapshot, GradeCheckSchedule
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = timedelta(minutes=15)
+BASE_INTERVAL = timedelta(hours=1)
+MAX_INTERVAL = timedelta(hours=8)
+# Each check that finds nothing stretches the interval by this factor
+BACKOFF_FACTOR = 1.5
+# Next checks land anywhere within ±20% of the interval so users don't line up
+JITTER = 0.2
+
+# Teachers post grades during the school day and in the evening (school local time)
+ACTIVE_HOURS = (dt_time(7, 0), dt_time(22, 0))
+OVERNIGHT_FACTOR = 3
+WEEKEND_FACTOR = 2
+
+# A classmate's change in a shared section brings the user's next check within this window
+CLASSMATE_WINDOW = timedelta(minutes=10)
+
+
+def grade_check_users():
+    """Users a grade check can run for: a school email and a stored WolfNet password"""
+    return (
+        User.objects.filter(school_email__isnull=False)
+        .exclude(school_email='')
+        .filter(userprofile__wolfnet_password__isnull=False)
+        .exclude(userprofile__wolfnet_password='')
+    )
+
+
+def activity_factor(moment):
+    """How much to stretch an interval that starts at `moment`: quiet nights and weekends"""
+    local = moment.astimezone(ZoneInfo(settings.GRADE_CHECK_TIME_ZONE))
+    factor = 1
+    if local.weekday() >= 5:
+        factor = WEEKEND_FACTOR
+    if not ACTIVE_HOURS[0] <= local.time() < ACTIVE_HOURS[1]:
+        factor = max(factor, OVERNIGHT_FACTOR)
+    return factor
+
+
+def next_check_time(now, interval):
+    delay = min(interval * activity_factor(now), MAX_INTERVAL * OVERNIGHT_FACTOR)
+    return now + delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def ensure_schedules(now=None):
+    """
+    Create schedules for users who gained credentials, with first checks spread over
+    BASE_INTERVAL rather than all at once.
+
+    Returns:
+        int: Number of schedules created
+    """
+    now = now or timezone.now()
+    user_ids = list(grade_check_users().filter(grade_check_schedule__isnull=True).values_list('id', flat=True))
+    GradeCheckSchedule.objects.bulk_create(
+        [
+            GradeCheckSchedule(
+                user_id=user_id,
+                interval=BASE_INTERVAL,
+                next_check_at=now + BASE_INTERVAL * random.random(),
+            )
+            for user_id in user_ids
+        ],
+        ignore_conflicts=True,
+    )
+    return len(user_ids)
+
+
+def claim_due_schedules(now=None, limit=None):
+    """
+    Schedules due by `now` for users who still have credentials. Each is pushed one
+    interval ahead as it is claimed, so a slow check is not dispatched twice;
+    record_grade_check sets the real next time once the check finishes.
+
+    Returns:
+        list: GradeCheckSchedule rows with their user selected
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        due_qs = (
+            GradeCheckSchedule.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('user')
+            .filter(next_check_at__lte=now, user__in=grade_check_users())
+            .order_by('next_check_at')
+        )
+        due = list(due_qs[:limit] if limit else due_qs)
+        for schedule in due:
+            schedule.next_check_at = next_check_time(now, schedule.interval)
+        GradeCheckSchedule.objects.bulk_update(due, ['next_check_at'])
+    return due
+
+
+def record_grade_check(user, changed_sections, now=None):
+    """
+    Adapt the user's interval to a finished check: back to MIN_INTERVAL after a change,
+    otherwise stretched by BACKOFF_FACTOR up to MAX_INTERVAL. A change also pulls in
+    classmates who share one of the changed sections, since a teacher grading one
+    student is usually grading the whole class.
+
+    Args:
+        changed_sections (list): Section ids where the check found changes
+
+    Returns:
+        GradeCheckSchedule or None: None for users the scheduler doesn't track yet
+    """
+    now = now or timezone.now()
+    schedule = GradeCheckSchedule.objects.filter(user=user).first()
+    if schedule is None:
+        return None
+    if changed_sections:
+        schedule.interval = MIN_INTERVAL
+        schedule.last_change_at = now
+        schedule.changes_detected += 1
+    else:
+        schedule.interval = min(max(schedule.interval * BACKOFF_FACTOR, MIN_INTERVAL), MAX_INTERVAL)
+    schedule.checks += 1
+    schedule.last_checked_at = now
+    schedule.next_check_at = next_check_time(now, schedule.interval)
+    schedule.save()
+
+    if changed_sections:
+        classmate_ids = (
+            GradebookSnapshot.objects.filter(section_id__in=changed_sections)
+            .exclude(user=user)
+            .values('user_id')
+        )
+        classmates = list(
+            GradeCheckSchedule.objects.filter(user_id__in=classmate_ids, next_check_at__gt=now + CLASSMATE_WINDOW)
+        )
+        for classmate in classmates:
+            classmate.next_check_at = now + CLASSMATE_WINDOW * random.random()
+            classmate.interval = MIN_INTERVAL
+        GradeCheckSchedule.objects.bulk_update(classmates, ['next_check_at', 'interval'])
+        if classmates:
+            logger.info(f"Grade change for user {user.id} brought forward checks for {len(classmates)} classmates")
+    return schedule
+
+
+def grade_check_stats():
+    """
+    Summary of scheduled grade checks. `checks_per_change` is how many checks it takes
+    on average to find one change; lower means less wasted polling.
+    """
+    schedules = GradeCheckSchedule.objects.all()
+    totals = schedules.aggregate(checks=Sum('checks'), changes=Sum('changes_detected'))
+    checks = totals['checks'] or 0
+    changes = totals['changes'] or 0
+    return {
+        "users": schedules.count(),
+        "checks": checks,
+        "changes_detected": changes,
+        "checks_per_change": round(checks / changes, 2) if changes else None,
+        "due_now": schedules.filter(next_check_at__lte=timezone.now()).count(),
+    }
@@ -0,0 +1,164 @@
+import hashlib
+import json
+
+
+def normalize_assignments(hydrate_json):
+    """
+    The fields grade checks track for each assignment of a hydrategradebook response,
+    or None when the roster is empty.
+    """
+    roster = hydrate_json.get("Roster", [])
+    if not roster:
+        return None
+    return [
+        {
+            "assignment_id": a.get("AssignmentId"),
+            "name": (a.get("AssignmentType") or "").strip(),
+            "points_earned": a.get("PointsEarned"),
+            "max_points": a.get("MaxPoints"),
+            "comment": (a.get("Comment") or "").strip(),
+            "assignment_type": (a.get("AssignmentType") or "").strip(),
+            "assignment_type_id": a.get("AssignmentTypeId"),
+            "skills": [
+                {
+                    "skill_id": s.get("SkillId"),
+                    "skill_name": s.get("SkillName"),
+                    "rating": s.get("Rating"),
+                    "rating_desc": s.get("RatingDesc")
+                }
+                for s in a.get("AssignmentSkillList", [])
+            ]
+        }
+        for a in roster[0].get("AssignmentGrades", [])
+    ]
+
+
+def content_hash(assignments):
+    """SHA-256 of the assignments in canonical form: independent of list and key order"""
+    canonical = sorted(assignments, key=lambda a: str(a.get("assignment_id")))
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def diff_assignments(old_assignments, new_assignments):
+    """
+    Keyed diff of two assignment lists.
+
+    Returns:
+        list: Changes, each {"type", "assignment"} (plus "skill" for skill_changed).
+            Types: new, skill_changed, points_changed, comment_changed, removed
+    """
+    changes = []
+    old_map = {a["assignment_id"]: a for a in old_assignments}
+    new_ids = set()
+    for new_a in new_assignments:
+        aid = new_a["assignment_id"]
+        new_ids.add(aid)
+        old_a = old_map.get(aid)
+        if old_a is None:
+            changes.append({"type": "new", "assignment": new_a})
+            continue
+        if old_a == new_a:
+            continue
+
+        old_skills = {s["skill_id"]: s for s in old_a.get("skills", [])}
+        for s in new_a.get("skills", []):
+            old_s = old_skills.get(s["skill_id"])
+            if not old_s or s.get("rating") != old_s.get("rating") or s.get("rating_desc") != old_s.get("rating_desc"):
+                changes.append({"type": "skill_changed", "assignment": new_a, "skill": s})
+
+        if new_a.get("points_earned") != old_a.get("points_earned") or new_a.get("max_points") != old_a.get("max_points"):
+            changes.append({"type": "points_changed", "assignment": new_a})
+        if new_a.get("comment") != old_a.get("comment"):
+            changes.append({"type": "comment_changed", "assignment": new_a})
+
+    for aid, old_a in old_map.items():
+        if aid not in new_ids:
+            changes.append({"type": "removed", "assignment": old_a})
+    return changes
+
+
+def build_delta(old_assignments, new_assignments):
+    """
+    Reversible record of one snapshot rewrite. Forward: added and changed assignments
+    in full and removed ones by id (see apply_delta). Backward: the old versions of
+    changed and removed assignments and the old list's content_hash (see revert_delta).
+    Unchanged assignments are not stored.
+    """
+    old_map = {a["assignment_id"]: a for a in old_assignments}
+    new_ids = set()
+    upserted = []
+    previous = []
+    for new_a in new_assignments:
+        new_ids.add(new_a["assignment_id"])
+        old_a = old_map.get(new_a["assignment_id"])
+        if old_a != new_a:
+            upserted.append(new_a)
+            if old_a is not None:
+                previous.append(old_a)
+    removed = [aid for aid in old_map if aid not in new_ids]
+    previous.extend(old_map[aid] for aid in removed)
+    return {
+        "upserted": upserted,
+        "removed": removed,
+        "previous": previous,
+        "base_hash": content_hash(old_assignments),
+    }
+
+
+def apply_delta(assignments, delta):
+    """Replay a stored delta onto the list it was built from, giving the newer list"""
+    removed = set(delta.get("removed", []))
+    upserted = {a["assignment_id"]: a for a in delta.get("upserted", [])}
+    result = []
+    for a in assignments:
+        aid = a["assignment_id"]
+        if aid in removed:
+            continue
+        result.append(upserted.pop(aid, a))
+    result.extend(upserted.values())
+    return result
+
+
+def revert_delta(assignments, delta):
+    """
+    Inverse of apply_delta: turn the list a delta produced back into the one it was
+    built from.
+
+    Raises:
+        ValueError: For deltas stored before the old versions were kept.
+    """
+    if "previous" not in delta:
+        raise ValueError("Delta has no previous versions to revert to")
+    previous = {a["assignment_id"]: a for a in delta["previous"]}
+    added = {a["assignment_id"] for a in delta.get("upserted", [])} - set(previous)
+    result = []
+    for a in assignments:
+        aid = a["assignment_id"]
+        if aid in added:
+            continue
+        result.append(previous.pop(aid, a))
+    # What is left was removed by the delta
+    result.extend(previous.values())
+    return result
+
+
+def rebuild_states(current_assignments, deltas):
+    """
+    Earlier states of a rolling snapshot, walking its deltas back from the current list.
+
+    Args:
+        current_assignments: The snapshot's json_data.
+        deltas: The snapshot's delta dicts, oldest first.
+
+    Returns:
+        list: The assignments before each delta, in the order of deltas; the first
+            entry is the snapshot as originally created.
+    """
+    states = []
+    assignments = current_assignments
+    for delta in reversed(deltas):
+        assignments = revert_delta(assignments, delta)
+        states.append(assignments)
+    states.reverse()
+    return states
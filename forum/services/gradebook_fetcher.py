@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import random
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+import httpx
+from forum.services.wolfnet_session_services import WOLFNET_BASE_URL, WOLFNET_HEADERS, WolfNetSessionExpired
+
+logger = logging.getLogger(__name__)
+
+# WolfNet is a single host: this bounds how many requests one worker has in flight against it
+MAX_REQUESTS_PER_HOST = 8
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+REQUEST_TIMEOUT = httpx.Timeout(20.0, connect=10.0)
+# Worth another try: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def build_gradebook_job(key, wolfnet_session, marking_period_id):
+    """
+    Everything the fetcher needs for one user, so it never touches the ORM.
+
+    Args:
+        key: Identifies the job in fetch_gradebooks' result (the user's email)
+        wolfnet_session (WolfNetSession): Stored cookies, student id and sections
+        marking_period_id: Marking period to fetch
+    """
+    return {
+        "key": key,
+        "cookies": wolfnet_session.get_cookies(),
+        "student_id": wolfnet_session.student_id,
+        "marking_period_id": marking_period_id,
+        "section_ids": [section["section_id"] for section in wolfnet_session.sections],
+    }
+
+
+def _backoff_delay(attempt, retry_after=None):
+    """Exponential backoff with jitter; a Retry-After from the server takes precedence."""
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX)
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class GradebookFetcher:
+    """
+    Fetches gradebooks for many users over one pooled httpx.AsyncClient. Every section of
+    every job is requested concurrently, bounded per host by a semaphore.
+
+    The client's cookie jar refuses all cookies and each request carries its user's
+    cookies in an explicit header, so sessions of different users never mix.
+    """
+
+    def __init__(self, base_url=WOLFNET_BASE_URL, max_requests_per_host=MAX_REQUESTS_PER_HOST,
+                 max_attempts=MAX_ATTEMPTS, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url
+        self.max_requests_per_host = max_requests_per_host
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.client = None
+        self._host_semaphores = {}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=WOLFNET_HEADERS,
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            limits=httpx.Limits(
+                max_connections=self.max_requests_per_host,
+                max_keepalive_connections=self.max_requests_per_host,
+            ),
+            timeout=self.timeout,
+            follow_redirects=False,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    def _semaphore(self, host):
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_requests_per_host)
+        return self._host_semaphores[host]
+
+    async def get_json(self, path, params, cookies):
+        """
+        GET a WolfNet API path and decode its JSON, retrying timeouts, connection errors
+        and RETRY_STATUSES with backoff.
+
+        Returns:
+            The decoded JSON, or None when the request kept failing or returned another status
+
+        Raises:
+            WolfNetSessionExpired: WolfNet answered 401/403 or redirected to its login page
+        """
+        request_headers = {"Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items())}
+        semaphore = self._semaphore(httpx.URL(self.base_url).host)
+
+        for attempt in range(1, self.max_attempts + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    response = await self.client.get(path, params=params, headers=request_headers)
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {str(e)}"
+            else:
+                if response.status_code in (401, 403) or response.is_redirect:
+                    raise WolfNetSessionExpired(str(response.url))
+                if response.status_code == 200:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        logger.error(f"WolfNet returned invalid JSON for {path}")
+                        return None
+                if response.status_code not in RETRY_STATUSES:
+                    logger.error(f"WolfNet returned {response.status_code} for {path}")
+                    return None
+                error = f"HTTP {response.status_code}"
+                retry_after = _retry_after(response)
+
+            if attempt == self.max_attempts:
+                break
+            delay = _backoff_delay(attempt, retry_after)
+            logger.warning(f"WolfNet request {path} failed ({error}), retry {attempt}/{self.max_attempts - 1} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        logger.error(f"Giving up on WolfNet request {path} after {self.max_attempts} attempts: {error}")
+        return None
+
+    async def fetch_section(self, job, section_id):
+        """
+        Fetch one section's hydrated gradebook and its assignment names concurrently.
+
+        Returns:
+            dict: {"gradebook": hydrategradebook JSON or None, "assignment_names": {AssignmentId: name}}
+        """
+        section_params = {
+            "sectionId": section_id,
+            "markingPeriodId": job["marking_period_id"],
+        }
+        gradebook, performance = await asyncio.gather(
+            self.get_json(
+                "/api/gradebook/hydrategradebook",
+                {
+                    **section_params,
+                    "sortAssignmentId": "null",
+                    "sortSkillPk": "null",
+                    "sortDesc": "null",
+                    "sortCumulative": "null",
+                    "studentUserId": job["student_id"],
+                    "fromProgress": "true",
+                },
+                job["cookies"],
+            ),
+            self.get_json(
+                "/api/gradebook/AssignmentPerformanceStudent",
+                {**section_params, "studentId": job["student_id"]},
+                job["cookies"],
+            ),
+        )
+
+        assignment_names = {}
+        for entry in performance or []:
+            aid = entry.get("AssignmentId")
+            short_desc = entry.get("AssignmentShortDescription")
+            if aid and short_desc:
+                assignment_names[aid] = short_desc
+        return {"gradebook": gradebook, "assignment_names": assignment_names}
+
+    async def fetch_job(self, job):
+        """
+        Fetch every section of one job in parallel.
+
+        Returns:
+            dict mapping section_id to fetch_section's result, or the exception that
+            ended the job (WolfNetSessionExpired when the session was rejected)
+        """
+        tasks = [asyncio.ensure_future(self.fetch_section(job, section_id)) for section_id in job["section_ids"]]
+        try:
+            results = await asyncio.gather(*tasks)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not isinstance(e, WolfNetSessionExpired):
+                logger.error(f"Gradebook fetch for {job['key']} failed: {str(e)}")
+            return e
+        return dict(zip(job["section_ids"], results))
+
+    async def fetch_many(self, jobs):
+        """Overlap all jobs; returns {job key: fetch_job result}."""
+        results = await asyncio.gather(*(self.fetch_job(job) for job in jobs))
+        return {job["key"]: result for job, result in zip(jobs, results)}
+
+
+def fetch_gradebooks(jobs, **options):
+    """
+    Synchronous entry point for Celery tasks: runs one event loop that fetches all jobs.
+
+    Args:
+        jobs (list): build_gradebook_job() dicts
+        **options: Passed to GradebookFetcher
+
+    Returns:
+        dict: {job key: {section_id: {"gradebook", "assignment_names"}} or an exception}
+    """
+    async def run():
+        async with GradebookFetcher(**options) as fetcher:
+            return await fetcher.fetch_many(jobs)
+
+    return asyncio.run(run())
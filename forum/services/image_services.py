@@ -0,0 +1,250 @@
+"""
+Editor.js image uploads: the web request only streams the original to storage; the
+resized, EXIF-free WebP/JPEG variants are produced by process_image_asset_task.
+"""
+import logging
+import re
+import uuid
+from io import BytesIO
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from forum.models import ImageAsset
+
+logger = logging.getLogger(__name__)
+
+# Largest edge of each variant, largest first so each one is resized from the previous
+IMAGE_VARIANTS = (
+    ('full', 2048),
+    ('card', 800),
+    ('thumbnail', 320),
+)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+UPLOAD_FORMAT_EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png', 'GIF': '.gif'}
+
+ASSET_CACHE_KEY = 'image_asset:{key}'
+# Variants never change once written, so ready assets can stay cached for long
+ASSET_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Matches the URL upload_image returns, on any host
+ASSET_URL_PATTERN = re.compile(r'/images/([0-9a-f]{32})/')
+
+
+def image_asset_key(url):
+    """Asset key in an image URL returned by upload_image, or None for other URLs"""
+    match = ASSET_URL_PATTERN.search(url or '')
+    return match.group(1) if match else None
+
+
+def store_image_upload(image_file, user=None):
+    """
+    Stream an uploaded image to storage as-is and queue its variants.
+
+    Only the image header is read to check the format; the pixels are decoded by
+    the worker.
+
+    Args:
+        image_file: UploadedFile from request.FILES.
+        user (User, optional): Uploader.
+
+    Returns:
+        ImageAsset: The new, pending asset.
+
+    Raises:
+        ValueError: If the file is not a JPEG, PNG or GIF image.
+    """
+    try:
+        image_format = Image.open(image_file).format
+    except Exception:
+        image_format = None
+    if image_format not in UPLOAD_FORMAT_EXTENSIONS:
+        raise ValueError('Unsupported file type.')
+    image_file.seek(0)
+
+    key = uuid.uuid4().hex
+    original = default_storage.save(f'uploads/originals/{key}{UPLOAD_FORMAT_EXTENSIONS[image_format]}', image_file)
+    asset = ImageAsset.objects.create(
+        key=key,
+        original=original,
+        uploaded_by=user if user is not None and user.is_authenticated else None,
+    )
+    schedule_image_processing(asset.id)
+    return asset
+
+
+def schedule_image_processing(asset_id):
+    """Queue process_image_asset once the surrounding transaction commits."""
+    def enqueue():
+        from forum.tasks import process_image_asset_task
+        try:
+            process_image_asset_task.delay(asset_id)
+        except Exception as e:
+            logger.error(f"Failed to queue image processing for asset {asset_id}: {str(e)}")
+
+    transaction.on_commit(enqueue)
+
+
+def prepare_image(fp):
+    """
+    Decode an image for render_variants: rotated upright from its EXIF orientation
+    and converted to RGB, or RGBA when it has transparency. Animated GIFs keep
+    their first frame.
+    """
+    image = Image.open(fp)
+    image.load()
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def render_variants(image):
+    """
+    Resize an image from prepare_image into every IMAGE_VARIANTS size (never upscaling).
+
+    The encoded files carry no EXIF data; the ICC profile is kept so colours stay right.
+
+    Returns:
+        dict: {variant: {"width", "height", "webp": bytes, "jpeg": bytes}}
+    """
+    icc_profile = image.info.get('icc_profile')
+    extra = {'icc_profile': icc_profile} if icc_profile else {}
+
+    rendered = {}
+    current = image
+    for name, max_edge in IMAGE_VARIANTS:
+        current = current.copy()
+        current.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        webp = BytesIO()
+        current.save(webp, format='WEBP', quality=WEBP_QUALITY, method=4, **extra)
+
+        opaque = current
+        if current.mode == 'RGBA':
+            opaque = Image.new('RGB', current.size, (255, 255, 255))
+            opaque.paste(current, mask=current.getchannel('A'))
+        jpeg = BytesIO()
+        opaque.save(jpeg, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True, **extra)
+
+        rendered[name] = {
+            'width': current.width,
+            'height': current.height,
+            'webp': webp.getvalue(),
+            'jpeg': jpeg.getvalue(),
+        }
+    return rendered
+
+
+def process_image_asset(asset_id):
+    """
+    Write the variants of a pending asset to storage and drop its original, which may
+    carry EXIF data such as GPS coordinates.
+
+    Returns:
+        ImageAsset: The asset, READY on success or FAILED if the original could not be decoded.
+    """
+    asset = ImageAsset.objects.get(id=asset_id)
+    if asset.status == ImageAsset.READY:
+        return asset
+
+    try:
+        with default_storage.open(asset.original) as original:
+            image = prepare_image(original)
+        rendered = render_variants(image)
+    except Exception as e:
+        logger.error(f"Could not process image asset {asset.key}: {str(e)}")
+        asset.status = ImageAsset.FAILED
+        asset.save(update_fields=['status'])
+        return asset
+
+    variants = {}
+    for name, variant in rendered.items():
+        variants[name] = {'width': variant['width'], 'height': variant['height']}
+        for image_format, extension in (('webp', 'webp'), ('jpeg', 'jpg')):
+            path = f'uploads/{asset.key}/{name}.{extension}'
+            # A retried task overwrites its earlier output instead of saving beside it
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            path = default_storage.save(path, ContentFile(variant[image_format]))
+            variants[name][image_format] = default_storage.url(path)
+
+    original = asset.original
+    asset.width, asset.height = image.size
+    asset.variants = variants
+    asset.status = ImageAsset.READY
+    asset.original = ''
+    asset.processed_at = timezone.now()
+    asset.save(update_fields=['width', 'height', 'variants', 'status', 'original', 'processed_at'])
+    cache.delete(ASSET_CACHE_KEY.format(key=asset.key))
+
+    try:
+        default_storage.delete(original)
+    except Exception as e:
+        logger.error(f"Could not delete original of image asset {asset.key}: {str(e)}")
+    return asset
+
+
+def get_image_asset(key):
+    """
+    Asset fields image_asset_view needs, cached once the asset is ready.
+
+    Returns:
+        dict or None: {"status", "original_url", "variants"}, or None for an unknown key.
+    """
+    cache_key = ASSET_CACHE_KEY.format(key=key)
+    record = cache.get(cache_key)
+    if record is not None:
+        return record
+
+    asset = ImageAsset.objects.filter(key=key).only('status', 'original', 'variants').first()
+    if asset is None:
+        return None
+    record = {
+        'status': asset.status,
+        'original_url': default_storage.url(asset.original) if asset.original else None,
+        'variants': asset.variants,
+    }
+    if asset.status == ImageAsset.READY:
+        cache.set(cache_key, record, ASSET_CACHE_TIMEOUT)
+    return record
+
+
+def attach_image_variants(posts):
+    """
+    Look up the processed variants of each post's first image in one query.
+
+    Sets on each post: image_variants (ImageAsset.variants, or None while the image is
+    pending or when it predates ImageAsset).
+    """
+    keys = {}
+    for post in posts:
+        post.image_variants = None
+        key = image_asset_key(post.first_image_url)
+        if key:
+            keys.setdefault(key, []).append(post)
+    if not keys:
+        return
+
+    for key, variants in ImageAsset.objects.filter(
+        key__in=keys, status=ImageAsset.READY
+    ).values_list('key', 'variants'):
+        for post in keys[key]:
+            post.image_variants = variants
+
+
+def delete_image_assets(keys):
+    """Delete the stored files and rows of the given assets."""
+    for asset in ImageAsset.objects.filter(key__in=keys):
+        paths = [asset.original] if asset.original else []
+        for name, _ in IMAGE_VARIANTS:
+            paths.extend(f'uploads/{asset.key}/{name}.{extension}' for extension in ('webp', 'jpg'))
+        for path in paths:
+            try:
+                default_storage.delete(path)
+            except Exception as e:
+                logger.error(f"Error deleting file {path}: {str(e)}")
+        cache.delete(ASSET_CACHE_KEY.format(key=asset.key))
+        asset.delete()
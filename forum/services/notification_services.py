@@ -1,28 +1,143 @@
 from django.shortcuts import get_object_or_404
 from django.conf import settings
-from forum.models import UserCourseExperience, Notification, Post, Solution
-from forum.services.utils import process_post_preview
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Count
+from forum.models import User, Course, Notification, Post, Solution
+from forum.services.utils import paginate_by_cursor
 import logging
 
 logger = logging.getLogger(__name__)
 
+COURSE_NOTIFICATION_BATCH_SIZE = 500
+
 def send_course_notifications_service(post, courses):
-    experienced_users = UserCourseExperience.objects.filter(
-        course__in=courses
-    ).select_related('user').distinct('user')
-    experienced_users = experienced_users.exclude(user=post.author)
-    for exp_user in experienced_users:
-        recipient = exp_user.user
-        message = process_post_preview(post)
-        url = post.get_absolute_url()
-        email_subject = f'New post in your experienced course: {post.title}'
+    """
+    Queue the course fan-out for a new post once the surrounding transaction commits,
+    so creating a post costs the same no matter how many students follow its courses.
+    """
+    post_id = post.id
+    course_ids = [course.id for course in courses]
+
+    def enqueue():
+        from forum.tasks import send_course_notifications_task
+        try:
+            send_course_notifications_task.delay(post_id, course_ids)
+        except Exception as e:
+            logger.error(f"Failed to queue course notifications for post {post_id}: {str(e)}")
+
+    transaction.on_commit(enqueue)
+
+def fan_out_course_notifications(post_id, course_ids):
+    """
+    Notify everyone experienced in any of the post's courses: one bulk insert for the
+    Notification rows, one aggregate query for badge counts, pushes handed to the
+    Expo delivery queue and all emails over a single SMTP connection.
+
+    Returns:
+        int: Number of notifications created
+    """
+    post = Post.objects.select_related('author').get(id=post_id)
+    course_names = ', '.join(Course.objects.filter(id__in=course_ids).values_list('name', flat=True))
+
+    recipients = list(
+        User.objects.filter(
+            experienced_courses__course_id__in=course_ids
+        ).exclude(
+            id=post.author_id
+        ).distinct().select_related('userprofile').only(
+            'id', 'first_name', 'last_name', 'personal_email', 'userprofile__expo_push_token'
+        )
+    )
+    if not recipients:
+        return 0
+
+    # Everything that does not depend on the recipient is rendered once
+    message = post.preview_text
+    url = post.get_absolute_url()
+
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                recipient=recipient,
+                sender=post.author,
+                notification_type='post',
+                post=post,
+                message=message,
+            )
+            for recipient in recipients
+        ],
+        batch_size=COURSE_NOTIFICATION_BATCH_SIZE,
+    )
+
+    try:
+        _send_course_push_notifications(post, message, recipients, notifications)
+    except Exception as e:
+        logger.error(f"Failed to send push notifications for post {post.id}: {str(e)}")
+
+    try:
+        _send_course_notification_emails(post, course_names, url, recipients)
+    except Exception as e:
+        logger.error(f"Failed to send notification emails for post {post.id}: {str(e)}")
+
+    return len(notifications)
+
+def _send_course_push_notifications(post, message, recipients, notifications):
+    from forum.services.expo_push_service import ExpoPushNotificationService, enqueue_push_messages
+    from forum.services.deep_link_service import create_notification_deep_link
+
+    recipients_with_tokens = {
+        recipient.id: recipient.userprofile.expo_push_token
+        for recipient in recipients
+        if getattr(recipient, 'userprofile', None) and recipient.userprofile.expo_push_token
+    }
+    if not recipients_with_tokens:
+        return
+
+    unread_counts = dict(
+        Notification.objects.filter(
+            recipient_id__in=recipients_with_tokens, is_read=False
+        ).values('recipient_id').annotate(unread=Count('id')).values_list('recipient_id', 'unread')
+    )
+    deep_link_data = create_notification_deep_link(
+        notification_type='post', post=post, post_id=post.id, user=post.author
+    )
+    push_body = message[:100] + "..." if len(message) > 100 else message
+
+    enqueue_push_messages([
+        {
+            'user_id': notification.recipient_id,
+            'message': ExpoPushNotificationService.build_message(
+                to=recipients_with_tokens[notification.recipient_id],
+                title=post.title,
+                body=push_body,
+                data={
+                    'notification_id': str(notification.id),
+                    'notification_type': 'post',
+                    'post_id': str(post.id),
+                    'solution_id': None,
+                    **deep_link_data
+                },
+                badge=unread_counts.get(notification.recipient_id, 0),
+            ),
+        }
+        for notification in notifications
+        if notification.recipient_id in recipients_with_tokens
+    ])
+
+def _send_course_notification_emails(post, course_names, url, recipients):
+    email_subject = f'New post in your experienced course: {post.title}'
+    emails = []
+    for recipient in recipients:
+        if not recipient.personal_email:
+            continue
         email_message = f"""
         Hello {recipient.get_full_name()},
         
         A new post has been created in a course you have experience in:
         
         Title: {post.title}
-        Course(s): {', '.join(c.name for c in courses)}
+        Course(s): {course_names}
         
         You can view the post here:
         {settings.SITE_URL}{url}
@@ -30,16 +145,25 @@ def send_course_notifications_service(post, courses):
         Best regards,
         WolfKey Team
         """
-        send_notification_service(
-            recipient=recipient,
-            sender=post.author,
-            notification_type='post',
-            message=message,
-            url=url,
-            post=post,
-            email_subject=email_subject,
-            email_message=email_message,
-        )
+        email = EmailMultiAlternatives(email_subject, email_message, settings.DEFAULT_FROM_EMAIL, [recipient.personal_email])
+        email.attach_alternative(email_message, 'text/html')
+        emails.append(email)
+
+    if not emails:
+        return
+    # One SMTP connection for the batch, but a rejected or failed message only loses that email
+    failed = 0
+    with get_connection() as connection:
+        for email in emails:
+            try:
+                connection.send_messages([email])
+            except Exception as e:
+                failed += 1
+                logger.error(f"Failed to send course notification email for post {post.id} to {email.to[0]}: {str(e)}")
+                # The connection may be broken; the backend reopens it for the next message
+                connection.close()
+    if failed:
+        logger.warning(f"{failed} of {len(emails)} course notification emails failed for post {post.id}")
 
 def send_solution_notification_service(solution):
     post = solution.post
@@ -196,6 +320,14 @@ def send_notification_service(
 def all_notifications_service(user):
     return user.notifications.all()
 
+def notifications_page_service(user, cursor=None, limit=20):
+    """
+    Return one page of the user's notifications, newest first, as (notifications, next_cursor).
+    Keyset-paginated on (created_at, id) so deep pages stay cheap.
+    """
+    queryset = user.notifications.select_related('sender', 'post', 'solution')
+    return paginate_by_cursor(queryset, cursor, limit)
+
 def mark_notification_read_service(user, notification_id):
     notification = get_object_or_404(Notification, id=notification_id, recipient=user)
     notification.is_read = True
@@ -0,0 +1,96 @@
+from django.db.models import Prefetch, prefetch_related_objects
+from forum.models import Post, Course, PostLike, FollowedPost, UserCourseExperience, UserCourseHelp
+from forum.services.image_services import attach_image_variants
+
+# Prefetches needed by UserSerializer (nested in PostListSerializer) for each post author
+AUTHOR_PROFILE_PREFETCHES = [
+    f'author__userprofile__{block}__blocks'
+    for block in ('block_1A', 'block_1B', 'block_1D', 'block_1E',
+                  'block_2A', 'block_2B', 'block_2C', 'block_2D', 'block_2E')
+]
+
+
+def hydrate_post_cards(post_ids, user):
+    """
+    Load a page of posts with everything a post card needs, in page order.
+
+    Runs a fixed number of queries regardless of len(post_ids): the posts
+    (counts, preview text and first image are stored columns, so the content
+    JSON is never loaded), their courses and block codes, the
+    viewer's likes and follows for the page, the viewer's experienced and
+    help-needed course ids, and (when the page has uploaded images) their
+    processed variants.
+
+    Sets on each post: course_context, is_liked_by_user, is_following and
+    image_variants (see attach_image_variants).
+
+    Args:
+        post_ids: Iterable of post ids in display order.
+        user: The viewing user (may be anonymous).
+
+    Returns:
+        list: Hydrated Post objects in the order of post_ids.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return []
+
+    posts = Post.objects.filter(id__in=post_ids).select_related(
+        'author__userprofile'
+    ).defer(
+        'content', 'body_text', 'search_vector'
+    ).prefetch_related(
+        Prefetch('courses', queryset=Course.objects.prefetch_related('blocks'))
+    )
+    posts_by_id = {post.id: post for post in posts}
+
+    liked_post_ids = set()
+    followed_post_ids = set()
+    experienced_ids = set()
+    help_needed_ids = set()
+
+    if user.is_authenticated:
+        liked_post_ids = set(
+            PostLike.objects.filter(user=user, post_id__in=post_ids).values_list('post_id', flat=True)
+        )
+        followed_post_ids = set(
+            FollowedPost.objects.filter(user=user, post_id__in=post_ids).values_list('post_id', flat=True)
+        )
+        experienced_ids = set(
+            UserCourseExperience.objects.filter(user=user).values_list('course_id', flat=True)
+        )
+        help_needed_ids = set(
+            UserCourseHelp.objects.filter(user=user, active=True).values_list('course_id', flat=True)
+        )
+
+    ordered_posts = []
+    for post_id in post_ids:
+        post = posts_by_id.get(post_id)
+        if post is None:
+            continue
+
+        post.is_liked_by_user = post.id in liked_post_ids
+        post.is_following = post.id in followed_post_ids
+        post.course_context = [{
+            'id': course.id,
+            'name': course.name,
+            'category': course.category,
+            'description': course.description,
+            'is_experienced': course.id in experienced_ids,
+            'needs_help': course.id in help_needed_ids,
+            'blocks': [block.code for block in course.blocks.all()],
+        } for course in post.courses.all()]
+
+        ordered_posts.append(post)
+
+    attach_image_variants(ordered_posts)
+    return ordered_posts
+
+
+def prefetch_author_profiles(posts):
+    """
+    Prefetch the author profile courses serialized by PostListSerializer's nested
+    UserSerializer, so serializing a page stays a fixed number of queries.
+    """
+    prefetch_related_objects(posts, *AUTHOR_PROFILE_PREFETCHES)
+    return posts
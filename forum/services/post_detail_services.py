@@ -0,0 +1,117 @@
+from django.db.models import F, Case, When, IntegerField
+from django.shortcuts import get_object_or_404
+from forum.models import Post, Comment, PostLike, FollowedPost, SolutionVote, SavedSolution
+
+
+def build_comment_trees(comments):
+    """
+    Link comments into trees in memory.
+
+    Sets on each comment: children (replies in the order given).
+
+    Args:
+        comments: Comments of one or more solutions, in display order.
+
+    Returns:
+        list: Root comments in the order given.
+    """
+    comments_by_id = {comment.id: comment for comment in comments}
+    roots = []
+    for comment in comments:
+        comment.children = []
+    for comment in comments:
+        parent = comments_by_id.get(comment.parent_id)
+        if parent is None:
+            roots.append(comment)
+        else:
+            parent.children.append(comment)
+    return roots
+
+
+def assemble_post_detail(post_id, user):
+    """
+    Load a post with everything the detail page needs.
+
+    Runs a fixed number of queries regardless of how many solutions and comments
+    the post has: the post with its author, its courses, the solutions with
+    their authors, every comment of those solutions with its author, and the
+    viewer's votes, saved solutions, like and follow.
+
+    Sets on the post: is_liked_by_user and is_following. Sets on each solution: comment_list (all comments in order),
+    comment_tree (root comments, see build_comment_trees), viewer_vote
+    (SolutionVote value or None), is_upvoted, is_downvoted and is_saved.
+
+    Args:
+        post_id: Post to load (404 if it does not exist).
+        user: The viewing user (may be anonymous).
+
+    Returns:
+        dict: post, solutions (accepted first, then by score and age),
+            accepted_solution (one of solutions, or None) and
+            has_solution_from_user.
+    """
+    post = get_object_or_404(
+        Post.objects.select_related('author__userprofile').prefetch_related('courses'),
+        id=post_id,
+    )
+
+    solutions = list(post.solutions.select_related('author__userprofile').annotate(
+        vote_score=F('upvotes') - F('downvotes')
+    ).order_by(
+        Case(
+            When(id=post.accepted_solution_id, then=0),
+            default=1,
+            output_field=IntegerField(),
+        ),
+        '-vote_score',
+        '-created_at'
+    ))
+    solution_ids = [solution.id for solution in solutions]
+
+    comments_by_solution = {solution_id: [] for solution_id in solution_ids}
+    if solution_ids:
+        comments = Comment.objects.filter(
+            solution_id__in=solution_ids
+        ).select_related('author__userprofile').order_by('created_at', 'id')
+        for comment in comments:
+            comments_by_solution[comment.solution_id].append(comment)
+
+    votes = {}
+    saved_ids = set()
+    post.is_liked_by_user = False
+    post.is_following = False
+    if user is not None and user.is_authenticated:
+        if solution_ids:
+            votes = dict(
+                SolutionVote.objects.filter(user=user, solution_id__in=solution_ids).values_list('solution_id', 'value')
+            )
+            saved_ids = set(
+                SavedSolution.objects.filter(user=user, solution_id__in=solution_ids).values_list('solution_id', flat=True)
+            )
+        post.is_liked_by_user = PostLike.objects.filter(user=user, post_id=post.id).exists()
+        post.is_following = FollowedPost.objects.filter(user=user, post_id=post.id).exists()
+
+    accepted_solution = None
+    has_solution_from_user = False
+    for solution in solutions:
+        # Spare the templates a post lookup per solution
+        solution.post = post
+        solution.comment_list = comments_by_solution[solution.id]
+        for comment in solution.comment_list:
+            comment.solution = solution
+        solution.comment_tree = build_comment_trees(solution.comment_list)
+        solution.viewer_vote = votes.get(solution.id)
+        solution.is_upvoted = solution.viewer_vote == SolutionVote.UPVOTE
+        solution.is_downvoted = solution.viewer_vote == SolutionVote.DOWNVOTE
+        solution.is_saved = solution.id in saved_ids
+        if solution.id == post.accepted_solution_id:
+            accepted_solution = solution
+        if user is not None and solution.author_id == user.id:
+            has_solution_from_user = True
+
+    return {
+        'post': post,
+        'solutions': solutions,
+        'accepted_solution': accepted_solution,
+        'has_solution_from_user': has_solution_from_user,
+    }
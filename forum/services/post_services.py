@@ -1,8 +1,11 @@
 from django.shortcuts import get_object_or_404
-from django.db.models import F, Case, When, IntegerField
+from django.db import transaction
+from django.db.models import F
 from forum.models import Post, Course, PostLike, FollowedPost
 from forum.services.utils import detect_bad_words, selective_quote_replace
 from forum.services.notification_services import send_course_notifications_service
+from forum.services.view_count_services import record_post_view
+from forum.services.post_detail_services import assemble_post_detail
 import json
 import logging
 
@@ -10,28 +13,17 @@ logger = logging.getLogger(__name__)
 
 def get_post_detail_service(post_id, user=None):
     try:
-        post = get_object_or_404(Post, id=post_id)
-        solutions = post.solutions.annotate(
-            vote_score=F('upvotes') - F('downvotes')
-        ).order_by(
-            Case(
-                When(id=post.accepted_solution_id, then=0),
-                default=1,
-                output_field=IntegerField(),
-            ),
-            '-vote_score',
-            '-created_at'
-        )
+        detail = assemble_post_detail(post_id, user)
+        post = detail['post']
 
         processed_solutions = []
-        for solution in solutions:
+        for solution in detail['solutions']:
             try:
                 solution_content = solution.content
                 if isinstance(solution_content, str):
                     solution_content = selective_quote_replace(solution_content)
                     solution_content = json.loads(solution_content)
                 
-                comments = solution.comments.select_related('author').order_by('created_at')
                 processed_comments = [{
                     'id': comment.id,
                     'content': comment.content,
@@ -39,7 +31,7 @@ def get_post_detail_service(post_id, user=None):
                     'created_at': comment.created_at.isoformat(),
                     'parent_id': comment.parent_id,
                     'depth': comment.get_depth(),
-                } for comment in comments]
+                } for comment in solution.comment_list]
 
                 processed_solutions.append({
                     'id': solution.id,
@@ -48,26 +40,29 @@ def get_post_detail_service(post_id, user=None):
                     'created_at': solution.created_at.isoformat(),
                     'upvotes': solution.upvotes,
                     'downvotes': solution.downvotes,
+                    'is_saved': solution.is_saved,
                     'comments': processed_comments,
                 })
             except Exception as e:
                 logger.error(f"Error processing solution {solution.id}: {e}")
 
-        post = Post.objects.get(id=post_id)
-        post.views += 1
-        post.save()
+        record_post_view(post.id)
 
         return {
             'id': post.id,
             'title': post.title,
-            'solutions_object' : solutions,
+            'post_object': post,
+            'solutions_object' : detail['solutions'],
+            'accepted_solution': detail['accepted_solution'],
+            'has_solution_from_user': detail['has_solution_from_user'],
+            'is_following': post.is_following,
             'content': post.content,
             'author': post.author.get_full_name(),
             'created_at': post.created_at.isoformat(),
             'solutions': processed_solutions,
             'courses': [{'id': c.id, 'name': c.name} for c in post.courses.all()],
             'like_count': post.like_count(),
-            'is_liked': post.is_liked_by(user) if user else False,
+            'is_liked': post.is_liked_by_user,
         }
     except Exception as e:
         return {'error': str(e)}
@@ -152,12 +147,16 @@ def like_post_service(user, post_id):
     """
     try:
         post = get_object_or_404(Post, id=post_id)
-        like, created = PostLike.objects.get_or_create(user=user, post=post)
+        with transaction.atomic():
+            like, created = PostLike.objects.get_or_create(user=user, post=post)
+            if created:
+                Post.objects.filter(id=post.id).update(likes_count=F('likes_count') + 1)
+        post.refresh_from_db(fields=['likes_count'])
         
         return {
             'success': True,
             'liked': True,
-            'like_count': post.like_count(),
+            'like_count': post.likes_count,
             'created': created
         }
     except Exception as e:
@@ -170,12 +169,16 @@ def unlike_post_service(user, post_id):
     """
     try:
         post = get_object_or_404(Post, id=post_id)
-        deleted_count, _ = PostLike.objects.filter(user=user, post=post).delete()
+        with transaction.atomic():
+            deleted_count, _ = PostLike.objects.filter(user=user, post=post).delete()
+            if deleted_count:
+                Post.objects.filter(id=post.id).update(likes_count=F('likes_count') - deleted_count)
+        post.refresh_from_db(fields=['likes_count'])
         
         return {
             'success': True,
             'liked': False,
-            'like_count': post.like_count(),
+            'like_count': post.likes_count,
             'was_liked': deleted_count > 0
         }
     except Exception as e:
@@ -188,12 +191,16 @@ def follow_post_service(user, post_id):
     """
     try:
         post = get_object_or_404(Post, id=post_id)
-        followed, created = FollowedPost.objects.get_or_create(user=user, post=post)
+        with transaction.atomic():
+            followed, created = FollowedPost.objects.get_or_create(user=user, post=post)
+            if created:
+                Post.objects.filter(id=post.id).update(followers_count=F('followers_count') + 1)
+        post.refresh_from_db(fields=['followers_count'])
         
         return {
             'success': True,
             'followed': True,
-            'followers_count': post.followers.count(),
+            'followers_count': post.followers_count,
             'created': created
         }
     except Exception as e:
@@ -206,12 +213,16 @@ def unfollow_post_service(user, post_id):
     """
     try:
         post = get_object_or_404(Post, id=post_id)
-        deleted_count, _ = FollowedPost.objects.filter(user=user, post=post).delete()
+        with transaction.atomic():
+            deleted_count, _ = FollowedPost.objects.filter(user=user, post=post).delete()
+            if deleted_count:
+                Post.objects.filter(id=post.id).update(followers_count=F('followers_count') - deleted_count)
+        post.refresh_from_db(fields=['followers_count'])
         
         return {
             'success': True,
             'followed': False,
-            'followers_count': post.followers.count(),
+            'followers_count': post.followers_count,
             'was_following': deleted_count > 0
         }
     except Exception as e:
@@ -235,7 +246,7 @@ def get_post_share_info_service(post_id, request):
             'post_url': post_url,
             'author': post.author.get_full_name() if not post.is_anonymous else 'Anonymous',
             'created_at': post.created_at.isoformat(),
-            'preview_text': post.preview_text[:250] if hasattr(post, 'preview_text') else (post.title[:250] if post.title else '')
+            'preview_text': post.preview_text[:250] or (post.title[:250] if post.title else '')
         }
     except Exception as e:
         logger.error(f"Error getting share info for post {post_id}: {str(e)}")
@@ -3,6 +3,9 @@ from django.shortcuts import get_object_or_404
 from forum.models import User, Course, Post, Solution, UserCourseExperience, UserCourseHelp, UserProfile
 from forum.forms import UserCourseExperienceForm, UserCourseHelpForm
 from forum.services.utils import detect_bad_words
+from forum.services.feed_services import schedule_user_feed_rebuild
+from forum.services.schedule_services import invalidate_block_course_names
+from forum.services.wolfnet_session_services import invalidate_wolfnet_session
 
 def get_profile_context(request, username):
     profile_user = get_object_or_404(User, username=username)
@@ -101,12 +104,16 @@ def update_profile_info(request, username):
         return False, f'Error updating profile: {str(e)}'
 
 def update_wolfnet_settings(request, profile_user):
-    """Handle WolfNet settings update"""
+    """
+    Handle WolfNet settings update. Clearing or replacing the password also deletes
+    the stored WolfNet session, whose cookies were logged in with the old one.
+    """
     try:
         # Check if we're clearing the password
         if request.POST.get('clear_wolfnet_password') == 'true':
             profile_user.userprofile.wolfnet_password = None
             profile_user.userprofile.save()
+            invalidate_wolfnet_session(profile_user)
             return True, 'WolfNet password cleared successfully!'
         
         # Otherwise, update the password
@@ -116,6 +123,7 @@ def update_wolfnet_settings(request, profile_user):
             encrypted_password = WolfNetSettingsForm().encrypt_password(wolfnet_password)
             profile_user.userprofile.wolfnet_password = encrypted_password
             profile_user.userprofile.save()
+            invalidate_wolfnet_session(profile_user)
             return True, 'WolfNet settings updated successfully! Grade notifications and schedule integration are now enabled.'
         else:
             return False, 'Please enter a valid WolfNet password.'
@@ -148,6 +156,8 @@ def update_profile_courses(request):
                     course = Course.objects.get(id=course_id)
                     setattr(profile, f'block_{block}', course)
         profile.save()
+        schedule_user_feed_rebuild(request.user.id)
+        invalidate_block_course_names(request.user.id)
         return True, 'Courses updated successfully!'
     except Course.DoesNotExist:
         return False, f"Course with ID {course_id} does not exist."
@@ -1,19 +1,33 @@
 import datetime
-import gspread
+import logging
 import re
+import time
+from zoneinfo import ZoneInfo
 from django.conf import settings
-from oauth2client.service_account import ServiceAccountCredentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
 from forum.models import UserProfile, DailySchedule
-
-# Initialize Google Sheets client
-scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-creds = ServiceAccountCredentials.from_json_keyfile_dict(settings.GSHEET_CREDENTIALS, scope)
-client = gspread.authorize(creds)
-
-# Open the spreadsheet
-sheet = client.open("Copy of 2025-2026 SS Block Order Calendar").sheet1
+from forum.services.feed_services import BLOCK_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# The block order sheet and school calendar are only read by sync_daily_schedules (a beat
+# task); page views and the schedule APIs read the DailySchedule rows it writes.
+SHEET_SCOPE = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+CALENDAR_SCOPE = ['https://www.googleapis.com/auth/calendar.readonly']
+# Sheet layout: dates ("Tue, Sep 3") in column D, blocks 1-5 in columns E-I, from row 7
+SHEET_FIRST_ROW = 6
+SHEET_DATE_COLUMN = 3
+SHEET_FIRST_BLOCK_COLUMN = 4
+SYNCED_BLOCKS = 5
+
+# Day records and block maps are cached together with their invalidation, so the TTL only
+# bounds staleness from course renames
+SCHEDULE_CACHE_TIMEOUT = 6 * 60 * 60
+BLOCK_ORDER_VERSION_CACHE_KEY = 'schedule:block_order_version'
+BLOCK_ORDER_CACHE_KEY = 'schedule:block_order:{version}:{date}'
+BLOCK_COURSES_CACHE_KEY = 'schedule:block_courses:{user_id}'
 
 DEFAULT_BLOCK_TIMES = [
     "8:20-9:30",
@@ -23,35 +37,27 @@ DEFAULT_BLOCK_TIMES = [
     "14:20-15:30"
 ]
 
+_sheets_client = None
+
+def get_sheets_client():
+    """gspread client, authorized on first use so importing this module stays offline"""
+    global _sheets_client
+    if _sheets_client is None:
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
+        creds = ServiceAccountCredentials.from_json_keyfile_dict(settings.GSHEET_CREDENTIALS, SHEET_SCOPE)
+        _sheets_client = gspread.authorize(creds)
+    return _sheets_client
+
 def get_google_calendar_service():
+    from googleapiclient.discovery import build
+    from oauth2client.service_account import ServiceAccountCredentials
     creds = ServiceAccountCredentials.from_json_keyfile_dict(
         settings.GSHEET_CREDENTIALS, 
-        scopes=['https://www.googleapis.com/auth/calendar.readonly']
+        scopes=CALENDAR_SCOPE
     )
     return build('calendar', 'v3', credentials=creds)
 
-def get_alt_day_event(target_date):
-    try:
-        service = get_google_calendar_service()
-        calendar_id = 'nda09oameg390vndlulocmvt07u7c8h4@import.calendar.google.com'
-        time_min = datetime.datetime.combine(target_date, datetime.time.min).isoformat() + 'Z'
-        time_max = datetime.datetime.combine(target_date, datetime.time.max).isoformat() + 'Z'
-
-        events_result = service.events().list(
-            calendarId=calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-
-        for event in events_result.get('items', []):
-            if event.get('summary', '').lower().startswith("alt day") and event.get('start', {}).get('date'):
-                return event.get('description', None)
-    except HttpError as error:
-        print(f"An error occurred: {error}")
-    return None
-
 def extract_block_times_from_description(description):
     pattern = r'(\d{1,2}:\d{2}\s*-\s*\d{1,2}:\d{2})\s*-\s*Block\s*(\d[A-E])'
     matches = re.findall(pattern, description)
@@ -81,116 +87,335 @@ def _parse_iso_date(iso_date):
     """Parse ISO format date (YYYY-MM-DD) to datetime.date object"""
     return datetime.datetime.strptime(iso_date, '%Y-%m-%d').date()
 
+def _school_year_start(sheet_title, today=None):
+    """First calendar year of the school year the sheet covers ("2025-2026 ..." -> 2025)"""
+    match = re.search(r'(\d{4})\s*-\s*\d{4}', sheet_title or '')
+    if match:
+        return int(match.group(1))
+    today = today or datetime.date.today()
+    return today.year if today.month >= 8 else today.year - 1
+
+def _parse_sheet_date(sheet_date, school_year_start):
+    """'Tue, Sep 3' -> datetime.date; August to December fall in the first year of the school year"""
+    try:
+        parsed = datetime.datetime.strptime(f"{sheet_date.strip()} 2000", '%a, %b %d %Y')
+    except ValueError:
+        return None
+    year = school_year_start if parsed.month >= 8 else school_year_start + 1
+    try:
+        return datetime.date(year, parsed.month, parsed.day)
+    except ValueError:
+        return None
+
+def parse_block_order_rows(rows, school_year_start):
+    """
+    Args:
+        rows (list[list[str]]): All values of the block order sheet
+        school_year_start (int): Year the school year starts in
+
+    Returns:
+        dict: {date: [block 1..5 label or None]} for every dated row
+    """
+    block_orders = {}
+    for row in rows[SHEET_FIRST_ROW:]:
+        if len(row) <= SHEET_DATE_COLUMN:
+            continue
+        date_obj = _parse_sheet_date(row[SHEET_DATE_COLUMN], school_year_start)
+        if date_obj is None:
+            continue
+        cells = row[SHEET_FIRST_BLOCK_COLUMN:SHEET_FIRST_BLOCK_COLUMN + SYNCED_BLOCKS]
+        blocks = [cell.strip() or None for cell in cells]
+        block_orders[date_obj] = blocks + [None] * (SYNCED_BLOCKS - len(blocks))
+    return block_orders
+
+def _event_dates(event):
+    """Dates an event covers: all-day events span start.date up to (excluding) end.date"""
+    start = event.get('start', {})
+    if start.get('date'):
+        first = _parse_iso_date(start['date'])
+        end = event.get('end', {}).get('date')
+        last = _parse_iso_date(end) - datetime.timedelta(days=1) if end else first
+        return [first + datetime.timedelta(days=i) for i in range((last - first).days + 1)] or [first]
+    if start.get('dateTime'):
+        return [_parse_iso_date(start['dateTime'][:10])]
+    return []
+
+def parse_calendar_events(events):
+    """
+    Returns:
+        tuple: ({date: block times from its all-day "Alt Day" event}, {dates needing ceremonial uniform})
+    """
+    alt_day_times = {}
+    ceremonial_dates = set()
+    for event in events:
+        summary = event.get('summary', '')
+        description = event.get('description', '') or ''
+        dates = _event_dates(event)
+        if summary.lower().startswith("alt day") and event.get('start', {}).get('date') and description:
+            for date_obj in dates:
+                alt_day_times.setdefault(date_obj, extract_block_times_from_description(description))
+        if 'ceremonial uniform' in summary.lower() or 'ceremonial uniform' in description.lower():
+            ceremonial_dates.update(dates)
+    return alt_day_times, ceremonial_dates
+
+def fetch_calendar_events(first_date, last_date):
+    """All school calendar events between two dates, one paginated listing"""
+    service = get_google_calendar_service()
+    events = []
+    page_token = None
+    while True:
+        response = service.events().list(
+            calendarId=settings.SCHOOL_CALENDAR_ID,
+            timeMin=datetime.datetime.combine(first_date, datetime.time.min).isoformat() + 'Z',
+            timeMax=datetime.datetime.combine(last_date, datetime.time.max).isoformat() + 'Z',
+            singleEvents=True,
+            orderBy='startTime',
+            maxResults=2500,
+            pageToken=page_token,
+        ).execute()
+        events.extend(response.get('items', []))
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return events
+
+def build_daily_schedule_fields(blocks, block_times, ceremonial):
+    """
+    DailySchedule field values the sheet and calendar give one date. ceremonial_uniform
+    is left blank rather than False on other days, so a later calendar event can still
+    fill it in (see sheet_updates).
+    """
+    fields = {
+        'is_school': any(blocks),
+        'ceremonial_uniform': True if ceremonial else None,
+    }
+    for i, block in enumerate(blocks):
+        fields[f'block_{i + 1}'] = block
+        fields[f'block_{i + 1}_time'] = block_times.get(i + 1)
+    return fields
+
+def sheet_updates(schedule, fields):
+    """
+    The values of fields (from build_daily_schedule_fields) the sync may write to an
+    existing row. It only fills what is blank, so corrections made in the admin stand:
+    blocks and times are set where empty, ceremonial_uniform only while unset, and
+    is_school only follows the blocks while it is unset or the row was a day off
+    merely because it had no blocks yet.
+
+    Returns:
+        dict: {field: new value} for the fields to change
+    """
+    updates = {}
+    for name, value in fields.items():
+        if name.startswith('block_') and value not in (None, '') and getattr(schedule, name) in (None, ''):
+            updates[name] = value
+
+    if fields['ceremonial_uniform'] and schedule.ceremonial_uniform is None:
+        updates['ceremonial_uniform'] = True
+
+    had_blocks = any(getattr(schedule, f'block_{i}') for i in range(1, 9))
+    if schedule.is_school is None or (schedule.is_school is False and not had_blocks):
+        is_school = any(updates.get(f'block_{i}') or getattr(schedule, f'block_{i}') for i in range(1, 9))
+        if is_school != schedule.is_school:
+            updates['is_school'] = is_school
+    return updates
+
+def sync_daily_schedules(today=None):
+    """
+    Import the block order sheet and the school calendar's alt-day and ceremonial uniform
+    events into DailySchedule, from today to the end of the sheet. Past days are left as
+    they were, and existing rows only have their blanks filled (see sheet_updates), so
+    admin edits are never reverted. Blocks 6-8 are never touched since only admins set them.
+
+    Returns:
+        dict: {"created", "updated", "unchanged"} row counts
+    """
+    today = today or datetime.datetime.now(ZoneInfo(settings.SCHOOL_TIME_ZONE)).date()
+
+    spreadsheet = get_sheets_client().open(settings.BLOCK_ORDER_SHEET_NAME)
+    rows = spreadsheet.sheet1.get_all_values()
+    block_orders = {
+        date_obj: blocks
+        for date_obj, blocks in parse_block_order_rows(rows, _school_year_start(spreadsheet.title)).items()
+        if date_obj >= today
+    }
+    if not block_orders:
+        logger.warning("Block order sheet has no upcoming dates; nothing to sync")
+        return {'created': 0, 'updated': 0, 'unchanged': 0}
+
+    alt_day_times, ceremonial_dates = parse_calendar_events(
+        fetch_calendar_events(min(block_orders), max(block_orders))
+    )
+    default_times = {i + 1: t for i, t in enumerate(DEFAULT_BLOCK_TIMES)}
+
+    existing = DailySchedule.objects.in_bulk(list(block_orders), field_name='date')
+    to_create, to_update = [], []
+    update_fields = set()
+    now = timezone.now()
+    for date_obj, blocks in block_orders.items():
+        fields = build_daily_schedule_fields(
+            blocks,
+            alt_day_times.get(date_obj, default_times),
+            date_obj in ceremonial_dates,
+        )
+        schedule = existing.get(date_obj)
+        if schedule is None:
+            to_create.append(DailySchedule(date=date_obj, **fields))
+            continue
+        updates = sheet_updates(schedule, fields)
+        if updates:
+            for name, value in updates.items():
+                setattr(schedule, name, value)
+            # bulk_update skips auto_now
+            schedule.updated_at = now
+            update_fields.update(list(updates) + ['updated_at'])
+            to_update.append(schedule)
+
+    with transaction.atomic():
+        DailySchedule.objects.bulk_create(to_create, batch_size=200)
+        if to_update:
+            DailySchedule.objects.bulk_update(to_update, sorted(update_fields), batch_size=200)
+        # Bulk writes send no post_save
+        if to_create or to_update:
+            invalidate_day_schedules()
+
+    return {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'unchanged': len(block_orders) - len(to_create) - len(to_update),
+    }
+
+def _day_record(schedule):
+    """
+    What the schedule pages need of a DailySchedule row (or None): blocks and times in
+    get_block_order_for_day's shape, the ceremonial uniform flag and the row's updated_at.
+    """
+    record = {
+        'blocks': [None] * 5,
+        'times': [None] * 5,
+        'ceremonial_uniform': bool(schedule and schedule.ceremonial_uniform),
+        'updated_at': schedule.updated_at if schedule else None,
+    }
+    # Days missing from the sheet (weekends, breaks) have no row
+    if schedule is None or not any(getattr(schedule, f'block_{block_num}') for block_num in range(1, 9)):
+        return record
+
+    blocks = []
+    times = []
+    for block_num in range(1, 9):
+        block_value = getattr(schedule, f'block_{block_num}')
+        time_value = getattr(schedule, f'block_{block_num}_time')
+        # Always include blocks 1-5; blocks 6-8 only on days that have them
+        if block_num <= 5 or block_value:
+            blocks.append(block_value)
+            times.append(time_value)
+    record['blocks'] = blocks
+    record['times'] = times
+    return record
+
+def get_day_schedules(dates):
+    """
+    Cached day records (see _day_record) for the given dates, loading the missing ones
+    with a single DailySchedule query.
+
+    Returns:
+        dict: {date: record}
+    """
+    version = cache.get(BLOCK_ORDER_VERSION_CACHE_KEY, 0)
+    keys = {date_obj: BLOCK_ORDER_CACHE_KEY.format(version=version, date=date_obj.isoformat()) for date_obj in dates}
+    cached = cache.get_many(list(keys.values()))
+
+    records = {date_obj: cached[key] for date_obj, key in keys.items() if key in cached}
+    missing = [date_obj for date_obj in keys if date_obj not in records]
+    if missing:
+        schedules = DailySchedule.objects.in_bulk(missing, field_name='date')
+        loaded = {date_obj: _day_record(schedules.get(date_obj)) for date_obj in missing}
+        cache.set_many({keys[date_obj]: record for date_obj, record in loaded.items()}, SCHEDULE_CACHE_TIMEOUT)
+        records.update(loaded)
+    return records
+
+def invalidate_day_schedules():
+    """Drop every cached day record once the surrounding transaction commits"""
+    transaction.on_commit(lambda: cache.set(BLOCK_ORDER_VERSION_CACHE_KEY, time.time_ns(), None))
+
+def get_block_course_names(user):
+    """
+    The user's cached {block: course name} map (e.g. {"1A": "Chemistry 11"}) and when their
+    profile last changed, loading both with one query on a miss.
+
+    Returns:
+        dict: {"courses", "updated_at"}
+    """
+    key = BLOCK_COURSES_CACHE_KEY.format(user_id=user.id)
+    block_courses = cache.get(key)
+    if block_courses is None:
+        profile = UserProfile.objects.select_related(*BLOCK_FIELDS).get(user=user)
+        courses = {}
+        for field in BLOCK_FIELDS:
+            course = getattr(profile, field)
+            if course:
+                courses[field.replace('block_', '')] = course.name
+        block_courses = {'courses': courses, 'updated_at': profile.updated_at}
+        cache.set(key, block_courses, SCHEDULE_CACHE_TIMEOUT)
+    return block_courses
+
+def invalidate_block_course_names(user_id):
+    """Forget a user's block map once the surrounding transaction commits"""
+    key = BLOCK_COURSES_CACHE_KEY.format(user_id=user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
 def get_block_order_for_day(iso_date):
     """
-    Get block order for a specific date
+    Get block order for a specific date from the synced DailySchedule rows
     :param iso_date: Date in YYYY-MM-DD format
     :return: Dictionary with blocks and times
     """
     date_obj = _parse_iso_date(iso_date)
-    sheet_date = _convert_to_sheet_date_format(date_obj)
-
-    existing_schedule = DailySchedule.objects.filter(date=date_obj).first()
-
-    if existing_schedule != None:
-        if any([existing_schedule.block_1, existing_schedule.block_2, existing_schedule.block_3, existing_schedule.block_4, existing_schedule.block_5]):
-            blocks = [
-                existing_schedule.block_1,
-                existing_schedule.block_2,
-                existing_schedule.block_3,
-                existing_schedule.block_4,
-                existing_schedule.block_5,
-            ]
-            times = [
-                existing_schedule.block_1_time,
-                existing_schedule.block_2_time,
-                existing_schedule.block_3_time,
-                existing_schedule.block_4_time,
-                existing_schedule.block_5_time,
-            ]
-            
-            # Add blocks 6-8 only if they exist
-            for block_num in [6, 7, 8]:
-                block_value = getattr(existing_schedule, f'block_{block_num}', None)
-                time_value = getattr(existing_schedule, f'block_{block_num}_time', None)
-                if block_value:
-                    blocks.append(block_value)
-                    times.append(time_value)
-            
-            return {
-                'blocks': blocks,
-                'times': times,
-            }
-        elif not existing_schedule.is_school and existing_schedule.is_school != None:
-            return {
-                'blocks': [None, None, None, None, None],
-                'times': [None,None, None, None, None],
-            }
-        
-
-    alt_day_description = get_alt_day_event(date_obj)
-    if alt_day_description:
-        block_times = extract_block_times_from_description(alt_day_description)
-    else:
-        block_times = {i + 1: DEFAULT_BLOCK_TIMES[i] for i in range(5)}
-
-    date_column = sheet.col_values(4)[6:]
-    rows = sheet.get_all_values()[6:212]
-
-    for i, date_str in enumerate(date_column):
-        if date_str.strip() == sheet_date.strip():
-            schedule, created = DailySchedule.objects.get_or_create(date=date_obj)
-            for block_index in range(5):
-                block_field = f'block_{block_index + 1}'
-                time_field = f'block_{block_index + 1}_time'
-                block_value = rows[i][4 + block_index] if len(rows[i]) > 4 + block_index else None
-                time_value = block_times.get(block_index + 1)
-
-                if getattr(schedule, block_field) in [None, ""] and block_value:
-                    setattr(schedule, block_field, block_value)
-
-                if getattr(schedule, time_field) in [None, ""] and time_value:
-                    setattr(schedule, time_field, time_value)
-
-            # Check if any blocks 1-8 exist to determine if it's a school day
-            school_blocks = []
-            for block_num in range(1, 9):
-                if hasattr(schedule, f'block_{block_num}'):
-                    school_blocks.append(getattr(schedule, f'block_{block_num}'))
-            
-            schedule.is_school = any(school_blocks)
-            schedule.save()
-
-            blocks = []
-            times = []
-            for block_num in range(1, 9):
-                if hasattr(schedule, f'block_{block_num}'):
-                    block_value = getattr(schedule, f'block_{block_num}')
-                    time_value = getattr(schedule, f'block_{block_num}_time')
-                    if block_value:  # Only add if block exists and is not null
-                        blocks.append(block_value)
-                        times.append(time_value)
-                elif block_num <= 5:  # Always include blocks 1-5 even if null
-                    blocks.append(getattr(schedule, f'block_{block_num}'))
-                    times.append(getattr(schedule, f'block_{block_num}_time'))
-
-            return {
-                'blocks': blocks,
-                'times': times,
-            }
-
-    schedule, created = DailySchedule.objects.get_or_create(date=date_obj)
-    if created or schedule.is_school is None:
-        schedule.is_school = False
-    schedule.save()
-
+    record = get_day_schedules([date_obj])[date_obj]
     return {
-        'blocks': [None] * 5,
-        'times': [block_times.get(i+1, DEFAULT_BLOCK_TIMES[i] if i < len(DEFAULT_BLOCK_TIMES) else None) for i in range(5)],
+        'blocks': record['blocks'],
+        'times': record['times'],
     }
 
-def process_schedule_for_user(user, raw_schedule):
-    profile = UserProfile.objects.get(user=user)
+def get_schedule_range(user, start_date, end_date):
+    """
+    Processed schedule of every day from start_date to end_date (inclusive) for a user.
+
+    Returns:
+        tuple: (list of day dicts with date, display_date, is_school, ceremonial_uniform and
+            blocks [{"block", "time"}], datetime the newest row in range or the profile changed)
+    """
+    dates = [start_date + datetime.timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    records = get_day_schedules(dates)
+    block_courses = get_block_course_names(user)
+
+    days = []
+    for date_obj in dates:
+        record = records[date_obj]
+        processed = process_schedule_for_user(user, record, block_courses=block_courses)
+        is_school = processed != ["no school"]
+        days.append({
+            'date': date_obj.isoformat(),
+            'display_date': _convert_to_sheet_date_format(date_obj),
+            'is_school': is_school,
+            'ceremonial_uniform': record['ceremonial_uniform'],
+            'blocks': processed if is_school else [],
+        })
+
+    # Course names come from the profile, so its changes count as modifications too
+    last_modified = max(
+        [record['updated_at'] for record in records.values() if record['updated_at']]
+        + [block_courses['updated_at']]
+    )
+    return days, last_modified
+
+def process_schedule_for_user(user, raw_schedule, block_courses=None):
+    """
+    Join a day's block order with the user's courses. Pure apart from loading the
+    user's block map when block_courses is not passed in.
+    """
+    if block_courses is None:
+        block_courses = get_block_course_names(user)
+    course_names = block_courses['courses']
     processed_schedule = []
 
     block_mapping = {
@@ -218,10 +443,8 @@ def process_schedule_for_user(user, raw_schedule):
             if normalized in block_mapping:
                 processed_schedule.append({"block": block_mapping[normalized], "time": time})
             elif normalized in regular_blocks:
-                block_attr = f"block_{normalized.upper()}"
-                course = getattr(profile, block_attr, None)
                 processed_schedule.append({
-                    "block": course.name if course else "Add your courses in profile to unlock this!",
+                    "block": course_names.get(normalized.upper(), "Add your courses in profile to unlock this!"),
                     "time": time
                 })
             else:
@@ -236,43 +459,5 @@ def is_ceremonial_uniform_required(user, iso_date):
     Check if ceremonial uniform is required for a specific date
     :param iso_date: Date in YYYY-MM-DD format
     """
-    try:
-        date_obj = _parse_iso_date(iso_date)
-        existing_schedule, created = DailySchedule.objects.get_or_create(date=date_obj)
-        if existing_schedule:
-            if existing_schedule.ceremonial_uniform:
-                return True
-            elif existing_schedule.ceremonial_uniform == False:
-                return False
-            elif existing_schedule.is_school == False:
-                return False
-
-        service = get_google_calendar_service()
-        calendar_id = 'nda09oameg390vndlulocmvt07u7c8h4@import.calendar.google.com'
-        time_min = datetime.datetime.combine(date_obj, datetime.time.min).isoformat() + 'Z'
-        time_max = datetime.datetime.combine(date_obj, datetime.time.max).isoformat() + 'Z'
-
-        events_result = service.events().list(
-            calendarId=calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-
-        for event in events_result.get('items', []):
-            summary = event.get('summary', '').lower()
-            description = event.get('description', '').lower()
-            
-            if 'ceremonial uniform' in summary or 'ceremonial uniform' in description:
-                existing_schedule.ceremonial_uniform = True
-                existing_schedule.save()
-                return True
-
-    except HttpError as error:
-        print(f"An error occurred: {error}")
-        return False
-
-    existing_schedule.ceremonial_uniform = False
-    existing_schedule.save()
-    return False
+    date_obj = _parse_iso_date(iso_date)
+    return get_day_schedules([date_obj])[date_obj]['ceremonial_uniform']
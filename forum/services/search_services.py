@@ -1,40 +1,69 @@
-from django.db.models import Value, F, Count, Q
-from django.db.models.functions import Concat, Greatest
+from django.db.models import Value, F, Q, Func, CharField, FloatField
+from django.db.models.functions import Cast, Greatest
 from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
 from forum.models import Post, User
-from forum.services.utils import process_post_preview, add_course_context, annotate_post_card_context
-from forum.services.course_services import get_user_courses
+from forum.services.post_card_services import hydrate_post_cards
+from forum.services.trigram_utils import trigram_thresholds
 
-def search_posts(user, query):
+# Minimum SearchRank + title similarity for a post to be listed. Equal to the server's
+# default pg_trgm.similarity_threshold, so `title % query` never drops a listed post.
+POST_RANK_THRESHOLD = 0.3
+USER_SIMILARITY_THRESHOLD = 0.1
+
+
+class FullName(Func):
+    """
+    first_name || ' ' || last_name. Django's Concat compiles to CONCAT(), which is
+    not IMMUTABLE and so cannot back an index; this matches forum_user_full_name_trgm.
+    """
+    template = '(%(expressions)s)'
+    arg_joiner = ' || '
+    output_field = CharField()
+
+    def __init__(self, **extra):
+        super().__init__(F('first_name'), Value(' '), F('last_name'), **extra)
+
+
+def search_posts_queryset(query):
+    """
+    Posts matching query, annotated with rank. Candidates come from the
+    search_vector GIN index (`@@`) and the title trigram index (`%`).
+
+    rank is cast to double precision: both functions return real, which a cursor
+    cannot round-trip through JSON, so `rank = %s` would never match at a page edge.
+    """
     search_query = SearchQuery(query)
-    posts = Post.objects.annotate(
-        rank=SearchRank(F('search_vector'), search_query) + TrigramSimilarity('title', query),
-        solution_count=Count('solutions', distinct=True),
-        comment_count=Count('solutions__comments', distinct=True),
-        total_response_count=Count('solutions', distinct=True) + Count('solutions__comments', distinct=True)
-    ).filter(rank__gte=0.3).order_by('-rank')
+    return Post.objects.filter(
+        Q(search_vector=search_query) | Q(title__trigram_similar=query)
+    ).annotate(
+        rank=Cast(SearchRank(F('search_vector'), search_query) + TrigramSimilarity('title', query), FloatField())
+    ).filter(rank__gte=POST_RANK_THRESHOLD)
+
+def search_posts(user, query):
+    post_ids = search_posts_queryset(query).order_by('-rank').values_list('id', flat=True)
 
-    posts = annotate_post_card_context(posts, user)
-    return posts
+    return hydrate_post_cards(post_ids, user)
 
-def search_users(user, query):
+def search_users(user, query, limit=None):
     query = query.strip()
 
-    qs = User.objects.annotate(
-        trigram_first=TrigramSimilarity('first_name', query),
-        trigram_last=TrigramSimilarity('last_name', query),
-        trigram_full=TrigramSimilarity(
-            Concat(F('first_name'), Value(' '), F('last_name')),
-            query
-        ),
+    qs = User.objects.alias(
+        full_name=FullName()
+    ).filter(
+        Q(first_name__trigram_similar=query)
+        | Q(last_name__trigram_similar=query)
+        | Q(full_name__trigram_similar=query)
+    ).annotate(
         similarity=Greatest(
-            F('trigram_first'),
-            F('trigram_last'),
-            F('trigram_full'),
+            TrigramSimilarity('first_name', query),
+            TrigramSimilarity('last_name', query),
+            TrigramSimilarity('full_name', query),
         )
-    ).filter(
-        similarity__gte=0.1
     ).order_by('-similarity')
 
-    return qs
+    if limit is not None:
+        qs = qs[:limit]
 
+    # `%` only honours the session threshold, so evaluate while it is lowered
+    with trigram_thresholds(similarity=USER_SIMILARITY_THRESHOLD):
+        return list(qs)
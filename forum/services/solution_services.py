@@ -1,8 +1,9 @@
 from django.shortcuts import get_object_or_404
-from forum.models import Post, Solution, SolutionUpvote, SolutionDownvote, SavedSolution
+from forum.models import Post, Solution, SolutionVote, SavedSolution
 from forum.services.utils import detect_bad_words, extract_and_delete_files_from_content
 from forum.services.notification_services import send_solution_notification_service
-from django.db.models import F
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
 import json
 
 def create_solution_service(user, post_id, data):
@@ -26,11 +27,13 @@ def create_solution_service(user, post_id, data):
 
         detect_bad_words(content)
         
-        solution = Solution.objects.create(
-            post=post,
-            author=user,
-            content=content
-        )
+        with transaction.atomic():
+            solution = Solution.objects.create(
+                post=post,
+                author=user,
+                content=content
+            )
+            Post.objects.filter(id=post.id).update(solution_count=F('solution_count') + 1)
 
         send_solution_notification_service(solution)
 
@@ -74,54 +77,67 @@ def delete_solution_service(user, solution_id):
         if solution.content:
             extract_and_delete_files_from_content(solution.content)
         
-        solution.delete()
+        with transaction.atomic():
+            Post.objects.filter(id=solution.post_id).update(
+                solution_count=F('solution_count') - 1,
+                comment_count=F('comment_count') - solution.comment_count
+            )
+            solution.delete()
         return {'message': 'Solution deleted successfully'}
     except Exception as e:
         return {'error': str(e)}
 
 def vote_solution_service(user, solution_id, vote_type):
+    """
+    Apply an upvote or downvote to a solution.
+
+    Voting against an existing opposite vote removes it; repeating the same vote is
+    a conflict. Everything runs in one transaction: the solution row is locked and
+    read together with the user's current vote, the vote row is inserted or deleted,
+    and the counters are moved with F() deltas, so concurrent votes never lose updates
+    and content edits are never overwritten.
+    """
+    value = SolutionVote.UPVOTE if vote_type == 'upvote' else SolutionVote.DOWNVOTE
     try:
-        solution = get_object_or_404(Solution, id=solution_id)
-        
-        if vote_type == 'upvote':
-            if SolutionDownvote.objects.filter(solution=solution, user=user).exists():
-                SolutionDownvote.objects.filter(solution=solution, user=user).delete()
-                solution.downvotes -= 1
-                message = 'Downvote removed'
-            elif not SolutionUpvote.objects.filter(solution=solution, user=user).exists():
-                SolutionUpvote.objects.create(solution=solution, user=user)
-                solution.upvotes += 1
-                message = 'Solution upvoted successfully'
-            else:
+        with transaction.atomic():
+            current_vote = SolutionVote.objects.filter(
+                solution=OuterRef('pk'), user=user
+            ).values('value')[:1]
+            solution = get_object_or_404(
+                Solution.objects.select_for_update(of=('self',)).only('id', 'upvotes', 'downvotes').annotate(
+                    current_vote=Subquery(current_vote)
+                ),
+                id=solution_id
+            )
+
+            if solution.current_vote == value:
+                label = 'upvoted' if value == SolutionVote.UPVOTE else 'downvoted'
                 return {
-                    'conflict': True, 
-                    'error': 'Already upvoted',
-                    'messages': [{'message': 'You have already upvoted this solution', 'tags': 'info'}]
+                    'conflict': True,
+                    'error': f'Already {label}',
+                    'messages': [{'message': f'You have already {label} this solution', 'tags': 'info'}]
                 }
-        else:  # downvote
-            if SolutionUpvote.objects.filter(solution=solution, user=user).exists():
-                SolutionUpvote.objects.filter(solution=solution, user=user).delete()
-                solution.upvotes -= 1
-                message = 'Upvote removed'
-            elif not SolutionDownvote.objects.filter(solution=solution, user=user).exists():
-                SolutionDownvote.objects.create(solution=solution, user=user)
-                solution.downvotes += 1
-                message = 'Solution downvoted successfully'
+
+            if solution.current_vote is None:
+                SolutionVote.objects.create(solution_id=solution.id, user=user, value=value)
+                delta, new_vote = 1, value
+                message = 'Solution upvoted successfully' if value == SolutionVote.UPVOTE else 'Solution downvoted successfully'
             else:
-                return {
-                    'conflict': True,  
-                    'error': 'Already downvoted',
-                    'messages': [{'message': 'You have already downvoted this solution', 'tags': 'info'}]
-                }
-        
-        solution.save()
+                # Voting against an existing vote withdraws it
+                SolutionVote.objects.filter(solution_id=solution.id, user=user).delete()
+                delta, new_vote = -1, None
+                message = 'Downvote removed' if value == SolutionVote.UPVOTE else 'Upvote removed'
+
+            counter = 'upvotes' if (new_vote or solution.current_vote) == SolutionVote.UPVOTE else 'downvotes'
+            Solution.objects.filter(id=solution.id).update(**{counter: F(counter) + delta})
+            # The row lock makes the values read above current, so the new totals need no re-read
+            setattr(solution, counter, getattr(solution, counter) + delta)
+
         return {
             'success': True,
             'upvotes': solution.upvotes,
             'downvotes': solution.downvotes,
-            'vote_state': 'upvoted' if SolutionUpvote.objects.filter(solution=solution, user=user).exists() 
-                         else 'downvoted' if SolutionDownvote.objects.filter(solution=solution, user=user).exists() 
-                         else 'none',
+            'vote_state': {SolutionVote.UPVOTE: 'upvoted', SolutionVote.DOWNVOTE: 'downvoted'}.get(new_vote, 'none'),
             'messages': [{'message': message, 'tags': 'success'}]
         }
     except Exception as e:
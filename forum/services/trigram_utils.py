@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+from django.db import connection, transaction
+
+# pg_trgm thresholds used by the `%` (trigram_similar) and `%>` (trigram_word_similar)
+# operators. Unlike similarity() comparisons, these operators can use the
+# gin_trgm_ops indexes declared on the searched columns.
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+DEFAULT_WORD_SIMILARITY_THRESHOLD = 0.6
+
+
+@contextmanager
+def trigram_thresholds(similarity=DEFAULT_SIMILARITY_THRESHOLD, word_similarity=DEFAULT_WORD_SIMILARITY_THRESHOLD):
+    """
+    Run the enclosed queries with the given pg_trgm thresholds.
+
+    The settings are transaction-local (SET LOCAL), so querysets must be evaluated
+    inside the block and the thresholds never leak onto a pooled connection.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, true), "
+                "set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(similarity), str(word_similarity)],
+            )
+        yield
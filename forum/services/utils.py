@@ -1,23 +1,121 @@
 import re
 import os
-import uuid
+import json
+import base64
+from datetime import datetime
+from functools import lru_cache
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
 from django.utils.html import strip_tags
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.http import JsonResponse
+from django.urls import reverse
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from forum.services.course_services import get_user_courses
-from PIL import Image
-from io import BytesIO
 from urllib.parse import urlparse
 
+@lru_cache(maxsize=1)
+def get_redis_client():
+    """
+    Shared redis-py client for data structures the Django cache API cannot express
+    (hashes, lists). Returns None when REDIS_URL is not configured.
+    """
+    redis_url = getattr(settings, 'REDIS_URL', None)
+    if not redis_url:
+        return None
+    import redis
+    options = {'ssl_cert_reqs': None} if redis_url.startswith('rediss://') else {}
+    return redis.Redis.from_url(redis_url, **options)
+
 ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/gif']
 ALLOWED_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif']
 
+# Editor.js block data keys that hold user-visible text (cf. forum_editorjs_text in migration 0042)
+EDITORJS_TEXT_KEYS = ('text', 'caption', 'title', 'message', 'code', 'items', 'content')
+# <br>, <i> and <em> become spaces so stripping the remaining tags cannot glue words together
+PREVIEW_SPACING_TAGS = re.compile(r'<br\s*/?>|<i\s*/?>|<em\s*/?>')
+BREAK_TAG = re.compile(r'<br\s*/?>')
+
+def _clean_block_text(text):
+    text = PREVIEW_SPACING_TAGS.sub(' ', text).replace('&nbsp;', ' ')
+    return ' '.join(strip_tags(text).split())
+
+def _collect_strings(value, out):
+    """Strings anywhere in a block data value: list items, nested lists, table cells"""
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_strings(item, out)
+    elif isinstance(value, dict):
+        for key in ('content', 'text', 'items'):
+            if key in value:
+                _collect_strings(value[key], out)
+
+def extract_post_content(content):
+    """
+    Single pass over a post's Editor.js content for the columns stored on Post.
+
+    Args:
+        content: Editor.js document (dict, or the JSON string older posts store).
+
+    Returns:
+        dict: preview_text (cleaned paragraph text), first_image_url (first image
+            block's file URL or None) and body_text (cleaned text of every
+            text-bearing block).
+    """
+    document = content
+    if isinstance(document, str):
+        try:
+            document = json.loads(document)
+        except ValueError:
+            pass
+
+    if not isinstance(document, dict) or 'blocks' not in document:
+        text = BREAK_TAG.sub(' ', str(content))
+        text = ' '.join(strip_tags(text).split())
+        return {'preview_text': text, 'first_image_url': None, 'body_text': text}
+
+    paragraphs = []
+    body = []
+    first_image_url = None
+    for block in document.get('blocks') or []:
+        if not isinstance(block, dict):
+            continue
+        data = block.get('data') or {}
+        if not isinstance(data, dict):
+            continue
+
+        if block.get('type') == 'paragraph':
+            text = _clean_block_text(str(data.get('text', '')))
+            if text:
+                paragraphs.append(text)
+        elif block.get('type') == 'image' and first_image_url is None and 'file' in data:
+            file_data = data['file']
+            if isinstance(file_data, dict):
+                first_image_url = file_data.get('url')
+            elif isinstance(file_data, str):
+                first_image_url = file_data
+
+        strings = []
+        for key in EDITORJS_TEXT_KEYS:
+            if key in data:
+                _collect_strings(data[key], strings)
+        body.extend(text for text in map(_clean_block_text, strings) if text)
+
+    return {
+        'preview_text': ' '.join(paragraphs),
+        'first_image_url': first_image_url,
+        'body_text': ' '.join(body),
+    }
+
 def process_post_preview(post):
     """
-    Generate a preview text for a post by extracting and cleaning paragraph blocks from Editor.js content.
+    Generate a preview text for a post (or solution) by extracting and cleaning paragraph
+    blocks from Editor.js content. Posts store this as Post.preview_text.
 
     Args:
         post: Post object with a content attribute (dict or str).
@@ -25,53 +123,92 @@ def process_post_preview(post):
     Returns:
         str: Concatenated and cleaned preview text.
     """
-    if isinstance(post.content, dict) and 'blocks' in post.content:
-        paragraphs = []
-        for block in post.content['blocks']:
-            if block.get('type') == 'paragraph':
-                text = block.get('data', {}).get('text', '')
-                text = re.sub(r'<br\s*/?>', ' ', text)
-                text = re.sub(r'<i\s*/?>', ' ', text)
-                text = re.sub(r'<em\s*/?>', ' ', text)
-                text = text.replace('&nbsp;', ' ') 
-                text = strip_tags(text)
-                text = ' '.join(text.split())
-                if text:
-                    paragraphs.append(text)
-        return ' '.join(paragraphs)
-    else:
-        text = str(post.content)
-        text = re.sub(r'<br\s*/?>', ' ', text)
-        text = strip_tags(text)
-        return ' '.join(text.split())
-    
-def annotate_post_card_context(posts, user):
-    from forum.models import FollowedPost
-    
-    experienced_courses, help_needed_courses = get_user_courses(user)
+    return extract_post_content(post.content)['preview_text']
     
-    post_ids = [post.id for post in posts]
-    
-    liked_post_ids = set()
-    followed_post_ids = set()
-    
-    if user.is_authenticated:
-        liked_post_ids = set(
-            user.liked_posts.filter(post_id__in=post_ids).values_list('post_id', flat=True)
-        )
-        
-        followed_post_ids = set(
-            user.followed_posts.filter(post_id__in=post_ids).values_list('post_id', flat=True)
+def encode_cursor(*values):
+    """
+    Encode keyset values (e.g. created_at and id of the last row) into an opaque cursor string.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _cursor_values(queryset, values, order_field, id_field):
+    """
+    Convert decoded cursor values to the Python types of the fields they key on, so a
+    tampered cursor fails here as a ValueError rather than in the database.
+    """
+    converted = []
+    for name, value in zip((order_field, id_field), values):
+        if name in queryset.query.annotations:
+            field = queryset.query.annotations[name].output_field
+        else:
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ValueError("Invalid cursor")
+        if value is None or isinstance(value, (bool, list, dict)):
+            raise ValueError("Invalid cursor")
+        try:
+            converted.append(field.to_python(value))
+        except ValidationError:
+            raise ValueError("Invalid cursor")
+    return converted
+
+
+def paginate_by_cursor(queryset, cursor, per_page, order_field='created_at', id_field='id'):
+    """
+    Keyset pagination over (order_field, id_field), both descending.
+
+    Unlike Paginator this never runs COUNT(*) or OFFSET: each page is a single
+    range read of per_page + 1 rows, the extra row telling whether there is a next page.
+
+    Args:
+        queryset: Queryset (or annotated queryset) to paginate.
+        cursor: Cursor returned with the previous page, or None/'' for the first page.
+        per_page: Number of rows per page.
+        order_field: Field or annotation to order by, e.g. 'created_at' or 'rank'.
+        id_field: Unique tie-breaker field.
+
+    Returns:
+        tuple: (list of rows on this page, next_cursor or None)
+
+    Raises:
+        ValueError: If the cursor is malformed or does not fit the fields.
+    """
+    if cursor:
+        last_value, last_id = _cursor_values(queryset, decode_cursor(cursor), order_field, id_field)
+        queryset = queryset.filter(
+            Q(**{f'{order_field}__lt': last_value}) |
+            Q(**{order_field: last_value, f'{id_field}__lt': last_id})
         )
-    
-    for post in posts:
-        post.preview_text = process_post_preview(post)
-        add_course_context(post, experienced_courses, help_needed_courses)
-        
-        post.is_liked_by_user = post.id in liked_post_ids
-        post.is_following = post.id in followed_post_ids
-    
-    return posts
+
+    rows = list(queryset.order_by(f'-{order_field}', f'-{id_field}')[:per_page + 1])
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, order_field), getattr(last, id_field))
+    return rows, next_cursor
 
 
 def add_course_context(post, experienced_courses=None, help_needed_courses=None):
@@ -101,16 +238,16 @@ def upload_image(request):
     Handle image uploads for Editor.js.
 
     - Ensures only allowed image types are accepted.
-    - Converts all images to JPEG format.
-    - Generates a unique filename for each upload.
-    - Saves the image to the default Django storage.
-    - Enforces a maximum file size of 500 MB.
+    - Streams the original to the default Django storage without decoding it.
+    - Queues the resized WebP/JPEG variants (see forum/services/image_services.py).
+    - Enforces a maximum file size of 10 MB.
 
     Args:
         request: Django HttpRequest object with an uploaded file in 'image'.
 
     Returns:
-        JsonResponse: Success with image URL or error message.
+        JsonResponse: Success with the image's stable URL (served by image_asset_view,
+            usable right away) or error message.
     """
     MAX_IMAGE_SIZE = 10 * 1024 * 1024  #10 MB
 
@@ -127,27 +264,17 @@ def upload_image(request):
         if mime_type not in ALLOWED_IMAGE_TYPES or ext not in ALLOWED_EXTENSIONS:
             return JsonResponse({'error': 'Unsupported file type.'}, status=400)
 
-        # 2. Open and convert to JPEG
+        # 2. Store the original; the variants are made by a worker
         try:
-            img = Image.open(image_file)
-            rgb_img = img.convert('RGB')  # Convert to RGB for JPEG
-
-            # 3. Generate unique filename
-            unique_name = f"{uuid.uuid4().hex}.jpg"
-            upload_path = os.path.join('uploads', unique_name)
-
-            # 4. Save to BytesIO as JPEG
-            buffer = BytesIO()
-            rgb_img.save(buffer, format='JPEG', quality=90)
-            buffer.seek(0)
-
-            # 5. Save to storage
-            saved_path = default_storage.save(upload_path, ContentFile(buffer.read()))
-            image_url = default_storage.url(saved_path)
-
-            return JsonResponse({'success': 1, 'file': {'url': image_url}})
+            from forum.services.image_services import store_image_upload
+            asset = store_image_upload(image_file, request.user)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
         except Exception as e:
-            return JsonResponse({'error': f'Image processing failed: {str(e)}'}, status=400)
+            return JsonResponse({'error': f'Image upload failed: {str(e)}'}, status=400)
+
+        image_url = request.build_absolute_uri(reverse('image_asset', args=[asset.key]))
+        return JsonResponse({'success': 1, 'file': {'url': image_url}})
     else:
         return JsonResponse({'error': 'No image uploaded'}, status=400)
     
@@ -224,56 +351,121 @@ leet_mapping = str.maketrans({
     '2': 'z'
 })
 
-def normalize_text(text):
+# Inline tags Editor.js writes into block text, and HTML entities (block text escapes
+# a typed '<' as &lt;). Only block text is treated as markup: in plain strings such as
+# bios '<' is just a character.
+EDITORJS_TAG_PATTERN = re.compile(r'</?(?:a|b|br|code|em|font|i|mark|s|span|strong|sub|sup|u)(?:\s[^<>\n]*)?/?>')
+HTML_ENTITY_PATTERN = re.compile(r'&#?\w+;')
+# Any other bracketed text keeps its contents: the brackets become spaces rather than
+# leet 'c's that would glue "<word>" into "cword"
+BRACKETED_PATTERN = re.compile(r'<([^<>\n]*)>')
+NON_LETTER_PATTERN = re.compile(r'[^a-z\s]+')
+REPEATED_LETTER_PATTERN = re.compile(r'([a-z])\1{2,}')
+
+DEFAULT_MODERATION_WORDS = ('fuck', 'bitch', 'shit', 'ass', 'dick', 'cunt', 'cock', 'pussy')
+
+def normalize_text(text, markup=False):
     """
-    Normalize text by converting leetspeak, removing special characters, and reducing repeated letters.
+    Normalize text by converting leetspeak, removing special characters, and reducing
+    repeated letters. Whitespace (including newlines) is kept as is.
 
     Args:
         text (str): The input text.
+        markup (bool): Whether text is Editor.js block text, whose inline tags and
+            entities are dropped first.
 
     Returns:
         str: Normalized, lowercase text.
     """
     if not text:
         return ""
-    
-    text = text.translate(leet_mapping)  # Convert leetspeak
-    text = re.sub(r'[^a-zA-Z\s]', '', text)  # Remove non-alphabetic characters, keep spaces
-    text = re.sub(r'\s+', ' ', text).strip()  # Normalize spaces
-    text = re.sub(r'(.)\1{2,}', r'\1', text)  # Reduce repeated letters (e.g., "loooool" -> "lol")
-    
-    return text.lower()
 
-bad_word_list = ['fuck', 'bitch', 'shit', 'ass', 'dick', 'cunt', 'cock', 'pussy']
-bad_word_pattern = re.compile(r'\b(' + '|'.join(map(re.escape, bad_word_list)) + r')\b', re.IGNORECASE)
+    text = text.lower()
+    if markup:
+        text = HTML_ENTITY_PATTERN.sub(' ', EDITORJS_TAG_PATTERN.sub(' ', text))
+    text = BRACKETED_PATTERN.sub(r' \1 ', text)
+    text = text.translate(leet_mapping)  # Convert leetspeak
+    text = NON_LETTER_PATTERN.sub('', text)  # Remove non-alphabetic characters, keep whitespace
+    return REPEATED_LETTER_PATTERN.sub(r'\1', text)  # Reduce repeated letters (e.g., "loooool" -> "lol")
+
+def _trie_pattern(node):
+    """Regex for a character trie: words sharing a prefix share one branch, so the
+    engine never retries the same prefix once per word."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        return ('(?:' + pattern + ')?') if len(branches) == 1 else pattern + '?'
+    return pattern
+
+class ModerationFilter:
+    """
+    Wordlist compiled into a single pattern that matches normalized text in one scan.
+    """
+    def __init__(self, words):
+        trie = {}
+        for word in {normalize_text(word).strip() for word in words}:
+            if not word:
+                continue
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        self.pattern = re.compile(r'\b' + _trie_pattern(trie) + r'\b') if trie else None
+
+    def search(self, text, markup=False):
+        """Whether text contains a listed word once normalized (see normalize_text)"""
+        return self.pattern is not None and self.pattern.search(normalize_text(text, markup)) is not None
+
+def load_moderation_words(path):
+    """One word per line; blank lines and lines starting with '#' are skipped."""
+    with open(path, encoding='utf-8') as wordlist:
+        return [line.strip() for line in wordlist if line.strip() and not line.lstrip().startswith('#')]
+
+@lru_cache(maxsize=1)
+def get_moderation_filter():
+    """
+    Process-wide ModerationFilter, built on first use from MODERATION_WORDLIST_PATH
+    (or DEFAULT_MODERATION_WORDS when unset).
+    """
+    path = getattr(settings, 'MODERATION_WORDLIST_PATH', None)
+    return ModerationFilter(load_moderation_words(path) if path else DEFAULT_MODERATION_WORDS)
 
 def detect_bad_words(content):
     """
     Detects bad words in plain text or structured Editor.js content.
     Raises ValueError if bad words are found, specifying the location.
+
+    The text of every block (paragraphs, headers, quotes, lists, tables, ...) is
+    normalized and scanned as one document; blocks are only scanned one at a time
+    to name the offending block once the document has matched.
     """
+    moderation = get_moderation_filter()
+
     if isinstance(content, str):
-        normalized_text = normalize_text(content)
-        if bad_word_pattern.search(normalized_text):
+        if moderation.search(content):
             raise ValueError("Bad word detected in text.")
-    
+
     elif isinstance(content, dict) and 'blocks' in content:
-        for block in content['blocks']:
-            block_type = block.get("type", "unknown")
-            data = block.get("data", {})
-            
-            text = data.get("text", "")
-            items = data.get("items", [])
-            
-            if text:
-                normalized_text = normalize_text(text)
-                if bad_word_pattern.search(normalized_text):
+        texts = []
+        block_types = []
+        for block in content['blocks'] or []:
+            data = block.get("data") if isinstance(block, dict) else None
+            if not isinstance(data, dict):
+                continue
+            count = len(texts)
+            for key in EDITORJS_TEXT_KEYS:
+                if key in data:
+                    _collect_strings(data[key], texts)
+            block_types.extend([block.get("type", "unknown")] * (len(texts) - count))
+
+        # Newlines keep words from running across blocks
+        if moderation.search('\n'.join(texts), markup=True):
+            for text, block_type in zip(texts, block_types):
+                if moderation.search(text, markup=True):
                     raise ValueError(f"Bad word detected in block of type '{block_type}'.")
-            
-            for item in items:
-                item_text = normalize_text(item.get("content"))
-                if bad_word_pattern.search(item_text):
-                    raise ValueError(f"Bad word detected in list item in block of type '{block_type}'.")
+            raise ValueError("Bad word detected in text.")
     else:
         raise ValueError("Unsupported content format for bad word detection.")
 
@@ -319,9 +511,14 @@ def delete_files_from_urls(file_urls):
         file_urls: List of file URLs to delete
     """
     from urllib.parse import urlparse
-    
+    from forum.services.image_services import image_asset_key, delete_image_assets
+
+    asset_keys = [key for key in map(image_asset_key, file_urls) if key]
+    if asset_keys:
+        delete_image_assets(asset_keys)
+
     for url in file_urls:
-        if not url:
+        if not url or image_asset_key(url):
             continue
             
         try:
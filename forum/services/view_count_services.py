@@ -0,0 +1,100 @@
+import uuid
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import F
+from redis.exceptions import ResponseError
+from forum.models import Post
+from forum.services.utils import get_redis_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+PENDING_VIEWS_KEY = 'post_views:pending'
+FLUSHING_VIEWS_KEY = 'post_views:flushing'
+FLUSH_BATCH_SIZE = 500
+
+# Held for the whole flush so two workers never apply the same hash; the TTL frees
+# it if a worker dies mid-flush
+FLUSH_LOCK_KEY = 'post_views:flush_lock'
+FLUSH_LOCK_TIMEOUT = 5 * 60
+# Deletes the lock only while it still holds this flush's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def record_post_view(post_id):
+    """
+    Count one view of a post without writing to the database on the request path.
+
+    Views are buffered in a Redis hash and applied by flush_post_views. Without
+    Redis (local development) this falls back to a single atomic UPDATE.
+    """
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.hincrby(PENDING_VIEWS_KEY, post_id, 1)
+            return
+        except Exception as e:
+            logger.warning(f"Could not buffer view for post {post_id}, writing directly: {str(e)}")
+    Post.objects.filter(id=post_id).update(views=F('views') + 1)
+
+
+def flush_post_views():
+    """
+    Apply buffered view counts with batched `UPDATE ... SET views = views + n`.
+
+    The pending hash is atomically renamed before it is read, so views recorded
+    during a flush go into a fresh hash. Each batch's fields are removed from the
+    renamed hash once its UPDATE has committed, so a flush that crashes part way is
+    resumed on the next run from the batches still left. Delivery is at-least-once:
+    a crash between a batch's commit and its HDEL applies that batch again. A Redis
+    lock keeps overlapping runs from flushing the same hash.
+
+    Returns:
+        int: Number of views applied
+    """
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    token = uuid.uuid4().hex
+    if not client.set(FLUSH_LOCK_KEY, token, nx=True, ex=FLUSH_LOCK_TIMEOUT):
+        logger.info("Skipping post view flush, another flush is running")
+        return 0
+
+    try:
+        return _flush_locked(client)
+    finally:
+        client.eval(RELEASE_LOCK_SCRIPT, 1, FLUSH_LOCK_KEY, token)
+
+
+def _flush_locked(client):
+    """Body of flush_post_views, run while holding FLUSH_LOCK_KEY."""
+    if not client.exists(FLUSHING_VIEWS_KEY):
+        try:
+            client.rename(PENDING_VIEWS_KEY, FLUSHING_VIEWS_KEY)
+        except ResponseError:
+            # Nothing buffered since the last flush
+            return 0
+
+    pending = client.hgetall(FLUSHING_VIEWS_KEY)
+
+    # Group posts by increment so each batch is a single UPDATE
+    posts_by_increment = defaultdict(list)
+    for post_id, count in pending.items():
+        posts_by_increment[int(count)].append(int(post_id))
+
+    applied = 0
+    for increment, post_ids in posts_by_increment.items():
+        for start in range(0, len(post_ids), FLUSH_BATCH_SIZE):
+            batch = post_ids[start:start + FLUSH_BATCH_SIZE]
+            with transaction.atomic():
+                Post.objects.filter(id__in=batch).update(views=F('views') + increment)
+            # Not atomic with the commit above: a crash in between re-applies this batch
+            client.hdel(FLUSHING_VIEWS_KEY, *batch)
+            applied += increment * len(batch)
+    return applied
@@ -0,0 +1,82 @@
+"""
+Background WolfNet jobs (course auto-complete, password checks) that web requests start
+and then poll, so no web worker waits on Selenium.
+"""
+import logging
+import time
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core import signing
+
+logger = logging.getLogger(__name__)
+
+JOB_SALT = 'forum.wolfnet-job'
+# Matches CELERY_RESULT_EXPIRES: after that the result is gone anyway
+JOB_MAX_AGE = 60 * 60
+# Longest a status request may hold a web worker waiting for the job to move on
+MAX_WAIT_SECONDS = 10
+POLL_INTERVAL = 0.5
+
+
+def start_wolfnet_job(task_func, *args, user=None):
+    """
+    Enqueue a WolfNet task and return a job reference for get_wolfnet_job_status.
+    Without a result backend there is nothing to poll, so the task runs inline and its
+    result is returned directly.
+
+    Args:
+        task_func: Celery task to run
+        user (User, optional): Owner of the job; only they may read its status
+
+    Returns:
+        dict: {"job_id", "status": "pending"}, or the task's result with "status": "complete"
+    """
+    if getattr(settings, 'CELERY_RESULT_BACKEND', None) is None:
+        return {**task_func(*args), 'status': 'complete'}
+
+    async_result = task_func.delay(*args)
+    job_id = signing.dumps(
+        {'task_id': async_result.id, 'user_id': user.id if user else None},
+        salt=JOB_SALT,
+        compress=True,
+    )
+    return {'job_id': job_id, 'status': 'pending'}
+
+
+def get_wolfnet_job_status(job_id, user=None, wait=0):
+    """
+    Current state of a job started with start_wolfnet_job. With `wait`, holds the request
+    (up to MAX_WAIT_SECONDS) until the job finishes or reports new progress.
+
+    Returns:
+        dict or None: None for an unknown, expired or foreign job id. Otherwise
+            {"status": "pending"|"running", "progress": step or None} while the job runs,
+            the task's result with "status": "complete", or a failure with "status": "failed"
+    """
+    try:
+        job = signing.loads(job_id, salt=JOB_SALT, max_age=JOB_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if job['user_id'] is not None and getattr(user, 'id', None) != job['user_id']:
+        return None
+
+    result = AsyncResult(job['task_id'])
+    state = result.state
+    deadline = time.monotonic() + min(max(wait, 0), MAX_WAIT_SECONDS)
+    while not result.ready() and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        if result.state != state:
+            break
+    state = result.state
+
+    if state == 'SUCCESS':
+        return {**result.result, 'status': 'complete'}
+    if state in ('FAILURE', 'REVOKED'):
+        logger.error(f"WolfNet job {job['task_id']} ended in {state}: {result.result}")
+        return {'success': False, 'status': 'failed', 'error': 'The WolfNet request failed. Please try again.'}
+
+    info = result.info if isinstance(result.info, dict) else {}
+    return {
+        'status': 'pending' if state == 'PENDING' else 'running',
+        'progress': info.get('step'),
+    }
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.utils import timezone
+from forum.models import WolfNetSession
+import requests
+import logging
+
+logger = logging.getLogger(__name__)
+
+WOLFNET_BASE_URL = "https://wpga.myschoolapp.com"
+# Cheap authenticated endpoint: returns the signed-in user's context, 401 once the session is gone
+WOLFNET_CONTEXT_URL = f"{WOLFNET_BASE_URL}/api/webapp/context"
+WOLFNET_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Referer": f"{WOLFNET_BASE_URL}/",
+}
+
+# Upper bound on how long a captured session is trusted, even if its cookies say longer
+SESSION_MAX_AGE = timedelta(hours=12)
+# A session validated this recently is used without another round trip
+REVALIDATE_AFTER = timedelta(minutes=30)
+
+
+class WolfNetSessionExpired(Exception):
+    """WolfNet rejected the stored session's cookies mid-check"""
+
+
+def build_http_session(cookies):
+    """requests.Session carrying the WolfNet cookies and the headers the gradebook API expects"""
+    http_session = requests.Session()
+    http_session.headers.update(WOLFNET_HEADERS)
+    for name, value in cookies.items():
+        http_session.cookies.set(name, value)
+    return http_session
+
+
+def is_session_alive(http_session):
+    """One lightweight API call to see whether WolfNet still accepts the cookies."""
+    try:
+        response = http_session.get(WOLFNET_CONTEXT_URL, timeout=10, allow_redirects=False)
+    except requests.RequestException as e:
+        logger.warning(f"Could not validate WolfNet session: {str(e)}")
+        return False
+    if response.status_code != 200:
+        return False
+    try:
+        return bool(response.json())
+    except ValueError:
+        # Logged-out requests are redirected to an HTML login page
+        return False
+
+
+def store_wolfnet_session(user, selenium_cookies, student_id, sections):
+    """
+    Save the cookies of a fresh Selenium login. The session expires with its earliest
+    expiring cookie, capped at SESSION_MAX_AGE.
+
+    Args:
+        selenium_cookies (list): driver.get_cookies() output
+        sections (list): [{"section_id": str, "course_name": str}, ...]
+    """
+    now = timezone.now()
+    expires_at = now + SESSION_MAX_AGE
+    for cookie in selenium_cookies:
+        if cookie.get('expiry'):
+            expires_at = min(expires_at, datetime.fromtimestamp(cookie['expiry'], tz=dt_timezone.utc))
+
+    wolfnet_session, _ = WolfNetSession.objects.get_or_create(
+        user=user,
+        defaults={'validated_at': now, 'expires_at': expires_at},
+    )
+    wolfnet_session.set_cookies({c['name']: c['value'] for c in selenium_cookies})
+    wolfnet_session.student_id = student_id
+    wolfnet_session.sections = sections
+    wolfnet_session.validated_at = now
+    wolfnet_session.expires_at = expires_at
+    wolfnet_session.save()
+    return wolfnet_session
+
+
+def load_wolfnet_session(user):
+    """
+    Return (WolfNetSession, requests.Session) for a live stored session, or (None, None)
+    when there is none or it has expired or stopped validating.
+    """
+    wolfnet_session = WolfNetSession.objects.filter(user=user).first()
+    if wolfnet_session is None:
+        return None, None
+
+    now = timezone.now()
+    if wolfnet_session.expires_at <= now:
+        invalidate_wolfnet_session(user)
+        return None, None
+
+    try:
+        http_session = build_http_session(wolfnet_session.get_cookies())
+    except Exception as e:
+        logger.error(f"Could not decrypt WolfNet session for user {user.id}: {str(e)}")
+        invalidate_wolfnet_session(user)
+        return None, None
+
+    if now - wolfnet_session.validated_at >= REVALIDATE_AFTER:
+        if not is_session_alive(http_session):
+            logger.info(f"Stored WolfNet session for user {user.id} is no longer valid")
+            invalidate_wolfnet_session(user)
+            return None, None
+        WolfNetSession.objects.filter(pk=wolfnet_session.pk).update(validated_at=now)
+
+    return wolfnet_session, http_session
+
+
+def invalidate_wolfnet_session(user):
+    WolfNetSession.objects.filter(user=user).delete()
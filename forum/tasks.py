@@ -1,134 +1,26 @@
 from celery import shared_task
-from forum.models import User, GradebookSnapshot
+from forum.models import User, Post, GradebookSnapshot, GradebookDelta, WolfNetSession
+from forum.services.gradebook_diff import normalize_assignments, content_hash, diff_assignments, build_delta
+from forum.services.wolfnet_session_services import WolfNetSessionExpired
+from forum.services.browser_pool import get_browser_pool
 import logging
 import time
 import re
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import requests
 from django.utils.html import strip_tags
 from django.http import HttpRequest
+from django.db import transaction
 import django
-import tempfile
-import shutil
 import concurrent.futures
 import traceback
-import gc
 import uuid
 import os
-import platform
 
 logger = logging.getLogger(__name__)
 
-def get_memory_optimized_chrome_options():
-    """
-    Get Chrome options optimized for low memory usage and crash prevention
-    
-    Returns:
-        Options: Configured Chrome options
-    """
-    chrome_options = Options()
-    
-    # Check if running locally vs Heroku to prevent segfaults in local dev
-    is_heroku = os.environ.get('CHROME_BIN') is not None
-    
-    if is_heroku:
-        chrome_options.add_argument("--headless=new")  # Force headless mode for production
-    else:
-        # Local development - avoid headless to prevent segfaults
-        logger.info("Running locally - GUI mode enabled to prevent segmentation faults")
-    
-    # Essential crash prevention flags
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    
-    # Critical flags to prevent segfaults in fork processes
-    # Only add zygote/single-process flags on Linux/Heroku where forking issues are common.
-    # These flags are known to cause Chrome to crash or close the DevTools connection on macOS.
-    try:
-        system_name = platform.system().lower()
-    except Exception:
-        system_name = ''
-
-    add_isolation_flags = False
-    # If running on Heroku (CHROME_BIN set) or on Linux, enable these isolation flags
-    if os.environ.get('CHROME_BIN') is not None or system_name == 'linux':
-        add_isolation_flags = True
-
-    if add_isolation_flags:
-        chrome_options.add_argument("--no-zygote")  # Disable zygote process
-        chrome_options.add_argument("--single-process")  # Force single process mode
-    else:
-        logger.debug(f"Skipping --no-zygote/--single-process flags on platform={system_name}")
-    chrome_options.add_argument("--disable-background-timer-throttling")
-    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-    chrome_options.add_argument("--disable-renderer-backgrounding")
-    
-    # Disable problematic features that can cause crashes
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-plugins")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    chrome_options.add_argument("--disable-background-networking")
-    chrome_options.add_argument("--disable-default-apps")
-    chrome_options.add_argument("--disable-sync")
-    chrome_options.add_argument("--disable-translate")
-    chrome_options.add_argument("--disable-features=TranslateUI")
-    chrome_options.add_argument("--disable-ipc-flooding-protection")
-    
-    # Memory and stability
-    # chrome_options.add_argument("--max_old_space_size=4096")
-    # chrome_options.add_argument("--no-first-run")
-    # chrome_options.add_argument("--no-default-browser-check")
-    
-    # Only disable images if not causing redirect issues
-    # chrome_options.add_argument("--blink-settings=imagesEnabled=false")
-
-    # Set a safer page load strategy (normal) to ensure redirects complete
-    chrome_options.set_capability("pageLoadStrategy", "normal")
-    
-    # Configure Chrome binary location for Heroku
-    chrome_bin = os.environ.get('CHROME_BIN')
-    if chrome_bin:
-        chrome_options.binary_location = chrome_bin
-        logger.info(f"Using Chrome binary from environment: {chrome_bin}")
-    
-    return chrome_options
-
-def create_webdriver_with_cleanup():
-    """
-    Create a WebDriver with proper cleanup handling using enhanced isolation
-    
-    Returns:
-        tuple: (driver, temp_user_data_dir)
-    """
-    # Create a unique temporary user-data-dir per run to avoid conflicts
-    # when multiple WebDriver instances are created concurrently.
-    chrome_options = get_memory_optimized_chrome_options()
-
-    temp_user_data_dir = None
-    try:
-        temp_user_data_dir = tempfile.mkdtemp(prefix='chrome_user_data_')
-        # Ensure directory was created
-        if temp_user_data_dir and os.path.isdir(temp_user_data_dir):
-            chrome_options.add_argument(f"--user-data-dir={temp_user_data_dir}")
-    except Exception:
-        # If creation fails, proceed without explicitly setting user-data-dir.
-        temp_user_data_dir = None
-
-    chrome_options.add_argument("--incognito")
-
-    # Create ChromeDriver service
-    from selenium.webdriver.chrome.service import Service
-    service = Service()
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.set_window_size(1000, 1000)
-    logger.info(f"Created WebDriver using temp user-data-dir: {temp_user_data_dir}")
-    return driver, temp_user_data_dir
-
 def get_decrypted_wolfnet_password(user_email):
     """
     Args:
@@ -141,36 +33,6 @@ def get_decrypted_wolfnet_password(user_email):
     profile = user.userprofile
     return profile.get_decrypted_wolfnet_password()
 
-def compare_assignments(old_assignments, new_assignments):
-    """
-    Args:
-        old_assignments (list): Previous assignment data
-        new_assignments (list): Current assignment data
-    
-    Returns:
-        list: List of changes detected between old and new assignments
-    """
-    changes = []
-    old_map = {a["assignment_id"]: a for a in old_assignments}
-    for new_a in new_assignments:
-        aid = new_a["assignment_id"]
-        old_a = old_map.get(aid)
-        if not old_a:
-            changes.append({"type": "new", "assignment": new_a})
-            continue
-
-        old_skills = {s["skill_id"]: s for s in old_a.get("skills", [])}
-        for s in new_a["skills"]:
-            old_s = old_skills.get(s["skill_id"])
-            if not old_s or s["rating"] != old_s.get("rating") or s["rating_desc"] != old_s.get("rating_desc"):
-                changes.append({"type": "skill_changed", "assignment": new_a, "skill": s})
-
-        if new_a.get("points_earned") != old_a.get("points_earned") or new_a.get("max_points") != old_a.get("max_points"):
-            changes.append({"type": "points_changed", "assignment": new_a})
-        if new_a.get("comment") != old_a.get("comment"):
-            changes.append({"type": "comment_changed", "assignment": new_a})
-    return changes
-
 def login_to_wolfnet(user_email, driver, wait, password=None):
     """
     Args:
@@ -343,42 +205,45 @@ def login_to_wolfnet(user_email, driver, wait, password=None):
         else:
             return {"success": False, "error": f"General login error: {error_msg}", "error_type": "general"}
 
-def check_user_grades_core(user_email):
+def _wolfnet_get(http_session, url):
+    """
+    GET a WolfNet API URL with the stored session. Logged-out requests get a 401/403
+    or a redirect to the login page; both raise WolfNetSessionExpired.
+    """
+    response = http_session.get(url, timeout=20, allow_redirects=False)
+    if response.status_code in (401, 403) or response.is_redirect:
+        raise WolfNetSessionExpired(url)
+    return response
+
+def capture_wolfnet_session(user_email, user_obj):
     """
+    Selenium step of a grade check: log in through Microsoft, read the student's
+    sections and id from the progress page, and store the session cookies.
+
     Args:
         user_email (str): User's school email address
-    
+        user_obj (User): The same user
+
     Returns:
-        dict: Result with success status and error message if failed
+        tuple: (WolfNetSession, None) on success or (None, error result dict)
     """
-    logger.info(f"Starting grade check for user: {user_email}")
-    LOGIN_URL = "https://wpga.myschoolapp.com/"
+    from forum.services.wolfnet_session_services import store_wolfnet_session, invalidate_wolfnet_session
 
-    user_obj = User.objects.get(school_email=user_email)
-    profile = getattr(user_obj, 'userprofile', None)
-    wolfnet_password = None
-    if profile:
-        wolfnet_password = profile.wolfnet_password
-    if not wolfnet_password:
-        logger.warning(f"User {user_email} does not have a WolfNet password. Skipping grade check.")
-        return {
-            "success": False,
-            "error": "No WolfNet password found. Please add your WolfNet password in your profile settings to enable grade checking."
-        }
-
-    # Use memory-optimized WebDriver
-    driver, temp_user_data_dir = create_webdriver_with_cleanup()
+    pool = get_browser_pool()
+    browser = pool.acquire()
+    driver = browser.driver
     wait = WebDriverWait(driver, 6)  # Reduced timeout for memory efficiency
 
     try:
         login_result = login_to_wolfnet(user_email, driver, wait)
         if not login_result["success"]:
             if login_result["error_type"] == "wrong_password":
-                return {"success": False, "error": "wrong_password"}
+                invalidate_wolfnet_session(user_obj)
+                return None, {"success": False, "error": "wrong_password"}
             elif login_result["error_type"] == "no_courses":
-                return {"success": False, "error": f"{login_result['error']}", "error_type": "no_courses"}
+                return None, {"success": False, "error": f"{login_result['error']}", "error_type": "no_courses"}
             else:
-                return {"success": False, "error": f"Failed to login to WolfNet: {login_result['error']}"}
+                return None, {"success": False, "error": f"Failed to login to WolfNet: {login_result['error']}"}
 
         # Check if login was successful but with limited content (account-nav found but no course content)
         if login_result.get("message") and "account navigation found" in login_result["message"]:
@@ -389,17 +254,15 @@ def check_user_grades_core(user_email):
             wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".collapse")))
         except Exception as e:
             logger.info(f"No course content found for {user_email} - this is expected for grade checking when account-nav login fallback was used")
-            return {"success": False, "error": "No course content available for grade checking", "error_type": "no_courses"}
-            
+            return None, {"success": False, "error": "No course content available for grade checking", "error_type": "no_courses"}
+
         course_divs = driver.find_elements(By.CSS_SELECTOR, ".collapse")
-        section_ids = []
-        section_id_to_course_name = {}
+        sections = []
         for div in course_divs:
             div_id = div.get_attribute("id")
             # Only process divs whose IDs match 'course' followed by digits (e.g., 'course114310942')
             if div_id and re.match(r"^course\d+$", div_id):
                 sid = div_id.replace("course", "")
-                section_ids.append(sid)
                 try:
                     parent = div.find_element(By.XPATH, "..")
                     a_tag = parent.find_element(By.TAG_NAME, "a")
@@ -407,9 +270,7 @@ def check_user_grades_core(user_email):
                     course_name = h3.text.strip()
                 except Exception:
                     course_name = "Unknown Course"
-                section_id_to_course_name[sid] = course_name
-
-        # logger.info(f"Section IDs for {user_email}: {section_ids}")
+                sections.append({"section_id": sid, "course_name": course_name})
 
         # Get studentId from #profile-link
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#profile-link")))
@@ -417,264 +278,324 @@ def check_user_grades_core(user_email):
         href = profile_link.get_attribute("href")
         m = re.search(r"profile/(\d+)/contactcard", href)
         student_id = m.group(1) if m else None
-        # logger.info(f"Student ID for {user_email}: {student_id}")
 
-        # Get cookies from Selenium to use in requests
-        selenium_cookies = driver.get_cookies()
-        cookies = {c['name']: c['value'] for c in selenium_cookies}
+        wolfnet_session = store_wolfnet_session(user_obj, driver.get_cookies(), student_id, sections)
+        logger.info(f"Stored WolfNet session for {user_email} until {wolfnet_session.expires_at}")
+        return wolfnet_session, None
+    finally:
+        # Reset and return the browser for the next user (or recycle it)
+        pool.release(browser)
+
+def check_user_grades_core(user_email):
+    """
+    Reuses the user's stored WolfNet session while it is alive, so most checks are
+    plain HTTP; Selenium only runs when there is no usable session.
 
-        headers = {
-            "User-Agent": "Mozilla/5.0",
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Referer": "https://wpga.myschoolapp.com/",
+    Args:
+        user_email (str): User's school email address
+
+    Returns:
+        dict: Result with success status and error message if failed
+    """
+    from forum.services.wolfnet_session_services import load_wolfnet_session, build_http_session, invalidate_wolfnet_session
+
+    logger.info(f"Starting grade check for user: {user_email}")
+
+    user_obj = User.objects.get(school_email=user_email)
+    profile = getattr(user_obj, 'userprofile', None)
+    wolfnet_password = None
+    if profile:
+        wolfnet_password = profile.wolfnet_password
+    if not wolfnet_password:
+        logger.warning(f"User {user_email} does not have a WolfNet password. Skipping grade check.")
+        return {
+            "success": False,
+            "error": "No WolfNet password found. Please add your WolfNet password in your profile settings to enable grade checking."
         }
 
-        # For each sectionId, get markingPeriodId and then hydrategradebook JSON
-        user_obj = User.objects.get(school_email=user_email)
-
-        # Get marking periods once (using the first section_id)
-        marking_period_id = None
-        if section_ids:
-            first_section_id = section_ids[0]
-            snapshot_qs = GradebookSnapshot.objects.filter(
-                user=user_obj,
-                section_id=first_section_id
-            ).order_by('-timestamp')
-            if snapshot_qs.exists():
-                snapshot = snapshot_qs.first()
-                mpid = getattr(snapshot, 'marking_period_id', None)
-                if mpid:
-                    marking_period_id = mpid
-            # If not found, fetch from API
-            if not marking_period_id:
-                mp_url = f"https://wpga.myschoolapp.com/api/datadirect/GradeBookMarkingPeriodList?sectionId={first_section_id}"
-                mp_resp = requests.get(mp_url, cookies=cookies, headers=headers, timeout=20)
-                if mp_resp.status_code == 200:
-                    mp_json = mp_resp.json()
-                    if mp_json:
-                        marking_period_id = mp_json[0].get("MarkingPeriodId")
+    wolfnet_session, http_session = load_wolfnet_session(user_obj)
+    logged_in = False
+    if wolfnet_session is None:
+        wolfnet_session, error = capture_wolfnet_session(user_email, user_obj)
+        if error:
+            return error
+        http_session = build_http_session(wolfnet_session.get_cookies())
+        logged_in = True
+    else:
+        logger.info(f"Reusing stored WolfNet session for {user_email}")
+
+    try:
+        return check_grades_over_http(user_email, user_obj, wolfnet_session, http_session)
+    except WolfNetSessionExpired:
+        invalidate_wolfnet_session(user_obj)
+        if logged_in:
+            logger.error(f"WolfNet rejected a freshly captured session for {user_email}")
+            return {"success": False, "error": "Failed to login to WolfNet: session rejected"}
+
+        # The stored session died between validation and use: log in once more
+        logger.info(f"Stored WolfNet session for {user_email} expired during the check, logging in again")
+        http_session.close()
+        wolfnet_session, error = capture_wolfnet_session(user_email, user_obj)
+        if error:
+            return error
+        http_session = build_http_session(wolfnet_session.get_cookies())
+        try:
+            return check_grades_over_http(user_email, user_obj, wolfnet_session, http_session)
+        except WolfNetSessionExpired:
+            invalidate_wolfnet_session(user_obj)
+            return {"success": False, "error": "Failed to login to WolfNet: session rejected"}
+    finally:
+        http_session.close()
+        logger.info(f"Grade check completed for {user_email}")
+
+def get_marking_period_id(user_email, user_obj, wolfnet_session, http_session):
+    """
+    Current marking period for the user's sections: taken from the latest snapshot,
+    else asked of WolfNet with the first section.
+
+    Raises:
+        WolfNetSessionExpired: WolfNet no longer accepts the session
+    """
+    section_ids = [section["section_id"] for section in wolfnet_session.sections]
+
+    # Get marking periods once (using the first section_id)
+    marking_period_id = None
+    if section_ids:
+        first_section_id = section_ids[0]
+        # One query on the (user, section_id) prefix of gradebook_snapshot_latest
+        snapshot = GradebookSnapshot.objects.filter(
+            user=user_obj,
+            section_id=first_section_id
+        ).order_by('-timestamp').only('marking_period_id').first()
+        if snapshot and snapshot.marking_period_id:
+            marking_period_id = snapshot.marking_period_id
+        # If not found, fetch from API
         if not marking_period_id:
-            logger.error(f"Could not fetch marking period id for {user_email}")
-            return
-
-        # Collect all email messages for all courses
-        all_email_messages = []
-        recipient = user_obj
-        sender = user_obj
-        notification_type = "grade_update"
-        
-        # Process sections asynchronously
-        import asyncio
-        import concurrent.futures
-        
-        def process_section(section_id):
-            """Process a single section synchronously with timeout and better error handling"""
-            section_messages = []
-            
-            try:
-                hydrate_url = (
-                    f"https://wpga.myschoolapp.com/api/gradebook/hydrategradebook?"
-                    f"sectionId={section_id}&markingPeriodId={marking_period_id}"
-                    f"&sortAssignmentId=null&sortSkillPk=null&sortDesc=null&sortCumulative=null"
-                    f"&studentUserId={student_id}&fromProgress=true"
-                )
-                hydrate_resp = requests.get(hydrate_url, cookies=cookies, headers=headers, timeout=20)
-                if hydrate_resp.status_code == 200:
-                    hydrate_json = hydrate_resp.json()
-                    assignments = []
-                    roster = hydrate_json.get("Roster", [])
-                    if roster:
-                        for a in roster[0].get("AssignmentGrades", []):
-                            assignments.append({
-                                "assignment_id": a.get("AssignmentId"),
-                                "name": a.get("AssignmentType", "").strip(),
-                                "points_earned": a.get("PointsEarned"),
-                                "max_points": a.get("MaxPoints"),
-                                "comment": a.get("Comment", "").strip(),
-                                "assignment_type": a.get("AssignmentType", "").strip(),
-                                "assignment_type_id": a.get("AssignmentTypeId"),
-                                "skills": [
-                                    {
-                                        "skill_id": s.get("SkillId"),
-                                        "skill_name": s.get("SkillName"),
-                                        "rating": s.get("Rating"),
-                                        "rating_desc": s.get("RatingDesc")
-                                    }
-                                    for s in a.get("AssignmentSkillList", [])
-                                ]
-                            })
-                        # Fetch AssignmentPerformanceStudent JSON for assignment names
-                        aps_url = (
-                            f"https://wpga.myschoolapp.com/api/gradebook/AssignmentPerformanceStudent?"
-                            f"sectionId={section_id}&markingPeriodId={marking_period_id}&studentId={student_id}"
-                        )
-                        aps_resp = requests.get(aps_url, cookies=cookies, headers=headers, timeout=20)
-                        assignment_names = {}
-                        if aps_resp.status_code == 200:
-                            aps_json = aps_resp.json()
-                            for entry in aps_json:
-                                aid = entry.get("AssignmentId")
-                                short_desc = entry.get("AssignmentShortDescription")
-                                if aid and short_desc:
-                                    assignment_names[aid] = short_desc
-
-                        # Compare with previous snapshot
-                        snapshot_qs = GradebookSnapshot.objects.filter(
-                            user=user_obj,
-                            section_id=section_id,
-                            marking_period_id=str(marking_period_id)
-                        ).order_by('-timestamp')
-
-                        if snapshot_qs.exists():
-                            snapshot = snapshot_qs.first()
-                            old_assignments = snapshot.json_data
-                            changes = compare_assignments(old_assignments, assignments)
-                            logger.info(f"Changes for {user_email} - section {section_id}, marking period {marking_period_id}: {len(changes)} changes found")
-
-                            course_name = section_id_to_course_name.get(str(section_id), "Unknown Course")
-                            for change in changes:
-                                # logger.info(f"Processing change for {user_email}: {change}")
-                                assignment = change["assignment"]
-                                assignment_id = assignment.get("assignment_id")
-                                assignment_name = strip_tags(assignment_names.get(assignment_id) or assignment.get("name") or assignment.get("assignment_type"))
-                                skills = assignment.get("skills", [])
-                                prof_skills = [s for s in skills if s.get("rating_desc", "")]
-                                has_proficiency = bool(prof_skills)
-                                if has_proficiency:
-                                    prof_list = [f"<strong>{s.get('skill_name')}:</strong> {s.get('rating_desc')}" for s in prof_skills]
-                                    grade_info = "<br>".join(prof_list)
-                                else:
-                                    points_earned = assignment.get("points_earned")
-                                    max_points = assignment.get("max_points")
-                                    if points_earned is not None and max_points:
-                                        try:
-                                            percent = round((points_earned / max_points) * 100, 2)
-                                        except Exception:
-                                            percent = None
-                                        grade_info = f"<br><strong>Grade:</strong> {points_earned}/{max_points} ({percent}%)" if percent is not None else f"Grade: {points_earned}/{max_points}"
-                                    else:
-                                        grade_info = "Grade information not available."
-
-                                # Create HTML message for email
-                                html_message = f"<h3>{assignment_name} ({course_name}): </h3><br>"
-                                if change["type"] == "new":
-                                    html_message += f"New assignment graded.<br>{grade_info}<br>Comment: {assignment.get('comment')}"
-                                elif change["type"] == "skill_changed":
-                                    skill = change["skill"]
-                                    html_message += f"Competency '<strong>{skill.get('skill_name')}</strong>' updated to '<strong>{skill.get('rating_desc')}</strong>'. {grade_info}"
-                                elif change["type"] == "points_changed":
-                                    html_message += f"Points changed to {assignment.get('points_earned')}/{assignment.get('max_points')}. {grade_info}"
-                                elif change["type"] == "comment_changed":
-                                    html_message += f"Comment updated.<br>{grade_info}<br>Comment: {assignment.get('comment')}"
-                                else:
-                                    html_message += f"Graded or updated.<br>{grade_info}"
-
-                                # Create clean text message for notification/push notification
-                                clean_grade_info = strip_tags(grade_info.replace("<br>", " "))
-                                clean_message = f"{assignment_name} ({course_name}): "
-                                if change["type"] == "new":
-                                    clean_message += f"New assignment graded. {clean_grade_info}"
-                                    if assignment.get('comment'):
-                                        clean_message += f" Comment: {assignment.get('comment')}"
-                                elif change["type"] == "skill_changed":
-                                    skill = change["skill"]
-                                    clean_message += f"Competency '{skill.get('skill_name')}' updated to '{skill.get('rating_desc')}'. {clean_grade_info}"
-                                elif change["type"] == "points_changed":
-                                    clean_message += f"Points changed to {assignment.get('points_earned')}/{assignment.get('max_points')}. {clean_grade_info}"
-                                elif change["type"] == "comment_changed":
-                                    clean_message += f"Comment updated. {clean_grade_info}"
-                                    if assignment.get('comment'):
-                                        clean_message += f" Comment: {assignment.get('comment')}"
+            mp_url = f"https://wpga.myschoolapp.com/api/datadirect/GradeBookMarkingPeriodList?sectionId={first_section_id}"
+            mp_resp = _wolfnet_get(http_session, mp_url)
+            if mp_resp.status_code == 200:
+                mp_json = mp_resp.json()
+                if mp_json:
+                    marking_period_id = mp_json[0].get("MarkingPeriodId")
+    if not marking_period_id:
+        logger.error(f"Could not fetch marking period id for {user_email}")
+    return marking_period_id
+
+def check_grades_over_http(user_email, user_obj, wolfnet_session, http_session):
+    """
+    HTTP step of a grade check: fetch all of the user's sections concurrently with the
+    stored session, diff them against the last snapshots and notify the user of changes.
+
+    Args:
+        user_email (str): User's school email address
+        user_obj (User): The same user
+        wolfnet_session (WolfNetSession): Stored sections and student id
+        http_session (requests.Session): Session carrying the WolfNet cookies
+
+    Returns:
+        dict: Result with success status and the sections where grades changed
+
+    Raises:
+        WolfNetSessionExpired: WolfNet no longer accepts the session
+    """
+    from forum.services.gradebook_fetcher import build_gradebook_job, fetch_gradebooks
+
+    marking_period_id = get_marking_period_id(user_email, user_obj, wolfnet_session, http_session)
+    if not marking_period_id:
+        return {"success": False, "error": "Could not fetch marking period"}
+
+    fetched = fetch_gradebooks([build_gradebook_job(user_email, wolfnet_session, marking_period_id)])[user_email]
+    if isinstance(fetched, WolfNetSessionExpired):
+        raise fetched
+    if isinstance(fetched, Exception):
+        return {"success": False, "error": f"Failed to fetch gradebooks: {str(fetched)}"}
+    changed_sections = process_fetched_gradebooks(user_email, user_obj, wolfnet_session, marking_period_id, fetched)
+    return {"success": True, "changed_sections": changed_sections}
+
+def process_fetched_gradebooks(user_email, user_obj, wolfnet_session, marking_period_id, fetched):
+    """
+    Diff fetched gradebooks against the user's snapshots, notify each change and send
+    one combined email.
+
+    Args:
+        fetched (dict): {section_id: {"gradebook", "assignment_names"}} from the gradebook fetcher
+
+    Returns:
+        list: Section ids where grades changed
+    """
+    section_ids = [section["section_id"] for section in wolfnet_session.sections]
+    section_id_to_course_name = {section["section_id"]: section["course_name"] for section in wolfnet_session.sections}
+
+    # Collect all email messages for all courses
+    all_email_messages = []
+    recipient = user_obj
+    sender = user_obj
+    notification_type = "grade_update"
+
+    def process_section(section_id, section_data):
+        """Diff one fetched section against its snapshot and notify its changes"""
+        section_messages = []
+
+        try:
+            hydrate_json = section_data["gradebook"]
+            if hydrate_json is not None:
+                assignments = normalize_assignments(hydrate_json)
+                if assignments is not None:
+                    assignment_names = section_data["assignment_names"]
+                    new_hash = content_hash(assignments)
+
+                    # Latest snapshot: json_data is only loaded when the hash says something changed
+                    snapshot = GradebookSnapshot.objects.filter(
+                        user=user_obj,
+                        section_id=section_id,
+                        marking_period_id=str(marking_period_id)
+                    ).order_by('-timestamp').defer('json_data').first()
+
+                    if snapshot is not None and snapshot.content_hash == new_hash:
+                        logger.info(f"No changes for {user_email} - section {section_id}, marking period {marking_period_id}")
+                    elif snapshot is not None:
+                        old_assignments = snapshot.json_data
+                        changes = diff_assignments(old_assignments, assignments)
+                        logger.info(f"Changes for {user_email} - section {section_id}, marking period {marking_period_id}: {len(changes)} changes found")
+
+                        course_name = section_id_to_course_name.get(str(section_id), "Unknown Course")
+                        for change in changes:
+                            # Assignments taken down by the teacher are recorded in the delta but not notified
+                            if change["type"] == "removed":
+                                continue
+                            assignment = change["assignment"]
+                            assignment_id = assignment.get("assignment_id")
+                            assignment_name = strip_tags(assignment_names.get(assignment_id) or assignment.get("name") or assignment.get("assignment_type"))
+                            skills = assignment.get("skills", [])
+                            prof_skills = [s for s in skills if s.get("rating_desc", "")]
+                            has_proficiency = bool(prof_skills)
+                            if has_proficiency:
+                                prof_list = [f"<strong>{s.get('skill_name')}:</strong> {s.get('rating_desc')}" for s in prof_skills]
+                                grade_info = "<br>".join(prof_list)
+                            else:
+                                points_earned = assignment.get("points_earned")
+                                max_points = assignment.get("max_points")
+                                if points_earned is not None and max_points:
+                                    try:
+                                        percent = round((points_earned / max_points) * 100, 2)
+                                    except Exception:
+                                        percent = None
+                                    grade_info = f"<br><strong>Grade:</strong> {points_earned}/{max_points} ({percent}%)" if percent is not None else f"Grade: {points_earned}/{max_points}"
                                 else:
-                                    clean_message += f"Graded or updated. {clean_grade_info}"
-
-                                section_messages.append(html_message)
-
-                                from forum.services.notification_services import send_notification_service
-                                send_notification_service(
-                                    recipient=recipient,
-                                    sender=sender,
-                                    notification_type=notification_type,
-                                    message=clean_message,
-                                )
-
-                            snapshot.json_data = assignments
-                            snapshot.timestamp = django.utils.timezone.now()
-                            snapshot.save()
-                            logger.info(f"Updated snapshot for {user_email} - section {section_id}, marking period {marking_period_id}")
-                        else:
-                            GradebookSnapshot.objects.create(
-                                user=user_obj,
-                                section_id=section_id,
-                                marking_period_id=str(marking_period_id),
-                                json_data=assignments
+                                    grade_info = "Grade information not available."
+
+                            # Create HTML message for email
+                            html_message = f"<h3>{assignment_name} ({course_name}): </h3><br>"
+                            if change["type"] == "new":
+                                html_message += f"New assignment graded.<br>{grade_info}<br>Comment: {assignment.get('comment')}"
+                            elif change["type"] == "skill_changed":
+                                skill = change["skill"]
+                                html_message += f"Competency '<strong>{skill.get('skill_name')}</strong>' updated to '<strong>{skill.get('rating_desc')}</strong>'. {grade_info}"
+                            elif change["type"] == "points_changed":
+                                html_message += f"Points changed to {assignment.get('points_earned')}/{assignment.get('max_points')}. {grade_info}"
+                            elif change["type"] == "comment_changed":
+                                html_message += f"Comment updated.<br>{grade_info}<br>Comment: {assignment.get('comment')}"
+                            else:
+                                html_message += f"Graded or updated.<br>{grade_info}"
+
+                            # Create clean text message for notification/push notification
+                            clean_grade_info = strip_tags(grade_info.replace("<br>", " "))
+                            clean_message = f"{assignment_name} ({course_name}): "
+                            if change["type"] == "new":
+                                clean_message += f"New assignment graded. {clean_grade_info}"
+                                if assignment.get('comment'):
+                                    clean_message += f" Comment: {assignment.get('comment')}"
+                            elif change["type"] == "skill_changed":
+                                skill = change["skill"]
+                                clean_message += f"Competency '{skill.get('skill_name')}' updated to '{skill.get('rating_desc')}'. {clean_grade_info}"
+                            elif change["type"] == "points_changed":
+                                clean_message += f"Points changed to {assignment.get('points_earned')}/{assignment.get('max_points')}. {clean_grade_info}"
+                            elif change["type"] == "comment_changed":
+                                clean_message += f"Comment updated. {clean_grade_info}"
+                                if assignment.get('comment'):
+                                    clean_message += f" Comment: {assignment.get('comment')}"
+                            else:
+                                clean_message += f"Graded or updated. {clean_grade_info}"
+
+                            section_messages.append(html_message)
+
+                            from forum.services.notification_services import send_notification_service
+                            send_notification_service(
+                                recipient=recipient,
+                                sender=sender,
+                                notification_type=notification_type,
+                                message=clean_message,
                             )
-                            logger.info(f"Created new snapshot for {user_email} - section {section_id}, marking period {marking_period_id}")
-                else:
-                    logger.error(f"Failed to get hydrategradebook for {user_email} - section {section_id}, marking period {marking_period_id}")
-                
-            except requests.Timeout:
-                logger.error(f"Timeout while processing section {section_id} for {user_email}")
-            except Exception as e:
-                logger.error(f"Error processing section {section_id} for {user_email}: {str(e)}")
-                import traceback
-                logger.error(f"Full traceback: {traceback.format_exc()}")
-            
-            return section_messages
-        
-        # Process sections sequentially to reduce memory usage instead of concurrent.futures
-        # Using ThreadPoolExecutor with max_workers=1 to maintain structure but reduce memory
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future_to_section = {executor.submit(process_section, section_id): section_id for section_id in section_ids}
-            
-            for future in concurrent.futures.as_completed(future_to_section):
-                section_id = future_to_section[future]
-                try:
-                    section_messages = future.result()
-                    if section_messages:
-                        all_email_messages.extend(section_messages)
-                except Exception as exc:
-                    logger.error(f"Section {section_id} generated an exception: {exc}")
-                    import traceback
-                    logger.error(f"Full traceback for section {section_id}: {traceback.format_exc()}")
-
-        if all_email_messages:
-            email_subject = f"WolfKey Grade Update:"
-            email_body = f"""
-                <html>
-                <body>
-                    <h2>WolfKey Grade Updates</h2>
-                    <p>Hello {recipient.get_full_name()},</p>
-                    {''.join([f'<li>{msg}</li>' for msg in all_email_messages])}
-                    <br>
-                    <p>Best regards,<br>WolfKey Team</p>
-                </body>
-                </html>
-            """
-            logger.info(f"Sending combined grade update notification to {recipient.personal_email}: {all_email_messages}")
-            send_email_notification.delay(
-                recipient.personal_email,
-                email_subject,
-                email_body
-            )
-    finally:
-        try:
-            driver.quit()
-        except Exception as e:
-            logger.warning(f"Error quitting driver: {e}")
-        # Remove temporary user-data-dir if created
-        try:
-            if temp_user_data_dir:
-                shutil.rmtree(temp_user_data_dir, ignore_errors=True)
-                logger.info(f"Removed temp user-data-dir: {temp_user_data_dir}")
+
+                        delta = build_delta(old_assignments, assignments)
+                        with transaction.atomic():
+                            GradebookSnapshot.objects.filter(pk=snapshot.pk).update(
+                                json_data=assignments,
+                                content_hash=new_hash,
+                                timestamp=django.utils.timezone.now(),
+                            )
+                            # Rows saved before hashing can match without a change; they only gain a hash
+                            if delta["upserted"] or delta["removed"]:
+                                GradebookDelta.objects.create(snapshot=snapshot, delta=delta, content_hash=new_hash)
+                        logger.info(f"Updated snapshot for {user_email} - section {section_id}, marking period {marking_period_id}")
+                    else:
+                        GradebookSnapshot.objects.create(
+                            user=user_obj,
+                            section_id=section_id,
+                            marking_period_id=str(marking_period_id),
+                            json_data=assignments,
+                            content_hash=new_hash
+                        )
+                        logger.info(f"Created new snapshot for {user_email} - section {section_id}, marking period {marking_period_id}")
+            else:
+                logger.error(f"Failed to get hydrategradebook for {user_email} - section {section_id}, marking period {marking_period_id}")
+
         except Exception as e:
-            logger.warning(f"Error removing temp user-data-dir {temp_user_data_dir}: {e}")
+            logger.error(f"Error processing section {section_id} for {user_email}: {str(e)}")
+            import traceback
+            logger.error(f"Full traceback: {traceback.format_exc()}")
 
-        # Wait a moment for driver to fully close
-        time.sleep(0.5)
-    # Force garbage collection to free memory
-    gc.collect()
-    logger.info(f"Grade check completed and cleaned up for {user_email}")
+        return section_messages
+
+    # The network work is already done; diffing and saving stays in section order
+    changed_sections = []
+    for section_id in section_ids:
+        section_data = fetched.get(section_id)
+        if section_data is None:
+            continue
+        section_messages = process_section(section_id, section_data)
+        if section_messages:
+            changed_sections.append(section_id)
+            all_email_messages.extend(section_messages)
+
+    if all_email_messages:
+        email_subject = f"WolfKey Grade Update:"
+        email_body = f"""
+            <html>
+            <body>
+                <h2>WolfKey Grade Updates</h2>
+                <p>Hello {recipient.get_full_name()},</p>
+                {''.join([f'<li>{msg}</li>' for msg in all_email_messages])}
+                <br>
+                <p>Best regards,<br>WolfKey Team</p>
+            </body>
+            </html>
+        """
+        logger.info(f"Sending combined grade update notification to {recipient.personal_email}: {all_email_messages}")
+        send_email_notification.delay(
+            recipient.personal_email,
+            email_subject,
+            email_body
+        )
+    return changed_sections
+
+def _record_grade_check(user, result):
+    """Feed a finished check into the adaptive scheduler; failed checks count as unchanged"""
+    from forum.services.grade_check_schedule_services import record_grade_check
+    try:
+        record_grade_check(user, (result or {}).get("changed_sections") or [])
+    except Exception as e:
+        logger.error(f"Could not record grade check for user {user.id}: {str(e)}")
 
 @shared_task(bind=True, queue='grades', routing_key='grades.single_user')
 def check_single_user_grades(self, user_email):
@@ -686,15 +607,108 @@ def check_single_user_grades(self, user_email):
         dict: Result from check_user_grades_core function
     """
     try:
-        return check_user_grades_core(user_email)
+        result = check_user_grades_core(user_email)
     except Exception as e:
         logger.error(f"Error checking grades for {user_email}: {str(e)}")
         raise
+    user_obj = User.objects.filter(school_email=user_email).first()
+    if user_obj:
+        _record_grade_check(user_obj, result)
+    return result
+
+# Users with a stored WolfNet session are checked this many to a task, their fetches overlapped
+GRADE_CHECK_GROUP_SIZE = 20
+
+@shared_task(bind=True, queue='grades', routing_key='grades.group')
+def check_user_grades_group(self, user_emails):
+    """
+    Check several users in one worker: every user with a live stored session is fetched
+    in a single concurrent pass, the rest go through check_user_grades_core (Selenium).
+
+    Args:
+        user_emails (list): School email addresses
+
+    Returns:
+        dict: How many users were checked over HTTP and how many fell back to a login
+    """
+    from forum.services.gradebook_fetcher import build_gradebook_job, fetch_gradebooks
+    from forum.services.wolfnet_session_services import load_wolfnet_session, invalidate_wolfnet_session
+
+    prepared = []
+    fallback = []
+    for user_email in user_emails:
+        user_obj = User.objects.select_related('userprofile').filter(school_email=user_email).first()
+        profile = getattr(user_obj, 'userprofile', None) if user_obj else None
+        if not profile or not profile.wolfnet_password:
+            fallback.append(user_email)
+            continue
+
+        wolfnet_session, http_session = load_wolfnet_session(user_obj)
+        if wolfnet_session is None:
+            fallback.append(user_email)
+            continue
+        try:
+            marking_period_id = get_marking_period_id(user_email, user_obj, wolfnet_session, http_session)
+        except WolfNetSessionExpired:
+            invalidate_wolfnet_session(user_obj)
+            fallback.append(user_email)
+            continue
+        except Exception as e:
+            logger.error(f"Error preparing grade check for {user_email}, logging in instead: {str(e)}")
+            fallback.append(user_email)
+            continue
+        finally:
+            http_session.close()
+        if not marking_period_id:
+            logger.warning(f"No marking period found over HTTP for {user_email}, logging in instead")
+            fallback.append(user_email)
+            continue
+        prepared.append((user_email, user_obj, wolfnet_session, marking_period_id))
+
+    fetched = {}
+    if prepared:
+        fetched = fetch_gradebooks([
+            build_gradebook_job(user_email, wolfnet_session, marking_period_id)
+            for user_email, _, wolfnet_session, marking_period_id in prepared
+        ])
+
+    checked = 0
+    for user_email, user_obj, wolfnet_session, marking_period_id in prepared:
+        result = fetched[user_email]
+        if isinstance(result, WolfNetSessionExpired):
+            logger.info(f"Stored WolfNet session for {user_email} expired during the check, logging in again")
+            invalidate_wolfnet_session(user_obj)
+            fallback.append(user_email)
+            continue
+        if isinstance(result, Exception):
+            continue
+        try:
+            changed_sections = process_fetched_gradebooks(user_email, user_obj, wolfnet_session, marking_period_id, result)
+            checked += 1
+        except Exception as e:
+            logger.error(f"Error processing grades for {user_email}: {str(e)}")
+            changed_sections = []
+        _record_grade_check(user_obj, {"changed_sections": changed_sections})
+
+    for user_email in fallback:
+        try:
+            result = check_user_grades_core(user_email)
+        except Exception as e:
+            logger.error(f"Error checking grades for {user_email}: {str(e)}")
+            result = None
+        user_obj = User.objects.filter(school_email=user_email).first()
+        if user_obj:
+            _record_grade_check(user_obj, result)
+
+    logger.info(f"Grade check group done: {checked} over HTTP, {len(fallback)} via login")
+    return {"users": len(user_emails), "checked_over_http": checked, "logged_in": len(fallback)}
 
 @shared_task(bind=True, queue='grades', routing_key='grades.coordination')
 def check_all_user_grades_sequential_dispatch(self):
     """
-    Dispatch individual grade check tasks for all users without waiting
+    Dispatch grade check tasks for all users without waiting. Users with a stored
+    WolfNet session are sent in groups of GRADE_CHECK_GROUP_SIZE so one worker overlaps
+    their fetches; everyone else gets their own task.
     
     Args:
         None
@@ -702,12 +716,33 @@ def check_all_user_grades_sequential_dispatch(self):
     Returns:
         dict: Summary with dispatched task information
     """
-    users = list(User.objects.filter(school_email__isnull=False).exclude(school_email=''))
+    from forum.services.grade_check_schedule_services import grade_check_users
+
+    users = list(grade_check_users())
     logger.info(f"Starting sequential dispatch of grade checks for {len(users)} users")
     
     results = []
     successful_dispatches = 0
     failed_dispatches = 0
+
+    session_emails = set(
+        WolfNetSession.objects.filter(expires_at__gt=django.utils.timezone.now())
+        .values_list('user__school_email', flat=True)
+    )
+    grouped = [user.school_email for user in users if user.school_email in session_emails]
+    users = [user for user in users if user.school_email not in session_emails]
+
+    for start in range(0, len(grouped), GRADE_CHECK_GROUP_SIZE):
+        group = grouped[start:start + GRADE_CHECK_GROUP_SIZE]
+        try:
+            task = check_user_grades_group.delay(group)
+            logger.info(f"Dispatched group task {task.id} for {len(group)} users")
+            results.extend({"user": email, "status": "dispatched", "task_id": task.id} for email in group)
+            successful_dispatches += len(group)
+        except Exception as e:
+            logger.error(f"Failed to dispatch group task: {str(e)}")
+            results.extend({"user": email, "status": "failed_to_dispatch", "error": str(e), "task_id": None} for email in group)
+            failed_dispatches += len(group)
     
     for idx, user in enumerate(users, 1):
         logger.info(f"Dispatching task for user {idx}/{len(users)}: {user.school_email}")
@@ -735,11 +770,11 @@ def check_all_user_grades_sequential_dispatch(self):
             failed_dispatches += 1
     
     summary = {
-        "total_users": len(users),
+        "total_users": len(users) + len(grouped),
         "successful_dispatches": successful_dispatches,
         "failed_dispatches": failed_dispatches,
         "results": results,
-        "message": f"Dispatched tasks for {len(users)} users: {successful_dispatches} successful, {failed_dispatches} failed"
+        "message": f"Dispatched tasks for {len(users) + len(grouped)} users: {successful_dispatches} successful, {failed_dispatches} failed"
     }
     
     logger.info(f"Sequential dispatch completed: {summary['message']}")
@@ -756,7 +791,9 @@ def check_user_grades_batched_dispatch(self, batch_size=1):
     Returns:
         dict: Summary with dispatched batches and results
     """
-    users = list(User.objects.filter(school_email__isnull=False).exclude(school_email=''))
+    from forum.services.grade_check_schedule_services import grade_check_users
+
+    users = list(grade_check_users())
     logger.info(f"Starting batched dispatch of grade checks for {len(users)} users (batch size: {batch_size})")
     
     # Split users into batches
@@ -822,6 +859,39 @@ def periodic_grade_check_trigger(self):
     check_all_user_grades_sequential_dispatch.delay()
     logger.info("Dispatched sequential grade check task")
 
+@shared_task(bind=True, queue='grades', routing_key='grades.trigger')
+def dispatch_due_grade_checks(self):
+    """
+    Beat tick of the adaptive grade-check scheduler: dispatch checks for users whose
+    GradeCheckSchedule is due. Users with a stored WolfNet session go out in groups,
+    the rest one task each.
+
+    Returns:
+        dict: Counts of created schedules and dispatched users
+    """
+    from forum.services.grade_check_schedule_services import ensure_schedules, claim_due_schedules
+
+    created = ensure_schedules()
+    due = claim_due_schedules()
+    if not due:
+        return {"created": created, "dispatched": 0}
+
+    user_ids = [schedule.user_id for schedule in due]
+    session_user_ids = set(
+        WolfNetSession.objects.filter(user_id__in=user_ids, expires_at__gt=django.utils.timezone.now())
+        .values_list('user_id', flat=True)
+    )
+    grouped = [schedule.user.school_email for schedule in due if schedule.user_id in session_user_ids]
+    single = [schedule.user.school_email for schedule in due if schedule.user_id not in session_user_ids]
+
+    for start in range(0, len(grouped), GRADE_CHECK_GROUP_SIZE):
+        check_user_grades_group.delay(grouped[start:start + GRADE_CHECK_GROUP_SIZE])
+    for user_email in single:
+        check_single_user_grades.delay(user_email)
+
+    logger.info(f"Dispatched due grade checks: {len(grouped)} grouped, {len(single)} single, {created} new schedules")
+    return {"created": created, "dispatched": len(due)}
+
 @shared_task(bind=True, queue='general', routing_key='general.email')
 def send_email_notification(self, recipient_email, subject, message):
     """
@@ -851,6 +921,18 @@ def send_email_notification(self, recipient_email, subject, message):
         logger.error(f"Failed to send email to {recipient_email}: {str(e)}")
         raise
 
+def report_progress(task, step):
+    """
+    Publish a PROGRESS state for clients polling the job. A no-op when the task runs
+    inline without a result backend.
+    """
+    if not task.request.id:
+        return
+    try:
+        task.update_state(state="PROGRESS", meta={"step": step})
+    except Exception as e:
+        logger.warning(f"Could not report progress for task {task.request.id}: {str(e)}")
+
 @shared_task(bind=True, queue='general', routing_key='general.auto')
 def auto_complete_courses(self, user_email, password=None):
     """
@@ -863,11 +945,13 @@ def auto_complete_courses(self, user_email, password=None):
     """
     logger.info(f"Starting auto-complete courses for user: {user_email}")
     
-    # Use memory-optimized WebDriver
-    driver, temp_user_data_dir = create_webdriver_with_cleanup()
+    pool = get_browser_pool()
+    browser = pool.acquire()
+    driver = browser.driver
     wait = WebDriverWait(driver, 6)  # Reduced timeout
 
     try:
+        report_progress(self, "logging_in")
         login_result = login_to_wolfnet(user_email, driver, wait, password)
         if not login_result["success"]:
             if login_result["error_type"] == "wrong_password":
@@ -881,6 +965,7 @@ def auto_complete_courses(self, user_email, password=None):
         if login_result.get("message") and "account navigation found" in login_result["message"]:
             logger.info(f"Login successful for {user_email} but no course content available for auto-completion")
 
+        report_progress(self, "reading_schedule")
         # Wait for the page to load and find the first .subnav-multicol element
         try:
             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".subnav-multicol")))
@@ -949,6 +1034,7 @@ def auto_complete_courses(self, user_email, password=None):
             logger.warning(f"No valid courses found for {user_email}")
             return {"success": False, "error": "No valid courses found in schedule", "error_type": "no_courses"}
 
+        report_progress(self, "matching_courses")
         matched_courses = {}
         logger.info(courses_data)
         
@@ -1009,24 +1095,8 @@ def auto_complete_courses(self, user_email, password=None):
             "error_type": error_type
         }
     finally:
-        try:
-            driver.quit()
-        except Exception as e:
-            logger.warning(f"Error quitting driver: {e}")
-        # Remove temporary user-data-dir if created
-        try:
-            if temp_user_data_dir:
-                shutil.rmtree(temp_user_data_dir, ignore_errors=True)
-                logger.info(f"Removed temp user-data-dir: {temp_user_data_dir}")
-        except Exception as e:
-            logger.warning(f"Error removing temp user-data-dir {temp_user_data_dir}: {e}")
-
-        # Wait a moment for driver to fully close
-        time.sleep(0.5)
-        
-        # Force garbage collection to free memory
-        gc.collect()
-        logger.info(f"Auto-complete courses completed and cleaned up for {user_email}")
+        pool.release(browser)
+        logger.info(f"Auto-complete courses completed for {user_email}")
 
 
 @shared_task(bind=True, queue='grades', routing_key='grades.wolfnet')
@@ -1042,9 +1112,11 @@ def check_wolfnet_password(self, user_email, password):
         dict: Result with success status and error message if failed
     """
     logger.info(f"Starting WolfNet password check for user: {user_email}")
+    report_progress(self, "logging_in")
     
-    # Use memory-optimized WebDriver
-    driver, temp_user_data_dir = create_webdriver_with_cleanup()
+    pool = get_browser_pool()
+    browser = pool.acquire()
+    driver = browser.driver
     wait = WebDriverWait(driver, 6)
 
     try:
@@ -1069,21 +1141,165 @@ def check_wolfnet_password(self, user_email, password):
             "error_type": error_type
         }
     finally:
+        pool.release(browser)
+        logger.info(f"Returned WebDriver session for {user_email} to the pool")
+
+@shared_task(bind=True, queue='grades', routing_key='grades.wolfnet')
+def verify_and_save_wolfnet_password(self, user_id, encrypted_password):
+    """
+    Check a WolfNet password and store it on the user's profile if it works.
+
+    Args:
+        user_id (int): User whose password is checked
+        encrypted_password (str): Password encrypted with WolfNetSettingsForm.encrypt_password,
+            so the plain text never sits in the broker
+
+    Returns:
+        dict: check_wolfnet_password's result, with a message when the password was saved
+    """
+    from forum.forms import WolfNetSettingsForm
+    from forum.services.wolfnet_session_services import invalidate_wolfnet_session
+
+    user = User.objects.select_related('userprofile').get(pk=user_id)
+    password = WolfNetSettingsForm.decrypt_password(encrypted_password)
+    if not password:
+        return {"success": False, "error": "Could not read the WolfNet password", "error_type": "general"}
+
+    report_progress(self, "logging_in")
+    verification_result = check_wolfnet_password(user.school_email, password)
+
+    if verification_result.get('success'):
         try:
-            driver.quit()
-        except Exception as e:
-            logger.warning(f"Error quitting driver: {e}")
-        # Remove temporary user-data-dir if created
-        try:
-            if temp_user_data_dir:
-                shutil.rmtree(temp_user_data_dir, ignore_errors=True)
-                logger.info(f"Removed temp user-data-dir: {temp_user_data_dir}")
-        except Exception as e:
-            logger.warning(f"Error removing temp user-data-dir {temp_user_data_dir}: {e}")
+            user_profile = user.userprofile
+            user_profile.wolfnet_password = encrypted_password
+            user_profile.save()
+            # The stored session belongs to the old password
+            invalidate_wolfnet_session(user)
+            verification_result['message'] = 'WolfNet password verified and saved successfully!'
+        except Exception as save_error:
+            logger.error(f"Error saving WolfNet password for {user.username}: {str(save_error)}")
+            # Still return success for verification, but note the save issue
+            verification_result['message'] = 'WolfNet password verified successfully, but there was an issue saving it. Please try again.'
+    return verification_result
+
+@shared_task(bind=True, queue='general', routing_key='general.feed')
+def fan_out_post_task(self, post_id):
+    """
+    Args:
+        post_id (int): Post to add to (or remove from) users' For You feeds
 
-        # Wait a moment for driver to fully close
-        time.sleep(0.5)
-        
-        # Force garbage collection
-        gc.collect()
-        logger.info(f"Cleaned up WebDriver session for {user_email}")
\ No newline at end of file
+    Returns:
+        int: Number of users whose feed contains the post
+    """
+    from forum.services.feed_services import fan_out_post
+    return fan_out_post(post_id)
+
+@shared_task(bind=True, queue='general', routing_key='general.feed')
+def rebuild_user_feed_task(self, user_id):
+    """
+    Args:
+        user_id (int): User whose For You feed should be re-materialized
+    """
+    from forum.services.feed_services import rebuild_user_feed, clear_pending_feed_rebuild
+    clear_pending_feed_rebuild(user_id)
+    try:
+        user = User.objects.select_related('userprofile').get(id=user_id)
+    except User.DoesNotExist:
+        logger.warning(f"Skipping feed rebuild for missing user {user_id}")
+        return
+    rebuild_user_feed(user)
+
+@shared_task(bind=True, queue='general', routing_key='general.views')
+def flush_post_views_task(self):
+    """
+    Apply post views buffered in Redis to Post.views.
+
+    Returns:
+        int: Number of views applied
+    """
+    from forum.services.view_count_services import flush_post_views
+    applied = flush_post_views()
+    if applied:
+        logger.info(f"Flushed {applied} buffered post views")
+    return applied
+
+@shared_task(bind=True, queue='general', routing_key='general.schedule')
+def sync_daily_schedules_task(self):
+    """
+    Import the block order sheet and school calendar into DailySchedule.
+
+    Returns:
+        dict: {"created", "updated", "unchanged"} row counts
+    """
+    from forum.services.schedule_services import sync_daily_schedules
+    counts = sync_daily_schedules()
+    logger.info(f"Synced daily schedules: {counts}")
+    return counts
+
+@shared_task(bind=True, queue='general', routing_key='general.images')
+def process_image_asset_task(self, asset_id):
+    """
+    Produce the resized WebP/JPEG variants of an uploaded image.
+
+    Returns:
+        dict: {"asset_id", "status"}
+    """
+    from forum.services.image_services import process_image_asset
+    asset = process_image_asset(asset_id)
+    return {'asset_id': asset_id, 'status': asset.status}
+
+@shared_task(bind=True, queue='general', routing_key='general.notifications')
+def send_course_notifications_task(self, post_id, course_ids):
+    """
+    Args:
+        post_id (int): Newly created post
+        course_ids (list[int]): Courses whose experienced users should be notified
+
+    Returns:
+        int: Number of notifications created
+    """
+    from forum.services.notification_services import fan_out_course_notifications
+    try:
+        created = fan_out_course_notifications(post_id, course_ids)
+    except Post.DoesNotExist:
+        logger.warning(f"Skipping course notifications for deleted post {post_id}")
+        return 0
+    logger.info(f"Sent {created} course notifications for post {post_id}")
+    return created
+
+@shared_task(bind=True, queue='general', routing_key='general.push')
+def flush_push_queue_task(self):
+    """
+    Send push messages queued in Redis in Expo's 100-message batches.
+
+    Returns:
+        int: Number of messages Expo accepted
+    """
+    from forum.services.expo_push_service import flush_push_queue
+    return flush_push_queue()
+
+@shared_task(bind=True, queue='general', routing_key='general.push')
+def deliver_push_messages_task(self, entries):
+    """
+    Args:
+        entries (list[dict]): {'user_id', 'message'} pairs; used when Redis is not configured
+
+    Returns:
+        int: Number of messages Expo accepted
+    """
+    from forum.services.expo_push_service import deliver_push_messages
+    return deliver_push_messages(entries)
+
+@shared_task(bind=True, queue='general', routing_key='general.push')
+def check_push_receipts_task(self):
+    """
+    Collect Expo push receipts and clear tokens of uninstalled apps.
+
+    Returns:
+        dict: Counts of checked, failed and pruned tickets
+    """
+    from forum.services.expo_push_service import check_push_receipts
+    result = check_push_receipts()
+    if result['checked']:
+        logger.info(f"Checked {result['checked']} push receipts ({result['failed']} failed, {result['pruned']} tokens pruned)")
+    return result
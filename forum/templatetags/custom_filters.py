@@ -2,6 +2,7 @@ from django import template
 from django.template.defaultfilters import timesince
 from django.utils import timezone
 from datetime import timedelta
+from forum.models import SolutionVote
 
 
 register = template.Library()
@@ -34,11 +35,11 @@ def vote_difference(solution):
 
 @register.filter
 def has_upvoted(solution, user):
-    return solution.solutionupvote_set.filter(user=user).exists()
+    return solution.votes.filter(user=user, value=SolutionVote.UPVOTE).exists()
 
 @register.filter
 def has_downvoted(solution, user):
-    return solution.solutiondownvote_set.filter(user=user).exists()
+    return solution.votes.filter(user=user, value=SolutionVote.DOWNVOTE).exists()
 
 
 @register.filter
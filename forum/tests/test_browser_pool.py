@@ -0,0 +1,101 @@
+import os
+from unittest import mock
+from django.test import SimpleTestCase
+from forum.services.browser_pool import BrowserPool, _process_tree_rss_mb
+
+class FakeDriver:
+    """Stands in for a Chrome WebDriver: records CDP calls and can be made to crash"""
+
+    def __init__(self):
+        self.service = mock.Mock(process=None)
+        self.window_handles = ['main']
+        self.switch_to = mock.Mock()
+        self.cdp_calls = []
+        self.crashed = False
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if self.crashed:
+            raise RuntimeError('chrome not reachable')
+        return 1
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_calls.append(command)
+
+    def get(self, url):
+        self.url = url
+
+    def close(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class BrowserPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.drivers = []
+
+    def factory(self):
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver, None
+
+    def pool(self, **kwargs):
+        return BrowserPool(factory=self.factory, keep_warm=False, **kwargs)
+
+    def test_browser_is_reset_and_reused_between_users(self):
+        pool = self.pool()
+        pool.warm()
+
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.drivers), 1)
+        self.assertIn('Network.clearBrowserCookies', first.driver.cdp_calls)
+        self.assertEqual(first.driver.url, 'about:blank')
+
+    def test_unhealthy_browser_is_replaced_on_acquire(self):
+        pool = self.pool()
+        browser = pool.acquire()
+        pool.release(browser)
+        browser.driver.crashed = True
+
+        replacement = pool.acquire()
+
+        self.assertIsNot(replacement, browser)
+        self.assertTrue(browser.driver.quit_called)
+        self.assertEqual(len(self.drivers), 2)
+
+    def test_browser_is_recycled_after_max_uses(self):
+        pool = self.pool(max_uses=2)
+        for _ in range(2):
+            browser = pool.acquire()
+            pool.release(browser)
+
+        self.assertTrue(self.drivers[0].quit_called)
+        self.assertIsNot(pool.acquire(), browser)
+
+    def test_browser_is_recycled_when_memory_exceeds_the_limit(self):
+        pool = self.pool(max_rss_mb=100)
+        browser = pool.acquire()
+
+        with mock.patch.object(type(browser), 'rss_mb', return_value=512):
+            pool.release(browser)
+
+        self.assertTrue(browser.driver.quit_called)
+
+    def test_full_pool_times_out(self):
+        pool = self.pool(size=1)
+        pool.acquire()
+
+        with self.assertRaises(TimeoutError):
+            pool.acquire(timeout=0.01)
+
+    def test_process_tree_memory_includes_this_process(self):
+        rss = _process_tree_rss_mb(os.getpid())
+        if rss is None:
+            self.skipTest('/proc is not available')
+        self.assertGreater(rss, 1)
@@ -0,0 +1,62 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from forum.models import User, Post, Solution, Comment
+from forum.services.counter_services import reconcile_counters
+
+class CommentPathTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        self.post = Post.objects.create(title='Test Post', content={'blocks': []}, author=self.user)
+        self.solution = Solution.objects.create(post=self.post, author=self.user, content={'blocks': []})
+
+    def comment(self, parent=None):
+        return Comment.objects.create(solution=self.solution, author=self.user, content={'blocks': []}, parent=parent)
+
+    def test_path_and_depth_are_set_on_creation(self):
+        root = self.comment()
+        reply = self.comment(root)
+        nested = self.comment(reply)
+
+        nested.refresh_from_db()
+        self.assertEqual(root.path, f'{root.id:010d}/')
+        self.assertEqual(nested.path, f'{root.id:010d}/{reply.id:010d}/{nested.id:010d}/')
+        self.assertEqual([root.depth, reply.depth, nested.depth], [0, 1, 2])
+
+    def test_depth_is_capped_for_display(self):
+        comment = self.comment()
+        for _ in range(7):
+            comment = self.comment(comment)
+
+        self.assertEqual(comment.depth, 7)
+        self.assertEqual(comment.get_depth(), 5)
+
+    def test_subtree_is_one_query_in_thread_order(self):
+        root = self.comment()
+        first = self.comment(root)
+        other_root = self.comment()
+        second = self.comment(root)
+        nested = self.comment(first)
+
+        with self.assertNumQueries(1):
+            subtree = [c.id for c in root.subtree()]
+
+        self.assertEqual(subtree, [root.id, first.id, nested.id, second.id])
+        self.assertNotIn(other_root.id, subtree)
+
+    def test_deleting_a_comment_removes_its_subtree_and_counts(self):
+        root = self.comment()
+        reply = self.comment(root)
+        self.comment(reply)
+        kept = self.comment()
+        reconcile_counters()
+
+        client = Client()
+        client.login(school_email='test@wpga.ca', password='testpassword')
+        response = client.post(reverse('delete_comment', kwargs={'comment_id': root.id}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(Comment.objects.values_list('id', flat=True)), [kept.id])
+        self.solution.refresh_from_db()
+        self.post.refresh_from_db()
+        self.assertEqual((self.solution.comment_count, self.solution.root_comment_count), (1, 1))
+        self.assertEqual(self.post.comment_count, 1)
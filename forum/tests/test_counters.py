@@ -0,0 +1,108 @@
+import json
+from unittest import mock
+from django.test import TestCase, Client
+from django.urls import reverse
+from forum.models import User, Post, Solution, Comment
+from forum.services.counter_services import reconcile_counters
+from forum.services.post_services import like_post_service, unlike_post_service, follow_post_service, unfollow_post_service
+from forum.services.solution_services import create_solution_service, delete_solution_service
+
+SOLUTION_CONTENT = {'blocks': [{'type': 'paragraph', 'data': {'text': 'Use the chain rule'}}]}
+COMMENT_CONTENT = {'blocks': [{'type': 'paragraph', 'data': {'text': 'Thanks!'}}]}
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        self.other = User.objects.create_user(username='otheruser', password='testpassword', school_email='other@wpga.ca', first_name='Jane', last_name='Doe')
+        self.post = Post.objects.create(title='Test Post', content={'blocks': []}, author=self.user)
+        self.client = Client()
+        self.client.login(school_email='test@wpga.ca', password='testpassword')
+
+    def assertCounters(self, obj, **expected):
+        obj.refresh_from_db()
+        self.assertEqual({field: getattr(obj, field) for field in expected}, expected)
+
+    def create_comment(self, solution, parent=None):
+        data = {'content': COMMENT_CONTENT, 'parent_id': parent.id if parent else None}
+        with mock.patch('forum.services.comment_services.send_comment_notifications_service'):
+            response = self.client.post(
+                reverse('create_comment', kwargs={'solution_id': solution.id}),
+                json.dumps(data), content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 201)
+        return Comment.objects.latest('id')
+
+    def test_likes_move_with_like_and_unlike(self):
+        self.assertEqual(like_post_service(self.user, self.post.id)['like_count'], 1)
+        self.assertEqual(like_post_service(self.other, self.post.id)['like_count'], 2)
+        self.assertFalse(like_post_service(self.user, self.post.id)['created'])
+        self.assertCounters(self.post, likes_count=2)
+
+        self.assertEqual(unlike_post_service(self.user, self.post.id)['like_count'], 1)
+        self.assertFalse(unlike_post_service(self.user, self.post.id)['was_liked'])
+        self.assertCounters(self.post, likes_count=1)
+
+    def test_followers_move_with_follow_and_unfollow(self):
+        follow_post_service(self.user, self.post.id)
+        follow_post_service(self.user, self.post.id)
+        follow_post_service(self.other, self.post.id)
+        self.assertCounters(self.post, followers_count=2)
+
+        unfollow_post_service(self.other, self.post.id)
+        unfollow_post_service(self.other, self.post.id)
+        self.assertCounters(self.post, followers_count=1)
+
+    def test_solutions_move_with_create_and_delete(self):
+        with mock.patch('forum.services.solution_services.send_solution_notification_service'):
+            first = create_solution_service(self.user, self.post.id, {'content': SOLUTION_CONTENT})
+            create_solution_service(self.other, self.post.id, {'content': SOLUTION_CONTENT})
+            self.assertIn('error', create_solution_service(self.other, self.post.id, {'content': SOLUTION_CONTENT}))
+        self.assertCounters(self.post, solution_count=2)
+
+        solution = Solution.objects.get(id=first['id'])
+        self.create_comment(solution)
+        self.create_comment(solution)
+        self.assertCounters(self.post, solution_count=2, comment_count=2)
+
+        delete_solution_service(self.user, solution.id)
+        self.assertCounters(self.post, solution_count=1, comment_count=0)
+
+    def test_comments_move_with_create_and_delete(self):
+        solution = Solution.objects.create(post=self.post, author=self.other, content=SOLUTION_CONTENT)
+        root = self.create_comment(solution)
+        reply = self.create_comment(solution, root)
+        self.create_comment(solution)
+        self.assertCounters(solution, comment_count=3, root_comment_count=2)
+        self.assertCounters(self.post, comment_count=3)
+
+        response = self.client.post(reverse('delete_comment', kwargs={'comment_id': reply.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertCounters(solution, comment_count=2, root_comment_count=2)
+
+        response = self.client.post(reverse('delete_comment', kwargs={'comment_id': root.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertCounters(solution, comment_count=1, root_comment_count=1)
+        self.assertCounters(self.post, comment_count=1)
+
+    def test_reconcile_repairs_drift(self):
+        solution = Solution.objects.create(post=self.post, author=self.other, content=SOLUTION_CONTENT)
+        like_post_service(self.other, self.post.id)
+        self.create_comment(solution)
+        # The solution was created without the service, so its post starts one short
+        self.assertEqual(reconcile_counters()['Post.solution_count'], 1)
+        self.assertEqual(set(reconcile_counters(dry_run=True).values()), {0})
+
+        Post.objects.filter(id=self.post.id).update(likes_count=7, followers_count=-1, solution_count=0, comment_count=4)
+        Solution.objects.filter(id=solution.id).update(comment_count=0, root_comment_count=3)
+
+        self.assertEqual(reconcile_counters(dry_run=True)['Post.likes_count'], 1)
+        self.assertCounters(self.post, likes_count=7)
+
+        drift = reconcile_counters()
+
+        self.assertEqual(drift['Post.likes_count'], 1)
+        self.assertEqual(drift['Solution.root_comment_count'], 1)
+        self.assertEqual(drift['Solution.upvotes'], 0)
+        self.assertCounters(self.post, likes_count=1, followers_count=0, solution_count=1, comment_count=1)
+        self.assertCounters(solution, comment_count=1, root_comment_count=1)
+        self.assertEqual(set(reconcile_counters().values()), {0})
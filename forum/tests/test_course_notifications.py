@@ -0,0 +1,72 @@
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from forum.models import User, Post, Course, Notification, UserCourseExperience
+from forum.services.notification_services import send_course_notifications_service, fan_out_course_notifications
+
+class RejectingEmailBackend(EmailBackend):
+    """locmem backend whose server refuses one address"""
+    def send_messages(self, messages):
+        if any('student1@example.com' in message.to for message in messages):
+            raise ConnectionError('recipient refused')
+        return super().send_messages(messages)
+
+class CourseNotificationFanOutTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='testpassword', school_email='author@wpga.ca', first_name='John', last_name='Doe')
+        self.math = Course.objects.create(name="Math 10")
+        self.physics = Course.objects.create(name="Physics 11")
+        UserCourseExperience.objects.create(user=self.author, course=self.math)
+        self.post = Post.objects.create(
+            title='Test Post',
+            content={'blocks': [{'type': 'paragraph', 'data': {'text': 'Test Content'}}]},
+            author=self.author,
+        )
+
+    def add_students(self, count, start=0):
+        for i in range(start, start + count):
+            student = User.objects.create_user(username=f'student{i}', password='testpassword', school_email=f'student{i}@wpga.ca', first_name='Student', last_name=str(i), personal_email=f'student{i}@example.com')
+            UserCourseExperience.objects.create(user=student, course=self.math)
+            UserCourseExperience.objects.create(user=student, course=self.physics)
+
+    def test_creating_post_only_queues_the_fan_out(self):
+        self.add_students(3)
+        with self.captureOnCommitCallbacks() as callbacks:
+            send_course_notifications_service(self.post, [self.math, self.physics])
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_each_experienced_student_is_notified_once(self):
+        self.add_students(3)
+        created = fan_out_course_notifications(self.post.id, [self.math.id, self.physics.id])
+
+        self.assertEqual(created, 3)
+        self.assertEqual(Notification.objects.filter(post=self.post, notification_type='post').count(), 3)
+        self.assertFalse(Notification.objects.filter(recipient=self.author).exists())
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].subject, 'New post in your experienced course: Test Post')
+
+    def test_query_count_is_independent_of_audience_size(self):
+        self.add_students(2)
+        with CaptureQueriesContext(connection) as small_audience:
+            fan_out_course_notifications(self.post.id, [self.math.id])
+
+        Notification.objects.all().delete()
+        self.add_students(20, start=2)
+        with CaptureQueriesContext(connection) as large_audience:
+            fan_out_course_notifications(self.post.id, [self.math.id])
+
+        self.assertEqual(len(small_audience), len(large_audience))
+
+    @override_settings(EMAIL_BACKEND='forum.tests.test_course_notifications.RejectingEmailBackend')
+    def test_a_failed_email_does_not_stop_the_others(self):
+        self.add_students(3)
+        with self.assertLogs('forum.services.notification_services', level='ERROR') as logs:
+            created = fan_out_course_notifications(self.post.id, [self.math.id])
+
+        self.assertEqual(created, 3)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['student0@example.com', 'student2@example.com'])
+        self.assertIn('student1@example.com', logs.output[0])
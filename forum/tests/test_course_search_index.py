@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase, TestCase
+from forum.models import Course, CourseAlias, User, UserCourseExperience
+from forum.services.course_search_index import CourseSearchIndex, search_courses
+
+class CourseSearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = CourseSearchIndex(
+            courses=[
+                (1, 'Pre-Calculus 12', 'Math', 4),
+                (2, 'Calculus 12', 'Math', 7),
+                (3, 'Chemistry 11', 'Science', 2),
+                (4, 'Physics 11', 'Science', 0),
+            ],
+            aliases=[(1, 'Precalc 12'), (3, 'Chem 11')],
+        )
+
+    def ids(self, query):
+        return [course['id'] for course in self.index.search(query)]
+
+    def test_empty_query_lists_catalog_in_id_order(self):
+        self.assertEqual(self.ids(''), [1, 2, 3, 4])
+
+    def test_alias_prefix_ranks_above_name_prefix(self):
+        self.assertEqual(self.ids('ca')[0], 2)
+        self.assertEqual(self.ids('precalc')[0], 1)
+        self.assertEqual(self.ids('chem')[0], 3)
+
+    def test_partial_word_matches_by_trigram(self):
+        self.assertIn(2, self.ids('calcul'))
+        self.assertIn(1, self.ids('calcul'))
+
+    def test_results_carry_experienced_counts(self):
+        self.assertEqual(
+            self.index.search('physics'),
+            [{'id': 4, 'name': 'Physics 11', 'category': 'Science', 'experienced_count': 0}],
+        )
+
+    def test_falls_back_to_substring_match(self):
+        self.assertEqual(self.ids('hys'), [4])
+
+    def test_unknown_query_returns_nothing(self):
+        self.assertEqual(self.ids('zzzz'), [])
+
+
+class CourseSearchInvalidationTests(TestCase):
+    def test_catalog_changes_are_visible_after_commit(self):
+        user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(name='Biology 12')
+        self.assertEqual(search_courses('bio')[0]['experienced_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseAlias.objects.create(name='AP Bio', course=course)
+            UserCourseExperience.objects.create(user=user, course=course)
+
+        search_courses('ap bio')
+        with self.assertNumQueries(0):
+            results = search_courses('ap bio')
+        self.assertEqual(results[0]['id'], course.id)
+        self.assertEqual(results[0]['experienced_count'], 1)
@@ -0,0 +1,54 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from forum.models import User, Post
+from forum.services.search_services import search_posts_queryset
+from forum.services.utils import encode_cursor, paginate_by_cursor
+
+def walk(queryset, per_page, **kwargs):
+    """Ids of every row, page by page, following next_cursor to the end"""
+    ids = []
+    cursor = None
+    while True:
+        rows, cursor = paginate_by_cursor(queryset, cursor, per_page, **kwargs)
+        ids.extend(row.id for row in rows)
+        if cursor is None:
+            return ids
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        self.posts = [
+            Post.objects.create(title='Projectile motion question', content={'blocks': []}, author=self.user)
+            for _ in range(7)
+        ]
+        # Every row ties on the ordering value, so pages are told apart by id alone
+        Post.objects.update(created_at=timezone.now())
+
+    def test_ties_are_neither_skipped_nor_repeated(self):
+        ids = walk(Post.objects.only('id', 'created_at'), 3)
+
+        self.assertEqual(ids, sorted((post.id for post in self.posts), reverse=True))
+
+    def test_rank_ties_survive_the_cursor(self):
+        queryset = search_posts_queryset('Projectile motion question').only('id')
+
+        ids = walk(queryset, 2, order_field='rank')
+
+        self.assertEqual(sorted(ids), sorted(post.id for post in self.posts))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_bad_cursors_raise_value_error(self):
+        for cursor in ('garbage!!', encode_cursor('not a date', 1), encode_cursor(timezone.now(), 'x'), encode_cursor(1)):
+            with self.assertRaises(ValueError):
+                paginate_by_cursor(Post.objects.all(), cursor, 3)
+
+    def test_bad_cursor_is_a_400(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(reverse('api_all_posts'), {'cursor': encode_cursor('not a date', 1)})
+
+        self.assertEqual(response.status_code, 400)
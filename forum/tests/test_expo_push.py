@@ -0,0 +1,110 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from forum.models import User, PushTicket
+from forum.services.expo_push_service import deliver_push_messages, check_push_receipts, ExpoPushNotificationService
+
+class ExpoStubHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for exp.host: tokens containing 'dead' are reported as DeviceNotRegistered"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append((self.path, self.client_address[1], payload))
+
+        if self.path.endswith('/send'):
+            data = []
+            for message in payload:
+                if 'dead' in message['to']:
+                    data.append({'status': 'error', 'message': 'not registered', 'details': {'error': 'DeviceNotRegistered'}})
+                else:
+                    self.server.ticket_count += 1
+                    data.append({'status': 'ok', 'id': f'ticket-{self.server.ticket_count}'})
+        else:
+            data = {
+                ticket_id: self.server.receipts.get(ticket_id, {'status': 'ok'})
+                for ticket_id in payload['ids']
+            }
+
+        body = json.dumps({'data': data}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ExpoPushPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ExpoStubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        cls.settings_override = override_settings(
+            EXPO_PUSH_URL=f'{base_url}/push/send',
+            EXPO_RECEIPTS_URL=f'{base_url}/push/getReceipts',
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requests = []
+        self.server.receipts = {}
+        self.server.ticket_count = 0
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        self.user.userprofile.expo_push_token = 'ExponentPushToken[dead]'
+        self.user.userprofile.save()
+
+    def entry(self, token):
+        return {'user_id': self.user.id, 'message': ExpoPushNotificationService.build_message(token, 'Title', 'Body')}
+
+    def test_messages_are_sent_in_batches_of_100_over_one_connection(self):
+        accepted = deliver_push_messages([self.entry(f'ExponentPushToken[{i}]') for i in range(250)])
+
+        self.assertEqual(accepted, 250)
+        self.assertEqual([len(payload) for _, _, payload in self.server.requests], [100, 100, 50])
+        self.assertEqual(len({port for _, port, _ in self.server.requests}), 1)
+        self.assertEqual(PushTicket.objects.count(), 250)
+
+    def test_unregistered_token_is_cleared_at_send_time(self):
+        accepted = deliver_push_messages([self.entry('ExponentPushToken[dead]'), self.entry('ExponentPushToken[live]')])
+
+        self.assertEqual(accepted, 1)
+        self.user.userprofile.refresh_from_db()
+        self.assertIsNone(self.user.userprofile.expo_push_token)
+
+    def test_receipts_prune_unregistered_tokens_and_settle_tickets(self):
+        self.user.userprofile.expo_push_token = 'ExponentPushToken[gone]'
+        self.user.userprofile.save()
+        deliver_push_messages([self.entry('ExponentPushToken[gone]'), self.entry('ExponentPushToken[other]')])
+        PushTicket.objects.update(created_at=timezone.now() - timedelta(minutes=20))
+        self.server.receipts = {
+            'ticket-1': {'status': 'error', 'message': 'gone', 'details': {'error': 'DeviceNotRegistered'}},
+        }
+
+        result = check_push_receipts()
+
+        self.assertEqual(result, {'checked': 2, 'failed': 1, 'pruned': 1})
+        self.assertFalse(PushTicket.objects.exists())
+        self.user.userprofile.refresh_from_db()
+        self.assertIsNone(self.user.userprofile.expo_push_token)
+
+    def test_recent_tickets_wait_for_their_receipts(self):
+        deliver_push_messages([self.entry('ExponentPushToken[live]')])
+
+        self.assertEqual(check_push_receipts()['checked'], 0)
+        self.assertEqual(PushTicket.objects.count(), 1)
@@ -0,0 +1,214 @@
+from datetime import timedelta
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from forum.models import User, Post, Course, FeedEntry, UserProfile, UserCourseExperience, UserCourseHelp
+from forum.services.feed_services import (
+    fan_out_post, get_for_you_posts, get_for_you_posts_by_cursor, get_post_audience_ids, rebuild_user_feed,
+    schedule_user_feed_rebuild, clear_pending_feed_rebuild, FEED_REBUILD_DELAY,
+)
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'feed-tests'}}
+
+def make_user(username):
+    return User.objects.create_user(username=username, password='testpassword', school_email=f'{username}@wpga.ca')
+
+def make_post(author, title, courses=(), created_at=None):
+    post = Post.objects.create(title=title, content={'blocks': []}, author=author)
+    post.courses.set(courses)
+    if created_at is not None:
+        Post.objects.filter(id=post.id).update(created_at=created_at)
+        post.refresh_from_db()
+    return post
+
+def materialize(*users):
+    UserProfile.objects.filter(user__in=users).update(feed_materialized_at=timezone.now())
+
+
+class FanOutTests(TestCase):
+    def setUp(self):
+        self.math = Course.objects.create(name="Math 10")
+        self.physics = Course.objects.create(name="Physics 11")
+        self.school_life = Course.objects.create(name="School Life")
+
+        self.author = make_user('author')
+        self.experienced = make_user('experienced')
+        self.helped = make_user('helped')
+        self.enrolled = make_user('enrolled')
+        self.unrelated = make_user('unrelated')
+        self.unmaterialized = make_user('unmaterialized')
+
+        UserCourseExperience.objects.create(user=self.experienced, course=self.math)
+        UserCourseHelp.objects.create(user=self.helped, course=self.math)
+        UserProfile.objects.filter(user=self.enrolled).update(block_2C=self.math)
+        UserCourseExperience.objects.create(user=self.unrelated, course=self.physics)
+        UserCourseExperience.objects.create(user=self.unmaterialized, course=self.math)
+        materialize(self.author, self.experienced, self.helped, self.enrolled, self.unrelated)
+
+    def test_course_post_reaches_author_and_course_members(self):
+        post = make_post(self.author, 'Derivatives', [self.math])
+
+        self.assertEqual(
+            get_post_audience_ids(post),
+            {self.author.id, self.experienced.id, self.helped.id, self.enrolled.id},
+        )
+
+    def test_posts_without_courses_and_school_life_posts_reach_everyone_materialized(self):
+        everyone = {self.author.id, self.experienced.id, self.helped.id, self.enrolled.id, self.unrelated.id}
+
+        self.assertEqual(get_post_audience_ids(make_post(self.author, 'Lost keys')), everyone)
+        self.assertEqual(get_post_audience_ids(make_post(self.author, 'Grad', [self.math, self.school_life])), everyone)
+
+    def test_fan_out_follows_course_edits(self):
+        post = make_post(self.author, 'Derivatives', [self.math])
+        fan_out_post(post.id)
+        self.assertTrue(FeedEntry.objects.filter(user=self.experienced, post=post).exists())
+
+        post.courses.set([self.physics])
+        fan_out_post(post.id)
+
+        self.assertEqual(
+            set(FeedEntry.objects.filter(post=post).values_list('user_id', flat=True)),
+            {self.author.id, self.unrelated.id},
+        )
+        self.assertEqual(FeedEntry.objects.get(user=self.author, post=post).created_at, post.created_at)
+
+    def test_fan_out_matches_rebuild(self):
+        posts = [
+            make_post(self.author, 'Derivatives', [self.math]),
+            make_post(self.author, 'Momentum', [self.physics]),
+            make_post(self.author, 'Lost keys'),
+        ]
+        for post in posts:
+            fan_out_post(post.id)
+
+        for user in (self.author, self.experienced, self.helped, self.enrolled, self.unrelated):
+            fanned_out = set(FeedEntry.objects.filter(user=user).values_list('post_id', flat=True))
+            rebuild_user_feed(user)
+            self.assertEqual(set(FeedEntry.objects.filter(user=user).values_list('post_id', flat=True)), fanned_out)
+
+    def test_fan_out_of_deleted_post_is_a_no_op(self):
+        self.assertEqual(fan_out_post(0), 0)
+
+
+class RebuildTests(TestCase):
+    def setUp(self):
+        self.math = Course.objects.create(name="Math 10")
+        self.physics = Course.objects.create(name="Physics 11")
+        self.user = make_user('reader')
+        self.author = make_user('author')
+        self.math_post = make_post(self.author, 'Derivatives', [self.math])
+        self.physics_post = make_post(self.author, 'Momentum', [self.physics])
+        self.own_post = make_post(self.user, 'My question', [self.physics])
+
+    def test_rebuild_replaces_stale_entries_and_marks_the_feed(self):
+        FeedEntry.objects.create(user=self.user, post=self.physics_post, created_at=self.physics_post.created_at)
+        UserCourseExperience.objects.create(user=self.user, course=self.math)
+
+        rebuild_user_feed(self.user)
+
+        self.assertEqual(
+            set(FeedEntry.objects.filter(user=self.user).values_list('post_id', flat=True)),
+            {self.math_post.id, self.own_post.id},
+        )
+        self.assertIsNotNone(UserProfile.objects.get(user=self.user).feed_materialized_at)
+
+    def test_first_read_materializes_the_feed(self):
+        UserProfile.objects.filter(user=self.user).update(block_1A=self.physics)
+        self.user.refresh_from_db()
+
+        posts, page_obj = get_for_you_posts(self.user)
+
+        self.assertEqual([post.id for post in posts], [self.own_post.id, self.physics_post.id])
+        self.assertFalse(page_obj.has_next())
+
+
+class ForYouPaginationTests(TestCase):
+    def setUp(self):
+        self.user = make_user('reader')
+        author = make_user('author')
+        tied_at = timezone.now() - timedelta(days=1)
+        # Five posts share a timestamp so the post_id tie-break decides their order
+        self.posts = [make_post(author, f'Post {i}', created_at=tied_at if i < 5 else tied_at + timedelta(minutes=i)) for i in range(10)]
+        rebuild_user_feed(self.user)
+        self.user.refresh_from_db()
+        self.expected_ids = [post.id for post in sorted(self.posts, key=lambda post: (post.created_at, post.id), reverse=True)]
+
+    def test_pages_are_ordered_newest_first_with_ties_broken_by_post_id(self):
+        seen = []
+        for number in range(1, 5):
+            posts, page_obj = get_for_you_posts(self.user, number, per_page=3)
+            seen.extend(post.id for post in posts)
+            self.assertEqual(page_obj.number, number)
+            self.assertEqual(page_obj.has_next(), number < 4)
+            self.assertEqual(page_obj.has_previous(), number > 1)
+
+        self.assertEqual(seen, self.expected_ids)
+
+    def test_cursor_pages_match_page_mode(self):
+        seen, cursor = [], None
+        while True:
+            posts, cursor = get_for_you_posts_by_cursor(self.user, cursor, per_page=3)
+            seen.extend(post.id for post in posts)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, self.expected_ids)
+
+    def test_page_mode_counts_only_the_users_feed_entries(self):
+        with CaptureQueriesContext(connection) as queries:
+            _, page_obj = get_for_you_posts(self.user, 2, per_page=3)
+
+        count_queries = [
+            query['sql'] for query in queries
+            if 'COUNT(' in query['sql'].upper() and 'forum_feedentry' in query['sql']
+        ]
+        self.assertEqual(len(count_queries), 1)
+        self.assertNotIn('JOIN', count_queries[0].upper())
+        self.assertEqual(page_obj.paginator.num_pages, 4)
+
+    def test_out_of_range_pages_are_clamped(self):
+        for page, expected in (('abc', 1), (None, 1), (0, 4), (99, 4)):
+            posts, page_obj = get_for_you_posts(self.user, page, per_page=3)
+            self.assertEqual(page_obj.number, expected)
+        self.assertEqual([post.id for post in posts], self.expected_ids[9:])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class RebuildSchedulingTests(TestCase):
+    def setUp(self):
+        self.math = Course.objects.create(name="Math 10")
+        self.physics = Course.objects.create(name="Physics 11")
+        self.user = make_user('reader')
+        clear_pending_feed_rebuild(self.user.id)
+
+    def test_course_changes_in_a_burst_queue_one_rebuild(self):
+        with mock.patch('forum.tasks.rebuild_user_feed_task.apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                UserCourseExperience.objects.create(user=self.user, course=self.math)
+                UserCourseHelp.objects.create(user=self.user, course=self.physics)
+            with self.captureOnCommitCallbacks(execute=True):
+                UserCourseHelp.objects.filter(user=self.user).delete()
+
+        apply_async.assert_called_once_with(args=[self.user.id], countdown=FEED_REBUILD_DELAY)
+
+    def test_started_rebuild_lets_the_next_change_queue_another(self):
+        with mock.patch('forum.tasks.rebuild_user_feed_task.apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_user_feed_rebuild(self.user.id)
+            clear_pending_feed_rebuild(self.user.id)
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_user_feed_rebuild(self.user.id)
+
+        self.assertEqual(apply_async.call_count, 2)
+
+    def test_failed_enqueue_does_not_block_later_rebuilds(self):
+        with mock.patch('forum.tasks.rebuild_user_feed_task.apply_async', side_effect=[OSError('broker down'), None]) as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_user_feed_rebuild(self.user.id)
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_user_feed_rebuild(self.user.id)
+
+        self.assertEqual(apply_async.call_count, 2)
@@ -0,0 +1,31 @@
+from unittest import mock
+from django.test import TestCase
+from forum.models import User, UserProfile
+from forum.tasks import check_user_grades_group
+
+class CheckUserGradesGroupTests(TestCase):
+    def setUp(self):
+        for name in ('nomp', 'broken'):
+            user = User.objects.create_user(username=name, password='testpassword', school_email=f'{name}@wpga.ca')
+            UserProfile.objects.filter(user=user).update(wolfnet_password='encrypted')
+
+    def run_group(self, get_marking_period_id):
+        http_session = mock.Mock()
+        with mock.patch('forum.services.wolfnet_session_services.load_wolfnet_session', return_value=(mock.Mock(), http_session)), \
+                mock.patch('forum.tasks.get_marking_period_id', side_effect=get_marking_period_id), \
+                mock.patch('forum.tasks.check_user_grades_core', return_value={'changed_sections': []}) as core, \
+                mock.patch('forum.tasks._record_grade_check'):
+            summary = check_user_grades_group.run(['nomp@wpga.ca', 'broken@wpga.ca'])
+        return summary, core
+
+    def test_users_that_cannot_be_prepared_fall_back_to_a_login(self):
+        def get_marking_period_id(user_email, *args):
+            if user_email == 'broken@wpga.ca':
+                raise RuntimeError('unexpected page')
+            return None
+
+        with self.assertLogs('forum.tasks', level='WARNING'):
+            summary, core = self.run_group(get_marking_period_id)
+
+        self.assertEqual(summary, {'users': 2, 'checked_over_http': 0, 'logged_in': 2})
+        self.assertEqual([call.args[0] for call in core.call_args_list], ['nomp@wpga.ca', 'broken@wpga.ca'])
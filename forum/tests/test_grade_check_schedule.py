@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from forum.models import User, GradebookSnapshot, GradeCheckSchedule
+from forum.services.grade_check_schedule_services import (
+    activity_factor, ensure_schedules, claim_due_schedules, record_grade_check, grade_check_stats,
+    MIN_INTERVAL, BASE_INTERVAL, MAX_INTERVAL, CLASSMATE_WINDOW,
+)
+
+VANCOUVER = ZoneInfo('America/Vancouver')
+
+@override_settings(GRADE_CHECK_TIME_ZONE='America/Vancouver')
+class ActivityFactorTests(SimpleTestCase):
+    def test_school_day_is_checked_at_the_base_rate(self):
+        self.assertEqual(activity_factor(datetime(2025, 3, 5, 12, 0, tzinfo=VANCOUVER)), 1)
+
+    def test_nights_and_weekends_are_stretched(self):
+        self.assertEqual(activity_factor(datetime(2025, 3, 5, 2, 0, tzinfo=VANCOUVER)), 3)
+        self.assertEqual(activity_factor(datetime(2025, 3, 8, 12, 0, tzinfo=VANCOUVER)), 2)
+
+
+class GradeCheckScheduleTests(TestCase):
+    def setUp(self):
+        self.user = self.make_user('student', 'student@wpga.ca', 'secret')
+        self.no_password = self.make_user('nopass', 'nopass@wpga.ca', None)
+
+    def make_user(self, username, email, wolfnet_password):
+        user = User.objects.create_user(username=username, password='testpassword', school_email=email, first_name='John', last_name='Doe')
+        user.userprofile.wolfnet_password = wolfnet_password
+        user.userprofile.save()
+        return user
+
+    def test_only_users_with_credentials_are_scheduled(self):
+        self.assertEqual(ensure_schedules(), 1)
+        schedule = GradeCheckSchedule.objects.get()
+
+        self.assertEqual(schedule.user, self.user)
+        self.assertLessEqual(schedule.next_check_at, timezone.now() + BASE_INTERVAL)
+        self.assertEqual(ensure_schedules(), 0)
+
+    def test_claimed_schedules_are_pushed_ahead(self):
+        ensure_schedules()
+        GradeCheckSchedule.objects.update(next_check_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual([s.user for s in claim_due_schedules()], [self.user])
+        self.assertEqual(claim_due_schedules(), [])
+
+    def test_interval_backs_off_without_changes_and_resets_on_change(self):
+        ensure_schedules()
+        for _ in range(10):
+            record_grade_check(self.user, [])
+        schedule = GradeCheckSchedule.objects.get()
+        self.assertEqual(schedule.interval, MAX_INTERVAL)
+
+        record_grade_check(self.user, ['1001'])
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.interval, MIN_INTERVAL)
+        self.assertEqual((schedule.checks, schedule.changes_detected), (11, 1))
+        self.assertEqual(grade_check_stats()['checks_per_change'], 11)
+
+    def test_change_brings_forward_classmates_in_the_same_section(self):
+        classmate = self.make_user('classmate', 'classmate@wpga.ca', 'secret')
+        ensure_schedules()
+        GradeCheckSchedule.objects.update(next_check_at=timezone.now() + timedelta(hours=5))
+        GradebookSnapshot.objects.create(user=classmate, section_id='1001', marking_period_id='1', json_data=[])
+
+        record_grade_check(self.user, ['1001'])
+
+        classmate_schedule = GradeCheckSchedule.objects.get(user=classmate)
+        self.assertLessEqual(classmate_schedule.next_check_at, timezone.now() + CLASSMATE_WINDOW)
+        self.assertEqual(classmate_schedule.interval, MIN_INTERVAL)
@@ -0,0 +1,106 @@
+from django.test import SimpleTestCase, TestCase
+from forum.models import User, GradebookSnapshot, GradebookDelta
+from forum.services.gradebook_diff import normalize_assignments, content_hash, diff_assignments, build_delta, apply_delta, revert_delta, rebuild_states
+
+def assignment(aid, points=8, comment='', skills=None):
+    return {
+        'assignment_id': aid,
+        'name': 'Quiz',
+        'points_earned': points,
+        'max_points': 10,
+        'comment': comment,
+        'assignment_type': 'Quiz',
+        'assignment_type_id': 1,
+        'skills': skills or [],
+    }
+
+def skill(rating, desc):
+    return {'skill_id': 7, 'skill_name': 'Reasoning', 'rating': rating, 'rating_desc': desc}
+
+
+class GradebookDiffTests(SimpleTestCase):
+    def test_normalize_reads_the_first_roster_entry(self):
+        hydrate_json = {'Roster': [{'AssignmentGrades': [
+            {'AssignmentId': 5, 'AssignmentType': ' Test ', 'PointsEarned': 9, 'MaxPoints': 10, 'Comment': None,
+             'AssignmentSkillList': [{'SkillId': 7, 'SkillName': 'Reasoning', 'Rating': 3, 'RatingDesc': 'Proficient'}]},
+        ]}]}
+
+        [a] = normalize_assignments(hydrate_json)
+
+        self.assertEqual((a['assignment_id'], a['name'], a['comment']), (5, 'Test', ''))
+        self.assertEqual(a['skills'][0]['rating_desc'], 'Proficient')
+        self.assertIsNone(normalize_assignments({'Roster': []}))
+
+    def test_hash_ignores_order_and_detects_changes(self):
+        a, b = assignment(1), assignment(2)
+
+        self.assertEqual(content_hash([a, b]), content_hash([b, a]))
+        self.assertNotEqual(content_hash([a, b]), content_hash([a, assignment(2, points=9)]))
+
+    def test_change_types(self):
+        old = [assignment(1), assignment(2), assignment(3, skills=[skill(2, 'Developing')]), assignment(4)]
+        new = [assignment(1, points=9), assignment(2, comment='Nice'), assignment(3, skills=[skill(3, 'Proficient')]), assignment(5)]
+
+        changes = {(c['type'], c['assignment']['assignment_id']) for c in diff_assignments(old, new)}
+
+        self.assertEqual(changes, {
+            ('points_changed', 1),
+            ('comment_changed', 2),
+            ('skill_changed', 3),
+            ('removed', 4),
+            ('new', 5),
+        })
+
+    def test_unchanged_lists_have_no_changes(self):
+        old = [assignment(1), assignment(2)]
+
+        self.assertEqual(diff_assignments(old, [dict(a) for a in old]), [])
+        delta = build_delta(old, old)
+        self.assertEqual((delta['upserted'], delta['removed'], delta['previous']), ([], [], []))
+
+    def test_delta_stores_only_the_difference_and_replays(self):
+        old = [assignment(1), assignment(2), assignment(3)]
+        new = [assignment(1), assignment(2, points=10), assignment(4)]
+
+        delta = build_delta(old, new)
+
+        self.assertEqual([a['assignment_id'] for a in delta['upserted']], [2, 4])
+        self.assertEqual(delta['removed'], [3])
+        self.assertEqual(content_hash(apply_delta(old, delta)), content_hash(new))
+        self.assertEqual(sorted(a['assignment_id'] for a in delta['previous']), [2, 3])
+        self.assertEqual(delta['base_hash'], content_hash(old))
+
+    def test_delta_reverts_to_the_old_list(self):
+        old = [assignment(1), assignment(2), assignment(3, skills=[skill(2, 'Developing')])]
+        new = [assignment(2, comment='Nice'), assignment(3, skills=[skill(3, 'Proficient')]), assignment(4)]
+
+        delta = build_delta(old, new)
+
+        self.assertEqual(content_hash(revert_delta(new, delta)), content_hash(old))
+
+    def test_deltas_without_previous_versions_cannot_be_reverted(self):
+        with self.assertRaises(ValueError):
+            revert_delta([assignment(1)], {'upserted': [assignment(1)], 'removed': []})
+
+
+class GradebookHistoryTests(TestCase):
+    def test_earlier_states_are_rebuilt_from_stored_rows(self):
+        user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        states = [
+            [assignment(1)],
+            [assignment(1, points=9), assignment(2)],
+            [assignment(2, comment='Nice'), assignment(3)],
+            [assignment(2, comment='Nice'), assignment(3, points=4), assignment(1, points=10)],
+        ]
+        # Rewritten in place like process_fetched_gradebooks does
+        snapshot = GradebookSnapshot.objects.create(user=user, section_id='1', marking_period_id='2', json_data=states[0], content_hash=content_hash(states[0]))
+        for old, new in zip(states, states[1:]):
+            GradebookDelta.objects.create(snapshot=snapshot, delta=build_delta(old, new), content_hash=content_hash(new))
+            GradebookSnapshot.objects.filter(pk=snapshot.pk).update(json_data=new, content_hash=content_hash(new))
+
+        snapshot.refresh_from_db()
+        stored = [row.delta for row in snapshot.deltas.all()]
+        rebuilt = rebuild_states(snapshot.json_data, stored)
+
+        self.assertEqual([content_hash(s) for s in rebuilt], [content_hash(s) for s in states[:-1]])
+        self.assertEqual([d['base_hash'] for d in stored], [content_hash(s) for s in states[:-1]])
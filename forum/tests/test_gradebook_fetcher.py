@@ -0,0 +1,91 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urlparse, parse_qs
+from django.test import SimpleTestCase
+from forum.services.gradebook_fetcher import fetch_gradebooks
+from forum.services.wolfnet_session_services import WolfNetSessionExpired
+
+class WolfNetStubHandler(BaseHTTPRequestHandler):
+    """Answers with the caller's cookie; section 'flaky' fails once, user 'expired' gets a 401"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        section_id = parse_qs(url.query)['sectionId'][0]
+        cookie = self.headers.get('Cookie', '')
+        self.server.cookies.append(cookie)
+
+        status = 200
+        if 'expired' in cookie:
+            status = 401
+        elif section_id == 'flaky' and url.path.endswith('hydrategradebook') and not self.server.failed_once:
+            self.server.failed_once = True
+            status = 503
+
+        if url.path.endswith('hydrategradebook'):
+            data = {'Roster': [], 'Cookie': cookie}
+        else:
+            data = [{'AssignmentId': 1, 'AssignmentShortDescription': f'Quiz {section_id}'}]
+        body = json.dumps(data).encode() if status == 200 else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Set-Cookie', 't=leaked; Path=/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@mock.patch('forum.services.gradebook_fetcher.BACKOFF_BASE', 0.01)
+class GradebookFetcherTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), WolfNetStubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.cookies = []
+        self.server.failed_once = False
+
+    def job(self, key, token, section_ids):
+        return {'key': key, 'cookies': {'t': token}, 'student_id': '42', 'marking_period_id': '1', 'section_ids': section_ids}
+
+    def test_every_section_of_every_user_is_fetched_with_their_own_cookies(self):
+        results = fetch_gradebooks(
+            [self.job('a', 'token-a', ['1', '2']), self.job('b', 'token-b', ['3'])],
+            base_url=self.base_url,
+        )
+
+        self.assertEqual(results['a']['1']['gradebook']['Cookie'], 't=token-a')
+        self.assertEqual(results['a']['2']['assignment_names'], {1: 'Quiz 2'})
+        self.assertEqual(results['b']['3']['gradebook']['Cookie'], 't=token-b')
+        self.assertEqual(len(self.server.cookies), 6)
+        self.assertNotIn('leaked', ''.join(self.server.cookies))
+
+    def test_transient_errors_are_retried(self):
+        results = fetch_gradebooks([self.job('a', 'token-a', ['flaky'])], base_url=self.base_url)
+
+        self.assertTrue(self.server.failed_once)
+        self.assertIsNotNone(results['a']['flaky']['gradebook'])
+
+    def test_rejected_session_fails_only_that_user(self):
+        results = fetch_gradebooks(
+            [self.job('a', 'expired', ['1', '2']), self.job('b', 'token-b', ['3'])],
+            base_url=self.base_url,
+        )
+
+        self.assertIsInstance(results['a'], WolfNetSessionExpired)
+        self.assertIsNotNone(results['b']['3']['gradebook'])
@@ -0,0 +1,133 @@
+import shutil
+import tempfile
+from io import BytesIO
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from forum.models import User, Post, ImageAsset
+from forum.services.image_services import image_asset_key, prepare_image, process_image_asset, render_variants
+from forum.services.post_card_services import hydrate_post_cards
+
+# EXIF orientation tag and "rotate 90° clockwise"
+ORIENTATION = 0x0112
+ROTATE_90 = 6
+
+def image_bytes(size=(3000, 2000), mode='RGB', image_format='JPEG', exif=None):
+    image = Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30))
+    buffer = BytesIO()
+    extra = {'exif': exif} if exif is not None else {}
+    image.save(buffer, format=image_format, **extra)
+    return buffer.getvalue()
+
+def exif_with_gps():
+    exif = Image.Exif()
+    exif[ORIENTATION] = ROTATE_90
+    exif[0x8825] = {1: 'N', 2: (49.0, 15.0, 0.0)}  # GPSInfo
+    return exif
+
+
+class RenderVariantsTests(SimpleTestCase):
+    def test_sizes_keep_aspect_ratio(self):
+        variants = render_variants(prepare_image(BytesIO(image_bytes())))
+
+        self.assertEqual((variants['full']['width'], variants['full']['height']), (2048, 1365))
+        self.assertEqual((variants['card']['width'], variants['card']['height']), (800, 533))
+        self.assertEqual((variants['thumbnail']['width'], variants['thumbnail']['height']), (320, 213))
+        self.assertEqual(Image.open(BytesIO(variants['card']['webp'])).format, 'WEBP')
+        self.assertEqual(Image.open(BytesIO(variants['card']['jpeg'])).size, (800, 533))
+
+    def test_small_images_are_not_upscaled(self):
+        variants = render_variants(prepare_image(BytesIO(image_bytes(size=(500, 400)))))
+
+        self.assertEqual((variants['full']['width'], variants['card']['width'], variants['thumbnail']['width']), (500, 500, 320))
+
+    def test_exif_is_applied_then_stripped(self):
+        variants = render_variants(prepare_image(BytesIO(image_bytes(size=(1200, 600), exif=exif_with_gps()))))
+
+        self.assertEqual((variants['full']['width'], variants['full']['height']), (600, 1200))
+        for image_format in ('webp', 'jpeg'):
+            self.assertEqual(len(Image.open(BytesIO(variants['full'][image_format])).getexif()), 0)
+
+    def test_transparency(self):
+        variants = render_variants(prepare_image(BytesIO(image_bytes(size=(100, 100), mode='RGBA', image_format='PNG'))))
+
+        self.assertEqual(Image.open(BytesIO(variants['card']['webp'])).mode, 'RGBA')
+        self.assertEqual(Image.open(BytesIO(variants['card']['jpeg'])).mode, 'RGB')
+
+    def test_asset_key_from_url(self):
+        key = 'a' * 32
+        self.assertEqual(image_asset_key(f'https://wolfkey.example/images/{key}/'), key)
+        self.assertEqual(image_asset_key(f'/images/{key}/card/'), key)
+        self.assertIsNone(image_asset_key('/media/uploads/old.jpg'))
+        self.assertIsNone(image_asset_key(None))
+
+
+class ImagePipelineTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        self.client.force_login(self.user)
+
+    def upload(self, data=None, name='photo.jpg', content_type='image/jpeg'):
+        upload = SimpleUploadedFile(name, data or image_bytes(exif=exif_with_gps()), content_type=content_type)
+        return self.client.post(reverse('upload_image'), {'image': upload})
+
+    def test_upload_stores_the_original_and_returns_a_stable_url(self):
+        response = self.upload()
+
+        self.assertEqual(response.status_code, 200)
+        url = response.json()['file']['url']
+        asset = ImageAsset.objects.get(key=image_asset_key(url))
+        self.assertEqual(asset.status, ImageAsset.PENDING)
+        self.assertEqual(asset.uploaded_by, self.user)
+        self.assertTrue(default_storage.exists(asset.original))
+
+        # Until the variants exist the stable URL serves the original
+        redirect = self.client.get(url)
+        self.assertEqual(redirect.status_code, 302)
+        self.assertEqual(redirect['Location'], default_storage.url(asset.original))
+
+    def test_non_images_are_rejected(self):
+        response = self.upload(data=b'not an image at all')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImageAsset.objects.exists())
+
+    def test_processing_writes_variants_and_drops_the_original(self):
+        asset = ImageAsset.objects.get(key=image_asset_key(self.upload().json()['file']['url']))
+        original = asset.original
+
+        asset = process_image_asset(asset.id)
+
+        self.assertEqual(asset.status, ImageAsset.READY)
+        self.assertEqual((asset.width, asset.height), (2000, 3000))
+        self.assertEqual(set(asset.variants), {'full', 'card', 'thumbnail'})
+        self.assertFalse(default_storage.exists(original))
+
+        url = reverse('image_asset_variant', args=[asset.key, 'card'])
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT='image/webp,*/*')['Location'], asset.variants['card']['webp'])
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT='image/png,*/*')['Location'], asset.variants['card']['jpeg'])
+        self.assertEqual(self.client.get(reverse('image_asset_variant', args=[asset.key, 'huge'])).status_code, 404)
+
+    def test_undecodable_originals_fail(self):
+        asset = ImageAsset.objects.create(key='b' * 32, original=default_storage.save('uploads/originals/broken.jpg', BytesIO(b'\xff\xd8broken')))
+
+        self.assertEqual(process_image_asset(asset.id).status, ImageAsset.FAILED)
+
+    def test_cards_use_the_card_variant(self):
+        url = self.upload().json()['file']['url']
+        process_image_asset(ImageAsset.objects.get(key=image_asset_key(url)).id)
+        with_image = Post.objects.create(title='Graph', author=self.user, content={'blocks': [{'type': 'image', 'data': {'file': {'url': url}}}]})
+        legacy = Post.objects.create(title='Old', author=self.user, content={'blocks': [{'type': 'image', 'data': {'file': {'url': '/media/uploads/old.jpg'}}}]})
+
+        posts = hydrate_post_cards([with_image.id, legacy.id], self.user)
+
+        self.assertEqual(posts[0].image_variants['card']['width'], 533)
+        self.assertIsNone(posts[1].image_variants)
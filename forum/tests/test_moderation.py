@@ -0,0 +1,84 @@
+import os
+import tempfile
+from django.test import SimpleTestCase, override_settings
+from forum.services.utils import ModerationFilter, detect_bad_words, get_moderation_filter
+
+class ModerationFilterTests(SimpleTestCase):
+    def setUp(self):
+        self.moderation = ModerationFilter(['shit', 'ass', 'asshole'])
+
+    def test_normalized_matches(self):
+        for text in ('Sh1t', 's.h.i.t', 'shiiiit', '<b>shit</b>', 'the a$$hole'):
+            self.assertTrue(self.moderation.search(text), text)
+        self.assertTrue(self.moderation.search('what&nbsp;ass&nbsp;', markup=True))
+
+    def test_whole_words_only(self):
+        for text in ('class assignment', 'pass the assessment', 'assholes', 'shitake', ''):
+            self.assertFalse(self.moderation.search(text), text)
+
+    def test_empty_wordlist(self):
+        self.assertFalse(ModerationFilter([]).search('anything'))
+
+
+class DetectBadWordsTests(SimpleTestCase):
+    def assertRejected(self, content, message):
+        with self.assertRaisesMessage(ValueError, message):
+            detect_bad_words(content)
+
+    def test_every_text_block_is_scanned(self):
+        self.assertRejected({'blocks': [{'type': 'header', 'data': {'text': 'Sh1t'}}]}, "block of type 'header'")
+        self.assertRejected({'blocks': [{'type': 'quote', 'data': {'text': 'Fine', 'caption': 'fuck'}}]}, "block of type 'quote'")
+        self.assertRejected({'blocks': [{'type': 'table', 'data': {'content': [['a', 'b'], ['c', 'd1ck']]}}]}, "block of type 'table'")
+        self.assertRejected({'blocks': [{'type': 'list', 'data': {'items': [{'content': 'ok', 'items': [{'content': 'b1tch', 'items': []}]}]}}]}, "block of type 'list'")
+        self.assertRejected({'blocks': [{'type': 'list', 'data': {'items': ['ok', 'pussy']}}]}, "block of type 'list'")
+
+    def test_names_the_offending_block(self):
+        document = {'blocks': [
+            {'type': 'paragraph', 'data': {'text': 'Clean question'}},
+            {'type': 'header', 'data': {'text': 'Still clean'}},
+            {'type': 'quote', 'data': {'text': 'shit'}},
+        ]}
+        self.assertRejected(document, "Bad word detected in block of type 'quote'.")
+
+    def test_words_do_not_run_across_blocks(self):
+        detect_bad_words({'blocks': [
+            {'type': 'paragraph', 'data': {'text': 'sh'}},
+            {'type': 'paragraph', 'data': {'text': 'it'}},
+        ]})
+
+    def test_clean_content_passes(self):
+        detect_bad_words({'blocks': [{'type': 'paragraph', 'data': {'text': 'Class assignment due Monday'}}, {'type': 'image', 'data': {'file': {'url': '/media/a.png'}}}]})
+        detect_bad_words('Just a bio')
+
+    def test_plain_text(self):
+        self.assertRejected('Sh1t bio', 'Bad word detected in text.')
+
+    def test_brackets_in_plain_text_are_not_markup(self):
+        for bio in ('a < shit > b', '<fuck>', '<b>shit</b>', 'a <b shit> b'):
+            self.assertRejected(bio, 'Bad word detected in text.')
+        detect_bad_words('i <3 physics')
+
+    def test_editorjs_markup_is_dropped_from_block_text(self):
+        self.assertRejected({'blocks': [{'type': 'paragraph', 'data': {'text': '<a href="/notes">sh1t</a>'}}]}, "block of type 'paragraph'")
+        self.assertRejected({'blocks': [{'type': 'paragraph', 'data': {'text': '&lt;fuck&gt;'}}]}, "block of type 'paragraph'")
+        self.assertRejected({'blocks': [{'type': 'paragraph', 'data': {'text': 'a <x shit> b'}}]}, "block of type 'paragraph'")
+        detect_bad_words({'blocks': [{'type': 'paragraph', 'data': {'text': '<span class="cdx-marker">Class</span> assignment'}}]})
+
+    def test_unsupported_content(self):
+        self.assertRejected(['shit'], 'Unsupported content format')
+
+
+class ModerationWordlistTests(SimpleTestCase):
+    def setUp(self):
+        get_moderation_filter.cache_clear()
+        self.addCleanup(get_moderation_filter.cache_clear)
+
+    def test_wordlist_from_settings(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as wordlist:
+            wordlist.write('# School wordlist\ndarn\n\nh3ck\n')
+        self.addCleanup(os.remove, wordlist.name)
+
+        with override_settings(MODERATION_WORDLIST_PATH=wordlist.name):
+            self.assertRaises(ValueError, detect_bad_words, 'Oh heck')
+            self.assertRaises(ValueError, detect_bad_words, 'darn it')
+            detect_bad_words('shit')
@@ -0,0 +1,81 @@
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from forum.models import User, Post, Course, Solution, Comment, PostLike, FollowedPost, UserCourseExperience
+from forum.services.post_card_services import hydrate_post_cards
+from forum.services.counter_services import reconcile_counters
+
+# posts, courses, course blocks, likes, follows, experienced courses, help courses
+# (plus one for image variants on pages with uploaded images, see test_image_pipeline)
+POST_CARD_QUERY_COUNT = 7
+
+class PostCardHydrationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        self.other = User.objects.create_user(username='otheruser', password='testpassword', school_email='other@wpga.ca', first_name='Jane', last_name='Doe')
+        self.math = Course.objects.create(name="Math 10")
+        self.physics = Course.objects.create(name="Physics 11")
+        UserCourseExperience.objects.create(user=self.user, course=self.math)
+
+        self.post_ids = []
+        for i in range(12):
+            post = Post.objects.create(
+                title=f'Post {i}',
+                content={'blocks': [{'type': 'paragraph', 'data': {'text': f'Body {i}'}}]},
+                author=self.other,
+            )
+            post.courses.set([self.math, self.physics])
+            solution = Solution.objects.create(post=post, author=self.user, content={'blocks': []})
+            Comment.objects.create(solution=solution, author=self.other, content={'blocks': []})
+            Comment.objects.create(solution=solution, author=self.user, content={'blocks': []})
+            PostLike.objects.create(user=self.other, post=post)
+            if i % 2 == 0:
+                PostLike.objects.create(user=self.user, post=post)
+                FollowedPost.objects.create(user=self.user, post=post)
+            self.post_ids.append(post.id)
+        reconcile_counters()
+
+    def test_query_count_is_independent_of_page_size(self):
+        with CaptureQueriesContext(connection) as small_page:
+            hydrate_post_cards(self.post_ids[:2], self.user)
+        with CaptureQueriesContext(connection) as large_page:
+            hydrate_post_cards(self.post_ids, self.user)
+
+        self.assertEqual(len(small_page), POST_CARD_QUERY_COUNT)
+        self.assertEqual(len(large_page), POST_CARD_QUERY_COUNT)
+
+    def test_rendering_hydrated_cards_runs_no_extra_queries(self):
+        posts = hydrate_post_cards(self.post_ids, self.user)
+        request = RequestFactory().get('/')
+        request.user = self.user
+
+        with self.assertNumQueries(0):
+            for post in posts:
+                html = render_to_string('forum/components/post_card.html', {
+                    'post': post,
+                    'user': self.user,
+                    'request': request,
+                })
+
+        self.assertIn(posts[-1].title, html)
+
+    def test_hydrated_values(self):
+        posts = hydrate_post_cards(self.post_ids[:2], self.user)
+
+        self.assertEqual([post.id for post in posts], self.post_ids[:2])
+        first, second = posts
+        self.assertEqual(first.solution_count, 1)
+        self.assertEqual(first.comment_count, 2)
+        self.assertEqual(first.total_response_count, 3)
+        self.assertEqual(first.likes_count, 2)
+        self.assertEqual(second.likes_count, 1)
+        self.assertTrue(first.is_liked_by_user)
+        self.assertFalse(second.is_liked_by_user)
+        self.assertTrue(first.is_following)
+        self.assertEqual(first.followers_count, 1)
+        self.assertEqual(first.preview_text, 'Body 0')
+
+        contexts = {course['name']: course for course in first.course_context}
+        self.assertTrue(contexts['Math 10']['is_experienced'])
+        self.assertFalse(contexts['Physics 11']['is_experienced'])
@@ -0,0 +1,61 @@
+import json
+from django.test import SimpleTestCase, TestCase
+from forum.models import User, Post
+from forum.services.utils import extract_post_content
+
+DOCUMENT = {'blocks': [
+    {'type': 'header', 'data': {'text': 'Kinematics', 'level': 2}},
+    {'type': 'paragraph', 'data': {'text': 'How do I find&nbsp;<b>velocity</b>?'}},
+    {'type': 'image', 'data': {'file': {'url': '/media/uploads/graph.png'}, 'caption': 'The graph'}},
+    {'type': 'image', 'data': {'file': {'url': '/media/uploads/second.png'}}},
+    {'type': 'list', 'data': {'style': 'unordered', 'items': ['Distance', {'content': 'Time', 'items': [{'content': 'Seconds', 'items': []}]}]}},
+    {'type': 'table', 'data': {'content': [['t', 'x'], ['1', '2']]}},
+    {'type': 'paragraph', 'data': {'text': 'Thanks<br>in advance'}},
+]}
+
+class ExtractPostContentTests(SimpleTestCase):
+    def test_preview_is_the_paragraph_text(self):
+        self.assertEqual(extract_post_content(DOCUMENT)['preview_text'], 'How do I find velocity? Thanks in advance')
+
+    def test_first_image_url(self):
+        self.assertEqual(extract_post_content(DOCUMENT)['first_image_url'], '/media/uploads/graph.png')
+        self.assertIsNone(extract_post_content({'blocks': []})['first_image_url'])
+
+    def test_body_text_covers_every_text_block(self):
+        body = extract_post_content(DOCUMENT)['body_text']
+
+        for text in ('Kinematics', 'velocity', 'The graph', 'Distance', 'Seconds', 't x 1 2'):
+            self.assertIn(text, body)
+
+    def test_json_string_content(self):
+        self.assertEqual(extract_post_content(json.dumps(DOCUMENT)), extract_post_content(DOCUMENT))
+
+    def test_plain_string_content(self):
+        self.assertEqual(extract_post_content('Just <i>text</i>')['preview_text'], 'Just text')
+
+
+class PostContentColumnsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+
+    def test_columns_follow_content(self):
+        post = Post.objects.create(title='Physics', content=DOCUMENT, author=self.user)
+        self.assertEqual(post.first_image_url, '/media/uploads/graph.png')
+
+        post.content = {'blocks': [{'type': 'paragraph', 'data': {'text': 'Edited'}}]}
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+
+        self.assertEqual(post.preview_text, 'Edited')
+        self.assertIsNone(post.first_image_url)
+        self.assertEqual(post.body_text, 'Edited')
+
+    def test_saves_without_content_keep_the_columns(self):
+        post = Post.objects.create(title='Physics', content=DOCUMENT, author=self.user)
+        Post.objects.filter(id=post.id).update(preview_text='stale')
+        post.refresh_from_db()
+
+        post.save(update_fields=['title'])
+        post.refresh_from_db()
+
+        self.assertEqual(post.preview_text, 'stale')
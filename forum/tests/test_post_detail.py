@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+from django.contrib.auth.models import AnonymousUser
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase
+from forum.models import User, Post, Solution, Comment, SolutionVote, SavedSolution, PostLike, FollowedPost
+from forum.services.post_detail_services import assemble_post_detail, build_comment_trees
+
+# post, courses, solutions, comments, votes, saved solutions, like, follow
+POST_DETAIL_QUERY_COUNT = 8
+SOLUTIONS = 50
+COMMENTS_PER_SOLUTION = 200
+
+class PostDetailAssemblyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        cls.other = User.objects.create_user(username='otheruser', password='testpassword', school_email='other@wpga.ca', first_name='Jane', last_name='Doe')
+        cls.post = Post.objects.create(title='Busy post', content={'blocks': []}, author=cls.other)
+
+        solutions = Solution.objects.bulk_create([
+            Solution(post=cls.post, author=cls.user if i == 0 else cls.other, content={'blocks': []}, upvotes=i)
+            for i in range(SOLUTIONS)
+        ])
+        for solution in solutions:
+            # Each comment replies to the previous one, so depths run past the cap
+            parent = None
+            for _ in range(COMMENTS_PER_SOLUTION // 40):
+                roots = Comment.objects.bulk_create([
+                    Comment(solution=solution, author=cls.other, content={'blocks': []}) for _ in range(20)
+                ])
+                for root in roots:
+                    root.path = Comment.make_path('', root.id)
+                Comment.objects.bulk_update(roots, ['path'])
+                for root in roots:
+                    parent = Comment.objects.create(solution=solution, author=cls.user, content={'blocks': []}, parent=root if parent is None else parent)
+
+        cls.post.accepted_solution = solutions[3]
+        cls.post.save()
+        SolutionVote.objects.create(solution=solutions[1], user=cls.user, value=SolutionVote.UPVOTE)
+        SolutionVote.objects.create(solution=solutions[2], user=cls.user, value=SolutionVote.DOWNVOTE)
+        SavedSolution.objects.create(solution=solutions[1], user=cls.user)
+        PostLike.objects.create(post=cls.post, user=cls.user)
+        FollowedPost.objects.create(post=cls.post, user=cls.user)
+        cls.solutions = solutions
+
+    def test_query_count_is_independent_of_solutions_and_comments(self):
+        with self.assertNumQueries(POST_DETAIL_QUERY_COUNT):
+            detail = assemble_post_detail(self.post.id, self.user)
+
+        self.assertEqual(len(detail['solutions']), SOLUTIONS)
+        self.assertEqual(sum(len(s.comment_list) for s in detail['solutions']), SOLUTIONS * COMMENTS_PER_SOLUTION)
+
+    def test_rendering_solutions_runs_no_extra_queries(self):
+        detail = assemble_post_detail(self.post.id, self.user)
+
+        with self.assertNumQueries(0):
+            for solution in detail['solutions']:
+                render_to_string('forum/components/post_detail_solution_card.html', {
+                    'solution': solution,
+                    'accepted_solution': detail['accepted_solution'],
+                    'post': detail['post'],
+                    'user': self.user,
+                })
+
+    def test_viewer_state_and_order(self):
+        detail = assemble_post_detail(self.post.id, self.user)
+        solutions = {s.id: s for s in detail['solutions']}
+
+        self.assertEqual(detail['solutions'][0].id, self.solutions[3].id)
+        self.assertIs(detail['accepted_solution'], detail['solutions'][0])
+        self.assertTrue(solutions[self.solutions[1].id].is_upvoted)
+        self.assertTrue(solutions[self.solutions[1].id].is_saved)
+        self.assertTrue(solutions[self.solutions[2].id].is_downvoted)
+        self.assertIsNone(solutions[self.solutions[4].id].viewer_vote)
+        self.assertTrue(detail['post'].is_liked_by_user)
+        self.assertTrue(detail['post'].is_following)
+        self.assertTrue(detail['has_solution_from_user'])
+
+    def test_trees_follow_parents(self):
+        detail = assemble_post_detail(self.post.id, self.user)
+
+        for solution in detail['solutions'][:3]:
+            self.assertEqual(sum(1 for c in solution.comment_list if c.parent_id is None), len(solution.comment_tree))
+            for comment in solution.comment_list:
+                self.assertTrue(all(child.parent_id == comment.id for child in comment.children))
+
+    def test_anonymous_viewer(self):
+        detail = assemble_post_detail(self.post.id, AnonymousUser())
+
+        self.assertFalse(detail['post'].is_liked_by_user)
+        self.assertFalse(any(s.is_saved or s.viewer_vote for s in detail['solutions']))
+
+
+class CommentTreeTests(SimpleTestCase):
+    def test_trees_keep_order(self):
+        comments = [SimpleNamespace(id=1, parent_id=None), SimpleNamespace(id=2, parent_id=None)]
+        for i in range(3, 11):
+            comments.append(SimpleNamespace(id=i, parent_id=i - 1 if i > 3 else 1))
+        comments.append(SimpleNamespace(id=11, parent_id=1))
+
+        roots = build_comment_trees(comments)
+
+        self.assertEqual([c.id for c in roots], [1, 2])
+        self.assertEqual([c.id for c in roots[0].children], [3, 11])
+        self.assertEqual([c.id for c in comments[2].children], [4])
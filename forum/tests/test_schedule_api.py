@@ -0,0 +1,60 @@
+import datetime
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from forum.api.schedule import get_schedule_range_api
+
+DAYS = [{
+    'date': '2025-10-06',
+    'display_date': 'Mon, Oct 6',
+    'is_school': True,
+    'ceremonial_uniform': False,
+    'blocks': [{'block': 'Chemistry 11', 'time': '8:20-9:30'}],
+}]
+
+
+@mock.patch('forum.api.schedule.get_schedule_range', return_value=(DAYS, timezone.now() - datetime.timedelta(hours=1)))
+class ScheduleRangeApiTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = SimpleNamespace(id=1, is_authenticated=True)
+
+    def get(self, params, **headers):
+        request = self.factory.get('/api/schedule/', params, **headers)
+        force_authenticate(request, user=self.user)
+        return get_schedule_range_api(request)
+
+    def test_week_defaults_and_cache_headers(self, get_schedule_range):
+        response = self.get({'start': '2025-10-06'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['end'], '2025-10-12')
+        get_schedule_range.assert_called_once_with(self.user, datetime.date(2025, 10, 6), datetime.date(2025, 10, 12))
+        self.assertTrue(response['ETag'])
+        self.assertTrue(response['Last-Modified'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_revalidation_returns_not_modified(self, get_schedule_range):
+        etag = self.get({'start': '2025-10-06'})['ETag']
+
+        response = self.get({'start': '2025-10-06'}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_invalid_ranges_are_rejected(self, get_schedule_range):
+        self.assertEqual(self.get({'start': 'soon'}).status_code, 400)
+        self.assertEqual(self.get({'start': '2025-10-06', 'end': '2025-10-01'}).status_code, 400)
+        self.assertEqual(self.get({'start': '2025-09-01', 'end': '2025-12-31'}).status_code, 400)
+        get_schedule_range.assert_not_called()
+
+    def test_range_limit_counts_start_and_end(self, get_schedule_range):
+        # 2025-10-01 to 2025-12-01 covers 62 dates
+        self.assertEqual(self.get({'start': '2025-10-01', 'end': '2025-12-01'}).status_code, 200)
+
+        response = self.get({'start': '2025-10-01', 'end': '2025-12-02'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('at most 62 days, start and end included', response.data['error'])
@@ -0,0 +1,86 @@
+import datetime
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.core.cache import cache
+from django.utils import timezone
+from forum.models import DailySchedule
+from forum.services.schedule_services import get_day_schedules, get_block_course_names, process_schedule_for_user
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+def daily_schedule(date_obj, *blocks):
+    fields = {f'block_{i}': None for i in range(1, 9)}
+    fields.update({f'block_{i}_time': None for i in range(1, 9)})
+    for i, block in enumerate(blocks, start=1):
+        fields[f'block_{i}'] = block
+        fields[f'block_{i}_time'] = f'{7 + i}:00-{8 + i}:00'
+    return SimpleNamespace(date=date_obj, ceremonial_uniform=True, updated_at=timezone.now(), **fields)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ScheduleCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = SimpleNamespace(id=3)
+        self.monday = datetime.date(2025, 10, 6)
+        self.sunday = datetime.date(2025, 10, 5)
+
+    @mock.patch('forum.services.schedule_services.DailySchedule.objects.in_bulk')
+    def test_day_records_are_loaded_once(self, in_bulk):
+        in_bulk.return_value = {self.monday: daily_schedule(self.monday, '1A', '1B', '1CA', '1D', '1E')}
+
+        first = get_day_schedules([self.monday, self.sunday])
+        second = get_day_schedules([self.monday, self.sunday])
+
+        in_bulk.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(first[self.monday]['blocks'], ['1A', '1B', '1CA', '1D', '1E'])
+        self.assertTrue(first[self.monday]['ceremonial_uniform'])
+        self.assertEqual(first[self.sunday]['blocks'], [None] * 5)
+
+    @mock.patch('forum.services.schedule_services.UserProfile.objects.select_related')
+    def test_block_map_is_cached_per_user(self, select_related):
+        profile = SimpleNamespace(updated_at=timezone.now(), **{
+            field: None for field in ('block_1B', 'block_1D', 'block_1E', 'block_2A', 'block_2B', 'block_2C', 'block_2D', 'block_2E')
+        })
+        profile.block_1A = SimpleNamespace(name='Chemistry 11')
+        select_related.return_value.get.return_value = profile
+
+        get_block_course_names(self.user)
+        block_courses = get_block_course_names(self.user)
+
+        select_related.return_value.get.assert_called_once_with(user=self.user)
+        self.assertEqual(block_courses['courses'], {'1A': 'Chemistry 11'})
+
+    def test_processing_is_a_join_with_the_block_map(self):
+        record = {'blocks': ['1A', '1B', '1CA', None, 'TFR'], 'times': ['t1', 't2', 't3', 't4', 't5']}
+        block_courses = {'courses': {'1A': 'Chemistry 11'}, 'updated_at': None}
+
+        processed = process_schedule_for_user(self.user, record, block_courses)
+
+        self.assertEqual([entry['block'] for entry in processed], [
+            'Chemistry 11',
+            'Add your courses in profile to unlock this!',
+            'Advisory',
+            'No Block',
+            'Terry Fox Run',
+        ])
+        self.assertEqual(process_schedule_for_user(self.user, {'blocks': [None] * 5, 'times': [None] * 5}, block_courses), ['no school'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DayScheduleInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.monday = datetime.date(2025, 10, 6)
+
+    def test_deleting_a_day_drops_its_cached_record(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule = DailySchedule.objects.create(date=self.monday, block_1='1A', block_1_time='8:20-9:30', is_school=True)
+        self.assertEqual(get_day_schedules([self.monday])[self.monday]['blocks'][0], '1A')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule.delete()
+
+        self.assertEqual(get_day_schedules([self.monday])[self.monday]['blocks'], [None] * 5)
@@ -0,0 +1,101 @@
+import datetime
+from django.test import SimpleTestCase
+from forum.models import DailySchedule
+from forum.services.schedule_services import (
+    _school_year_start,
+    parse_block_order_rows,
+    parse_calendar_events,
+    build_daily_schedule_fields,
+    sheet_updates,
+)
+
+def sheet_row(sheet_date, *blocks):
+    return ['', '', '', sheet_date, *blocks]
+
+
+class BlockOrderSheetTests(SimpleTestCase):
+    def test_dates_roll_over_into_the_second_year(self):
+        rows = [[]] * 6 + [
+            sheet_row('Tue, Sep 2', '1A', '1B', '1C', '1D', '1E'),
+            sheet_row('Mon, Jan 5', '2A', '2B', '', '2D', '2E'),
+            sheet_row('Winter Break'),
+        ]
+
+        block_orders = parse_block_order_rows(rows, _school_year_start('Copy of 2025-2026 SS Block Order Calendar'))
+
+        self.assertEqual(block_orders, {
+            datetime.date(2025, 9, 2): ['1A', '1B', '1C', '1D', '1E'],
+            datetime.date(2026, 1, 5): ['2A', '2B', None, '2D', '2E'],
+        })
+
+    def test_rows_without_blocks_are_days_off(self):
+        [(date_obj, blocks)] = parse_block_order_rows([[]] * 6 + [sheet_row('Fri, Oct 10')], 2025).items()
+
+        fields = build_daily_schedule_fields(blocks, {}, False)
+
+        self.assertEqual(date_obj, datetime.date(2025, 10, 10))
+        self.assertFalse(fields['is_school'])
+
+
+class SchoolCalendarTests(SimpleTestCase):
+    def test_alt_days_and_ceremonial_uniform_days(self):
+        events = [
+            {
+                'summary': 'Alt Day - Late Start',
+                'description': 'Late start\n10:00-11:00 - Block 1B\n11:05-12:15 - Block 1C',
+                'start': {'date': '2025-10-08'},
+                'end': {'date': '2025-10-09'},
+            },
+            {
+                'summary': 'Remembrance Day Assembly',
+                'description': 'Ceremonial uniform required',
+                'start': {'dateTime': '2025-11-10T09:00:00-08:00'},
+            },
+            {'summary': 'Field trip', 'start': {'date': '2025-10-08'}, 'end': {'date': '2025-10-10'}},
+        ]
+
+        alt_day_times, ceremonial_dates = parse_calendar_events(events)
+
+        self.assertEqual(alt_day_times, {datetime.date(2025, 10, 8): {1: None, 2: '10:00-11:00', 3: '11:05-12:15'}})
+        self.assertEqual(ceremonial_dates, {datetime.date(2025, 11, 10)})
+
+    def test_multi_day_events_cover_every_day(self):
+        _, ceremonial_dates = parse_calendar_events([
+            {'summary': 'Ceremonial Uniform week', 'start': {'date': '2025-12-01'}, 'end': {'date': '2025-12-04'}},
+        ])
+
+        self.assertEqual(ceremonial_dates, {datetime.date(2025, 12, d) for d in (1, 2, 3)})
+
+
+class SheetUpdateTests(SimpleTestCase):
+    def fields(self, blocks, ceremonial=False):
+        return build_daily_schedule_fields(blocks, {i: f'{i}:00' for i in range(1, 6)}, ceremonial)
+
+    def test_blanks_are_filled(self):
+        schedule = DailySchedule(date=datetime.date(2025, 10, 6), block_2='Assembly')
+
+        updates = sheet_updates(schedule, self.fields(['1A', '1B', '1C', '1D', '1E'], ceremonial=True))
+
+        self.assertEqual(updates['block_1'], '1A')
+        self.assertNotIn('block_2', updates)
+        self.assertEqual(updates['block_2_time'], '2:00')
+        self.assertTrue(updates['ceremonial_uniform'])
+        self.assertTrue(updates['is_school'])
+
+    def test_admin_edits_stand(self):
+        schedule = DailySchedule(
+            date=datetime.date(2025, 10, 6),
+            block_1='2A', block_1_time='9:00-10:00',
+            ceremonial_uniform=False, is_school=False,
+        )
+
+        updates = sheet_updates(schedule, self.fields(['1A', '1B', '1C', '1D', '1E'], ceremonial=True))
+
+        for name in ('block_1', 'block_1_time', 'ceremonial_uniform', 'is_school'):
+            self.assertNotIn(name, updates)
+
+    def test_days_off_for_lack_of_blocks_become_school_days(self):
+        schedule = DailySchedule(date=datetime.date(2025, 10, 6), is_school=False)
+
+        self.assertTrue(sheet_updates(schedule, self.fields(['1A', '1B', '1C', '1D', '1E']))['is_school'])
+        self.assertNotIn('is_school', sheet_updates(schedule, self.fields([None] * 5)))
@@ -0,0 +1,52 @@
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from forum.models import User, Post, Course, CourseAlias
+from forum.services.search_services import FullName, search_posts_queryset
+
+class SearchIndexUsageTests(TestCase):
+    """
+    EXPLAIN the search queries with sequential scans disabled. A tiny test table is
+    always cheaper to scan, so this only checks that an index *can* answer each query.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+        Post.objects.create(
+            title='Quadratic equations',
+            content={'blocks': [{'type': 'paragraph', 'data': {'text': 'How do I factor this?'}}]},
+            author=self.user,
+        )
+        course = Course.objects.create(name='Pre-Calculus 12')
+        CourseAlias.objects.create(name='Precalc', course=course)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndexes(self, queryset, *index_names):
+        plan = queryset.explain()
+        self.assertNotIn('Seq Scan', plan)
+        for index_name in index_names:
+            self.assertIn(index_name, plan)
+
+    def test_post_search_uses_search_vector_and_title_indexes(self):
+        self.assertUsesIndexes(
+            search_posts_queryset('quadratic'),
+            'post_search_vector_gin', 'post_title_trgm',
+        )
+
+    def test_user_search_uses_name_indexes(self):
+        queryset = User.objects.alias(full_name=FullName()).filter(
+            Q(first_name__trigram_similar='jon')
+            | Q(last_name__trigram_similar='jon')
+            | Q(full_name__trigram_similar='jon')
+        )
+        self.assertUsesIndexes(
+            queryset,
+            'user_first_name_trgm', 'user_last_name_trgm', 'forum_user_full_name_trgm',
+        )
+
+    def test_course_search_uses_name_indexes(self):
+        name_match_q = Q(name__istartswith='precalc') | Q(name__trigram_word_similar='precalc')
+        self.assertUsesIndexes(Course.objects.filter(name_match_q), 'course_name_upper_trgm', 'course_name_trgm')
+        self.assertUsesIndexes(CourseAlias.objects.filter(name_match_q), 'coursealias_name_upper_trgm', 'coursealias_name_trgm')
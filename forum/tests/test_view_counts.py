@@ -0,0 +1,128 @@
+from unittest import mock
+from django.db.models.query import QuerySet
+from django.test import TestCase
+from redis.exceptions import ResponseError
+from forum.models import User, Post
+from forum.services import view_count_services
+from forum.services.view_count_services import (
+    flush_post_views, record_post_view, FLUSH_LOCK_KEY, FLUSHING_VIEWS_KEY, PENDING_VIEWS_KEY,
+)
+
+class FakeRedis:
+    """The handful of Redis commands the view buffer uses, with bytes values like redis-py."""
+    def __init__(self):
+        self.data = {}
+
+    def hincrby(self, key, field, amount):
+        fields = self.data.setdefault(key, {})
+        field = str(field).encode()
+        fields[field] = str(int(fields.get(field, b'0')) + amount).encode()
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hdel(self, key, *fields):
+        hash_ = self.data.get(key, {})
+        for field in fields:
+            hash_.pop(str(field).encode(), None)
+        if not hash_:
+            self.data.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def rename(self, src, dst):
+        if src not in self.data:
+            raise ResponseError('no such key')
+        self.data[dst] = self.data.pop(src)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode()
+        return True
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token.encode():
+            self.data.pop(key)
+
+
+class FlushPostViewsTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca')
+        self.posts = [Post.objects.create(title=f'Post {i}', content={'blocks': []}, author=author) for i in range(3)]
+        self.redis = FakeRedis()
+        patcher = mock.patch.object(view_count_services, 'get_redis_client', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def views(self):
+        return [Post.objects.get(id=post.id).views for post in self.posts]
+
+    def record(self, post, times):
+        for _ in range(times):
+            record_post_view(post.id)
+
+    def test_buffered_views_are_applied_once(self):
+        self.record(self.posts[0], 3)
+        self.record(self.posts[1], 1)
+
+        self.assertEqual(flush_post_views(), 4)
+        self.assertEqual(flush_post_views(), 0)
+        self.assertEqual(self.views(), [3, 1, 0])
+        self.assertEqual(self.redis.data, {})
+
+    def test_views_recorded_during_a_flush_wait_for_the_next_one(self):
+        self.record(self.posts[0], 2)
+        hgetall = self.redis.hgetall
+
+        def record_mid_flush(key):
+            self.record(self.posts[2], 1)
+            return hgetall(key)
+
+        with mock.patch.object(self.redis, 'hgetall', side_effect=record_mid_flush):
+            self.assertEqual(flush_post_views(), 2)
+        self.assertEqual(flush_post_views(), 1)
+        self.assertEqual(self.views(), [2, 0, 1])
+
+    def test_flush_is_skipped_while_another_holds_the_lock(self):
+        self.record(self.posts[0], 2)
+        self.redis.set(FLUSH_LOCK_KEY, 'other-worker')
+
+        self.assertEqual(flush_post_views(), 0)
+        self.assertEqual(self.views(), [0, 0, 0])
+        self.assertEqual(self.redis.data[FLUSH_LOCK_KEY], b'other-worker')
+
+    def test_crashed_flush_resumes_without_reapplying_committed_batches(self):
+        self.record(self.posts[0], 1)
+        self.record(self.posts[1], 1)
+        self.record(self.posts[2], 2)
+        update = QuerySet.update
+        calls = []
+
+        def fail_second_batch(queryset, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise RuntimeError('worker lost')
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(view_count_services, 'FLUSH_BATCH_SIZE', 1), \
+                mock.patch.object(QuerySet, 'update', fail_second_batch):
+            with self.assertRaises(RuntimeError):
+                flush_post_views()
+
+        self.assertNotIn(FLUSH_LOCK_KEY, self.redis.data)
+        self.assertEqual(len(self.redis.hgetall(FLUSHING_VIEWS_KEY)), 2)
+        self.assertEqual(flush_post_views(), 3)
+        self.assertEqual(self.views(), [1, 1, 2])
+
+    def test_without_redis_views_are_written_directly(self):
+        with mock.patch.object(view_count_services, 'get_redis_client', return_value=None):
+            self.record(self.posts[0], 2)
+            self.assertEqual(flush_post_views(), 0)
+
+        self.assertEqual(self.views(), [2, 0, 0])
+        self.assertNotIn(PENDING_VIEWS_KEY, self.redis.data)
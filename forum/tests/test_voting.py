@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test import TransactionTestCase
+from forum.models import User, Post, Solution, SolutionVote
+from forum.services.solution_services import vote_solution_service
+
+class ParallelVotingTests(TransactionTestCase):
+    """Fire votes from many threads at once; each thread gets its own DB connection."""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='testpassword', school_email='author@wpga.ca', first_name='John', last_name='Doe')
+        post = Post.objects.create(title='Test Post', content={'blocks': []}, author=self.author)
+        self.solution = Solution.objects.create(post=post, author=self.author, content={'blocks': []})
+        self.voters = [
+            User.objects.create_user(username=f'voter{i}', password='testpassword', school_email=f'voter{i}@wpga.ca', first_name='Voter', last_name=str(i))
+            for i in range(20)
+        ]
+
+    def _vote_in_parallel(self, votes):
+        def vote(args):
+            user, vote_type = args
+            try:
+                return vote_solution_service(user, self.solution.id, vote_type)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            return list(executor.map(vote, votes))
+
+    def test_parallel_upvotes_from_distinct_users_are_all_counted(self):
+        results = self._vote_in_parallel([(user, 'upvote') for user in self.voters])
+
+        self.assertTrue(all(result.get('success') for result in results))
+        self.solution.refresh_from_db()
+        self.assertEqual(self.solution.upvotes, len(self.voters))
+        self.assertEqual(self.solution.downvotes, 0)
+        self.assertEqual(SolutionVote.objects.filter(solution=self.solution).count(), len(self.voters))
+
+    def test_parallel_repeat_votes_from_one_user_count_once(self):
+        user = self.voters[0]
+        results = self._vote_in_parallel([(user, 'upvote')] * 10)
+
+        self.assertEqual(sum(1 for result in results if result.get('success')), 1)
+        self.assertEqual(sum(1 for result in results if result.get('conflict')), 9)
+        self.solution.refresh_from_db()
+        self.assertEqual(self.solution.upvotes, 1)
+
+    def test_mixed_parallel_votes_keep_counts_exact(self):
+        upvoters, downvoters = self.voters[:12], self.voters[12:]
+        self._vote_in_parallel(
+            [(user, 'upvote') for user in upvoters] + [(user, 'downvote') for user in downvoters]
+        )
+        # Half of the upvoters withdraw by voting the other way
+        results = self._vote_in_parallel([(user, 'downvote') for user in upvoters[:6]])
+
+        self.assertTrue(all(result.get('vote_state') == 'none' for result in results))
+        self.solution.refresh_from_db()
+        self.assertEqual(self.solution.upvotes, 6)
+        self.assertEqual(self.solution.downvotes, len(downvoters))
+        self.assertEqual(SolutionVote.objects.filter(solution=self.solution, value=SolutionVote.UPVOTE).count(), 6)
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from forum.services.wolfnet_job_service import start_wolfnet_job, get_wolfnet_job_status
+
+class FakeTask:
+    def __init__(self, result):
+        self.result = result
+        self.delayed = []
+
+    def __call__(self, *args):
+        return self.result
+
+    def delay(self, *args):
+        self.delayed.append(args)
+        return SimpleNamespace(id='task-123')
+
+
+def fake_async_result(state, result=None, info=None):
+    return mock.Mock(state=state, result=result, info=info, ready=mock.Mock(return_value=state in ('SUCCESS', 'FAILURE')))
+
+
+@override_settings(CELERY_RESULT_BACKEND='redis://localhost:6379')
+class WolfNetJobTests(SimpleTestCase):
+    def setUp(self):
+        self.user = SimpleNamespace(id=7)
+        self.task = FakeTask({'success': True, 'courses': {'1A': {'id': 1}}})
+
+    def test_starting_a_job_returns_immediately_with_a_job_id(self):
+        started = start_wolfnet_job(self.task, 'student@wpga.ca', user=self.user)
+
+        self.assertEqual(started['status'], 'pending')
+        self.assertNotIn('task-123', started['job_id'])
+        self.assertEqual(self.task.delayed, [('student@wpga.ca',)])
+
+    @override_settings(CELERY_RESULT_BACKEND=None)
+    def test_without_result_backend_the_task_runs_inline(self):
+        self.assertEqual(start_wolfnet_job(self.task, 'student@wpga.ca'), {**self.task.result, 'status': 'complete'})
+
+    def test_progress_and_result_are_reported(self):
+        job_id = start_wolfnet_job(self.task, 'student@wpga.ca', user=self.user)['job_id']
+
+        with mock.patch('forum.services.wolfnet_job_service.AsyncResult', return_value=fake_async_result('PROGRESS', info={'step': 'logging_in'})) as async_result:
+            self.assertEqual(get_wolfnet_job_status(job_id, self.user), {'status': 'running', 'progress': 'logging_in'})
+        async_result.assert_called_once_with('task-123')
+
+        with mock.patch('forum.services.wolfnet_job_service.AsyncResult', return_value=fake_async_result('SUCCESS', result=self.task.result)):
+            self.assertEqual(get_wolfnet_job_status(job_id, self.user), {**self.task.result, 'status': 'complete'})
+
+    def test_jobs_are_private_to_their_user(self):
+        job_id = start_wolfnet_job(self.task, 'student@wpga.ca', user=self.user)['job_id']
+
+        self.assertIsNone(get_wolfnet_job_status(job_id, SimpleNamespace(id=8)))
+        self.assertIsNone(get_wolfnet_job_status(job_id + 'x', self.user))
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from unittest import mock
+from cryptography.fernet import Fernet
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+from forum.models import User, WolfNetSession
+from forum.forms import WolfNetSettingsForm
+from forum.services.profile_service import update_wolfnet_settings
+from forum.services.wolfnet_session_services import store_wolfnet_session, load_wolfnet_session, REVALIDATE_AFTER
+from forum.tasks import verify_and_save_wolfnet_password
+
+SELENIUM_COOKIES = [
+    {'name': 't', 'value': 'secret-token', 'expiry': int((timezone.now() + timedelta(hours=2)).timestamp())},
+    {'name': 'ASP.NET_SessionId', 'value': 'abc123'},
+]
+SECTIONS = [{'section_id': '114310942', 'course_name': 'Math 10'}]
+
+@override_settings(FERNET_KEY=Fernet.generate_key().decode())
+class WolfNetSessionCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword', school_email='test@wpga.ca', first_name='John', last_name='Doe')
+
+    def test_cookies_are_stored_encrypted_and_expire_with_the_earliest_cookie(self):
+        wolfnet_session = store_wolfnet_session(self.user, SELENIUM_COOKIES, '4242', SECTIONS)
+
+        self.assertNotIn('secret-token', wolfnet_session.encrypted_cookies)
+        self.assertEqual(wolfnet_session.get_cookies(), {'t': 'secret-token', 'ASP.NET_SessionId': 'abc123'})
+        self.assertLessEqual(wolfnet_session.expires_at, timezone.now() + timedelta(hours=2))
+
+    def test_recently_validated_session_is_reused_without_a_network_call(self):
+        store_wolfnet_session(self.user, SELENIUM_COOKIES, '4242', SECTIONS)
+
+        with mock.patch('forum.services.wolfnet_session_services.is_session_alive') as is_session_alive:
+            wolfnet_session, http_session = load_wolfnet_session(self.user)
+
+        is_session_alive.assert_not_called()
+        self.assertEqual(wolfnet_session.sections, SECTIONS)
+        self.assertEqual(http_session.cookies.get('t'), 'secret-token')
+
+    def test_stale_session_is_revalidated_and_dropped_when_dead(self):
+        store_wolfnet_session(self.user, SELENIUM_COOKIES, '4242', SECTIONS)
+        WolfNetSession.objects.update(validated_at=timezone.now() - REVALIDATE_AFTER)
+
+        with mock.patch('forum.services.wolfnet_session_services.is_session_alive', return_value=False):
+            wolfnet_session, http_session = load_wolfnet_session(self.user)
+
+        self.assertIsNone(wolfnet_session)
+        self.assertFalse(WolfNetSession.objects.exists())
+
+    def test_expired_session_is_not_used(self):
+        store_wolfnet_session(self.user, SELENIUM_COOKIES, '4242', SECTIONS)
+        WolfNetSession.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(load_wolfnet_session(self.user), (None, None))
+        self.assertFalse(WolfNetSession.objects.exists())
+
+    def update_settings(self, data):
+        request = RequestFactory().post('/profile/', data)
+        request.user = self.user
+        return update_wolfnet_settings(request, self.user)
+
+    def test_clearing_the_password_deletes_the_session(self):
+        store_wolfnet_session(self.user, SELENIUM_COOKIES, '4242', SECTIONS)
+
+        self.assertTrue(self.update_settings({'clear_wolfnet_password': 'true'})[0])
+        self.assertFalse(WolfNetSession.objects.exists())
+
+    def test_changing_the_password_deletes_the_session(self):
+        store_wolfnet_session(self.user, SELENIUM_COOKIES, '4242', SECTIONS)
+
+        self.assertTrue(self.update_settings({'wolfnet_password': 'new-password'})[0])
+        self.assertFalse(WolfNetSession.objects.exists())
+
+    def test_verified_password_replaces_the_session(self):
+        store_wolfnet_session(self.user, SELENIUM_COOKIES, '4242', SECTIONS)
+        encrypted_password = WolfNetSettingsForm().encrypt_password('new-password')
+
+        with mock.patch('forum.tasks.check_wolfnet_password', return_value={'success': True}), \
+                mock.patch('forum.tasks.report_progress'):
+            result = verify_and_save_wolfnet_password.run(self.user.id, encrypted_password)
+
+        self.assertEqual(result['message'], 'WolfNet password verified and saved successfully!')
+        self.assertFalse(WolfNetSession.objects.exists())
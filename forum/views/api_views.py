@@ -14,7 +14,6 @@ import logging
 from forum.models import User, Post, Solution, Comment, Course
 from forum.services.course_services import get_user_courses
 from forum.services.utils import (
-    process_post_preview, 
     add_course_context, 
     selective_quote_replace, 
     detect_bad_words
@@ -62,7 +61,6 @@ def for_you_api(request):
     post_list = []
     for post in page_obj:
         add_course_context(post, experienced_courses, help_needed_courses)
-        post.preview_text = process_post_preview(post)
 
         local_created_at = localtime(post.created_at).isoformat()
 
@@ -3,19 +3,15 @@ from django.contrib.auth.decorators import login_required
 from django.http import HttpResponse
 from forum.services.feed_services import get_for_you_posts, get_all_posts, paginate_posts, get_user_posts
 from forum.services.schedule_services import (
-    get_block_order_for_day,
+    get_day_schedules,
+    get_block_course_names,
     process_schedule_for_user,
-    is_ceremonial_uniform_required,
     _convert_to_sheet_date_format
 )
 from forum.views.greetings import get_random_greeting
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
-def _get_iso_date(dt):
-    """Convert datetime to ISO format date string (YYYY-MM-DD)"""
-    return dt.strftime('%Y-%m-%d')
-
 @login_required
 def for_you(request):
     if not request.user.is_authenticated:
@@ -34,19 +30,18 @@ def for_you(request):
     now_pst = datetime.now(pst)
     tomorrow_pst = now_pst + timedelta(days=1)
 
-    today_iso = _get_iso_date(now_pst)
-    tomorrow_iso = _get_iso_date(tomorrow_pst)
-
     greeting = get_random_greeting(request.user.first_name, user_timezone="America/Vancouver")
 
     try:
-        ceremonial_required_today = is_ceremonial_uniform_required(request.user, today_iso)
-        ceremonial_required_tomorrow = is_ceremonial_uniform_required(request.user, tomorrow_iso)
-        
-        raw_schedule_today = get_block_order_for_day(today_iso)
-        raw_schedule_tomorrow = get_block_order_for_day(tomorrow_iso)
-        processed_schedule_today = process_schedule_for_user(request.user, raw_schedule_today)
-        processed_schedule_tomorrow = process_schedule_for_user(request.user, raw_schedule_tomorrow)
+        day_schedules = get_day_schedules([now_pst.date(), tomorrow_pst.date()])
+        schedule_today = day_schedules[now_pst.date()]
+        schedule_tomorrow = day_schedules[tomorrow_pst.date()]
+        ceremonial_required_today = schedule_today['ceremonial_uniform']
+        ceremonial_required_tomorrow = schedule_tomorrow['ceremonial_uniform']
+
+        block_courses = get_block_course_names(request.user)
+        processed_schedule_today = process_schedule_for_user(request.user, schedule_today, block_courses)
+        processed_schedule_tomorrow = process_schedule_for_user(request.user, schedule_tomorrow, block_courses)
     except Exception as e:
         print(e)
         ceremonial_required_today = None
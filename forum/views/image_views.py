@@ -0,0 +1,34 @@
+from django.http import Http404, HttpResponseRedirect
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import require_http_methods
+from forum.models import ImageAsset
+from forum.services.image_services import IMAGE_VARIANTS, get_image_asset
+
+VARIANT_NAMES = {name for name, _ in IMAGE_VARIANTS}
+
+@require_http_methods(["GET", "HEAD"])
+def image_asset_view(request, key, variant='full'):
+    """
+    Stable URL stored in Editor.js content for an uploaded image. Redirects to the
+    requested variant (WebP when the browser accepts it, else JPEG), or to the
+    original while the variants are still being made.
+    """
+    if variant not in VARIANT_NAMES:
+        raise Http404
+    asset = get_image_asset(key)
+    if asset is None:
+        raise Http404
+
+    if asset['status'] == ImageAsset.READY:
+        files = asset['variants'][variant]
+        response = HttpResponseRedirect(files['webp'] if 'image/webp' in request.headers.get('Accept', '') else files['jpeg'])
+        patch_cache_control(response, public=True, max_age=24 * 60 * 60)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    if not asset['original_url']:
+        raise Http404
+    response = HttpResponseRedirect(asset['original_url'])
+    # Point at the variants as soon as they exist
+    patch_cache_control(response, no_cache=True)
+    return response
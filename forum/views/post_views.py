@@ -80,31 +80,18 @@ def post_detail(request, post_id):
     # Prepare forms and additional context
     solution_form = SolutionForm()
     comment_form = CommentForm()
-    
-    has_solution = Solution.objects.filter(post_id=post_id, author=request.user).exists()
-    is_following = FollowedPost.objects.filter(user=request.user, post_id=post_id).exists() if request.user.is_authenticated else False
-
-    # Process solutions for template
-    processed_solutions = []
-    for solution in result['solutions']:
-        solution['is_saved'] = SavedSolution.objects.filter(
-            user=request.user, 
-            solution_id=solution['id']
-        ).exists() if request.user.is_authenticated else False
-        processed_solutions.append(solution)
-
-    post = get_object_or_404(Post, id=post_id)
 
     context = {
-        'post': post,  # Use actual post object for template helpers
+        'post': result['post_object'],  # Use actual post object for template helpers
         'solutions' : result['solutions_object'],
+        'accepted_solution': result['accepted_solution'],
         'post_data': result,
         'content_json': json.dumps(result['content']),
-        'processed_solutions_json': json.dumps(processed_solutions),
-        'has_solution_from_user': has_solution,
+        'processed_solutions_json': json.dumps(result['solutions']),
+        'has_solution_from_user': result['has_solution_from_user'],
         'solution_form': solution_form,
         'comment_form': comment_form,
-        'is_following': is_following,
+        'is_following': result['is_following'],
         'courses': result['courses'],
         'like_count': result.get('like_count', 0),
         'is_liked_by_user': result.get('is_liked', False),
@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_GET
 import json
 import logging
 from forum.models import ( 
@@ -33,6 +33,7 @@ from forum.services.auto_complete_service import (
     auto_complete_user_courses_service,
     auto_complete_courses_registration_service
 )
+from forum.services.wolfnet_job_service import start_wolfnet_job, get_wolfnet_job_status
 
 logger = logging.getLogger(__name__)
 
@@ -121,7 +122,7 @@ def auto_complete_courses_view(request):
     """
     try:
         result = auto_complete_user_courses_service(request.user)
-        return JsonResponse(result)
+        return JsonResponse(result, status=202 if 'job_id' in result else 200)
         
     except Exception as e:
         return JsonResponse({
@@ -140,7 +141,7 @@ def auto_complete_courses_registration(request):
         school_email = request.POST.get('school_email')
         
         result = auto_complete_courses_registration_service(school_email, wolfnet_password)
-        return JsonResponse(result)
+        return JsonResponse(result, status=202 if 'job_id' in result else 200)
         
     except Exception as e:
         return JsonResponse({
@@ -174,40 +175,31 @@ def check_wolfnet_password_view(request):
                 'error': 'School email is required for WolfNet verification'
             })
         
-        from forum.tasks import check_wolfnet_password
-        
-        # Check if result backend is disabled - if so, run synchronously
-        from django.conf import settings
-        result_backend_disabled = getattr(settings, 'CELERY_RESULT_BACKEND', None) is None
-        
-        if result_backend_disabled:
-            # Run task synchronously when result backend is disabled
-            verification_result = check_wolfnet_password(school_email, wolfnet_password)
-        else:
-            # Run asynchronously with result retrieval
-            result = check_wolfnet_password.delay(school_email, wolfnet_password)
-            verification_result = result.get(timeout=60)
-        
-        # If verification is successful, save the password
-        if verification_result.get('success'):
-            try:
-                user_profile = request.user.userprofile
-                from forum.forms import WolfNetSettingsForm
-                wolfnet_form = WolfNetSettingsForm()
-                encrypted_password = wolfnet_form.encrypt_password(wolfnet_password)
-                user_profile.wolfnet_password = encrypted_password
-                user_profile.save()
-                verification_result['message'] = 'WolfNet password verified and saved successfully!'
-            except Exception as save_error:
-                logging.getLogger(__name__).error(f"Error saving WolfNet password for {request.user.username}: {str(save_error)}")
-                # Still return success for verification, but note the save issue
-                verification_result['message'] = 'WolfNet password verified successfully, but there was an issue saving it. Please try again.'
-        
-        return JsonResponse(verification_result)
+        from forum.tasks import verify_and_save_wolfnet_password
+
+        # Verified and saved in the background; the client polls wolfnet_job_status_view
+        encrypted_password = WolfNetSettingsForm().encrypt_password(wolfnet_password)
+        result = start_wolfnet_job(verify_and_save_wolfnet_password, request.user.id, encrypted_password, user=request.user)
+        return JsonResponse(result, status=202 if 'job_id' in result else 200)
             
     except Exception as e:
         logging.getLogger(__name__).error(f"Error in check_wolfnet_password_view for {request.user.username}: {str(e)}")
         return JsonResponse({
             'success': False,
             'error': f'An error occurred while checking WolfNet password: {str(e)}'
-        })
\ No newline at end of file
+        })
+
+@require_GET
+def wolfnet_job_status_view(request, job_id):
+    """
+    Status of a background WolfNet job (auto-complete or password check).
+    ?wait=<seconds> holds the request until the job finishes or reports progress.
+    """
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        wait = 0
+    result = get_wolfnet_job_status(job_id, request.user, wait)
+    if result is None:
+        return JsonResponse({'success': False, 'error': 'Unknown or expired job'}, status=404)
+    return JsonResponse(result)
@@ -2,15 +2,16 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from forum.models import Post, SavedPost, FollowedPost, Solution, SavedSolution
-from forum.services.utils import process_post_preview, add_course_context, annotate_post_card_context
+from forum.services.utils import process_post_preview
+from forum.services.post_card_services import hydrate_post_cards
 from forum.services.solution_services import save_solution_service
 import json
 
 @login_required
 def followed_posts(request):
-    posts = Post.objects.filter(followers__user=request.user)
+    post_ids = Post.objects.filter(followers__user=request.user).values_list('id', flat=True)
 
-    posts = annotate_post_card_context(posts, request.user)
+    posts = hydrate_post_cards(post_ids, request.user)
 
     return render(request, 'forum/followed_posts.html', {'posts': posts})
 
@@ -40,9 +41,11 @@ def save_solution(request, solution_id):
 
 @login_required
 def saved_solutions(request):
-    solutions = Solution.objects.filter(saves__user=request.user)
+    solutions = list(Solution.objects.filter(saves__user=request.user))
 
+    posts = {post.id: post for post in hydrate_post_cards({s.post_id for s in solutions}, request.user)}
     for solution in solutions:
         solution.preview_text = process_post_preview(solution)
+        solution.post = posts[solution.post_id]
 
     return render(request, 'forum/saved_solutions.html', {'solutions': solutions})
@@ -0,0 +1,47 @@
+// Background WolfNet jobs (course auto-complete, password checks) answer with a job_id;
+// waitForWolfnetJob polls /wolfnet-jobs/<job_id>/ until the job has a result.
+(function () {
+    const POLL_INTERVAL_MS = 1500;
+    const TIMEOUT_MS = 120000;
+
+    const STEP_LABELS = {
+        logging_in: 'Logging in to WolfNet...',
+        reading_schedule: 'Reading your schedule...',
+        matching_courses: 'Matching courses...'
+    };
+
+    window.wolfnetStepLabel = function (step) {
+        return STEP_LABELS[step] || 'Working...';
+    };
+
+    // Resolves with the job's result. Responses that already carry one (no job_id) are returned as-is.
+    window.waitForWolfnetJob = async function (data, onProgress) {
+        if (!data.job_id) {
+            return data;
+        }
+
+        const deadline = Date.now() + TIMEOUT_MS;
+        let lastProgress = null;
+        while (Date.now() < deadline) {
+            await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+
+            const response = await fetch(`/wolfnet-jobs/${encodeURIComponent(data.job_id)}/`, {
+                headers: { 'Accept': 'application/json' },
+                credentials: 'same-origin'
+            });
+            if (!response.ok) {
+                return { success: false, error: 'The WolfNet request expired. Please try again.' };
+            }
+
+            const status = await response.json();
+            if (status.status === 'complete' || status.status === 'failed') {
+                return status;
+            }
+            if (onProgress && status.progress && status.progress !== lastProgress) {
+                lastProgress = status.progress;
+                onProgress(status.progress);
+            }
+        }
+        return { success: false, error: 'WolfNet is taking too long to respond. Please try again.' };
+    };
+})();
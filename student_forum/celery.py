@@ -35,18 +35,38 @@ app.autodiscover_tasks()
 
 # Memory optimization settings for Heroku
 app.conf.worker_prefetch_multiplier = 1  # Reduce task prefetching
-app.conf.worker_max_tasks_per_child = 10  # Restart worker after 10 tasks to free memory
+app.conf.worker_max_tasks_per_child = 100  # Browser memory is bounded by BrowserPool recycling
 app.conf.worker_disable_rate_limits = True
 app.conf.task_acks_late = True
 app.conf.task_reject_on_worker_lost = True
 
 # Celery Beat Schedule for periodic tasks
 app.conf.beat_schedule = {
-    'check-all-user-grades': {
-        'task': 'forum.tasks.periodic_grade_check_trigger',
-        'schedule': 60.0 * 60,  # Every 60 minutes
+    'dispatch-due-grade-checks': {
+        'task': 'forum.tasks.dispatch_due_grade_checks',
+        'schedule': 60.0,  # Every minute; each user's own interval decides when they are due
         'options': {'queue': 'grades', 'routing_key': 'grades.trigger'}
     },
+    'flush-post-views': {
+        'task': 'forum.tasks.flush_post_views_task',
+        'schedule': 60.0,  # Every minute
+        'options': {'queue': 'general', 'routing_key': 'general.views'}
+    },
+    'flush-push-queue': {
+        'task': 'forum.tasks.flush_push_queue_task',
+        'schedule': 10.0,  # Every 10 seconds
+        'options': {'queue': 'general', 'routing_key': 'general.push'}
+    },
+    'check-push-receipts': {
+        'task': 'forum.tasks.check_push_receipts_task',
+        'schedule': 15.0 * 60,  # Every 15 minutes
+        'options': {'queue': 'general', 'routing_key': 'general.push'}
+    },
+    'sync-daily-schedules': {
+        'task': 'forum.tasks.sync_daily_schedules_task',
+        'schedule': 3.0 * 60 * 60,  # Every 3 hours
+        'options': {'queue': 'general', 'routing_key': 'general.schedule'}
+    },
     # Alternative: Use batched approach (comment out above and uncomment below)
     # 'check-all-user-grades-batched': {
     #     'task': 'forum.tasks.check_user_grades_batched_dispatch',
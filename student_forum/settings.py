@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',
+    'django.contrib.postgres',
     'forum',
     'storages',
     'django_editorjs_fields',
@@ -461,4 +462,25 @@ SECRET_KEY = os.getenv('SECRET_KEY', 'my-secret-key')
 FERNET_KEY = os.getenv('FERNET_KEY')
 
 # Expo Push Notification Settings
-EXPO_ACCESS_TOKEN = os.getenv('EXPO_ACCESS_TOKEN', None)
\ No newline at end of file
+EXPO_ACCESS_TOKEN = os.getenv('EXPO_ACCESS_TOKEN', None)
+EXPO_PUSH_URL = os.getenv('EXPO_PUSH_URL', 'https://exp.host/--/api/v2/push/send')
+EXPO_RECEIPTS_URL = os.getenv('EXPO_RECEIPTS_URL', 'https://exp.host/--/api/v2/push/getReceipts')
+
+# Warm Chrome instances kept by each Celery worker process for the Selenium WolfNet tasks
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '1'))
+BROWSER_POOL_PREWARM = os.getenv('BROWSER_POOL_PREWARM', 'True') == 'True'
+# A browser is replaced after this many users, this many seconds, or this much resident memory
+BROWSER_MAX_USES = int(os.getenv('BROWSER_MAX_USES', '25'))
+BROWSER_MAX_AGE_SECONDS = int(os.getenv('BROWSER_MAX_AGE_SECONDS', '3600'))
+BROWSER_MAX_RSS_MB = int(os.getenv('BROWSER_MAX_RSS_MB', '450'))
+
+# School-local time zone the grade-check scheduler uses for active hours and weekends
+GRADE_CHECK_TIME_ZONE = os.getenv('GRADE_CHECK_TIME_ZONE', 'America/Vancouver')
+
+# School schedule sources, imported into DailySchedule by the sync-daily-schedules beat task
+BLOCK_ORDER_SHEET_NAME = os.getenv('BLOCK_ORDER_SHEET_NAME', 'Copy of 2025-2026 SS Block Order Calendar')
+SCHOOL_CALENDAR_ID = os.getenv('SCHOOL_CALENDAR_ID', 'nda09oameg390vndlulocmvt07u7c8h4@import.calendar.google.com')
+SCHOOL_TIME_ZONE = os.getenv('SCHOOL_TIME_ZONE', 'America/Vancouver')
+
+# Optional moderation wordlist (one word per line) used instead of the built-in list
+MODERATION_WORDLIST_PATH = os.getenv('MODERATION_WORDLIST_PATH')
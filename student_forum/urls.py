@@ -65,7 +65,8 @@ from forum.views.profile_views import (
     upload_profile_picture,
     auto_complete_courses_view,
     auto_complete_courses_registration,
-    check_wolfnet_password_view
+    check_wolfnet_password_view,
+    wolfnet_job_status_view
 )
 from forum.services.course_services import (
     course_search
@@ -97,6 +98,7 @@ from forum.views.timetable_assigner_views import (
 )
 from forum.api.schedule import(
     get_daily_schedule,
+    get_schedule_range_api,
     get_user_schedule_api,
     check_ceremonial_uniform
 )
@@ -112,7 +114,8 @@ from forum.api.auth import(
 from forum.views.auth_views import register, login_view, logout_view
 from forum.api.wolfnet_integration import(
     auto_complete_courses_api,
-    auto_complete_courses_registration_api
+    auto_complete_courses_registration_api,
+    wolfnet_job_status_api
 )
 from forum.services.schedule_services import (
     is_ceremonial_uniform_required
@@ -127,6 +130,7 @@ from forum.api.timetable import (
 )
 
 from forum.views.about_view import about_view
+from forum.views.image_views import image_asset_view
 
 from forum.api.feed import api_for_you, api_all_posts
 
@@ -220,6 +224,8 @@ urlpatterns = [
     
     # Media upload URL
     path('upload-image/', upload_image, name='upload_image'),
+    path('images/<str:key>/', image_asset_view, name='image_asset'),
+    path('images/<str:key>/<str:variant>/', image_asset_view, name='image_asset_variant'),
     
     # Profile URLs
     path('profile/upload-picture/', upload_profile_picture, name='upload_profile_picture'),
@@ -229,6 +235,7 @@ urlpatterns = [
     path('auto-complete-courses/', auto_complete_courses_view, name='auto_complete_courses'),
     path('auto-complete-courses-registration/', auto_complete_courses_registration, name='auto_complete_courses_registration'),
     path('check-wolfnet-password/', check_wolfnet_password_view, name='check_wolfnet_password'),
+    path('wolfnet-jobs/<str:job_id>/', wolfnet_job_status_view, name='wolfnet_job_status'),
     
     # Course management URLs
     path('courses/experience/add/', add_experience, name='add_experience'),
@@ -281,6 +288,7 @@ urlpatterns = [
     path('api/upload-image/', api_upload_image, name='api_upload_image'),
     
     path('api/schedules/daily/<str:target_date>/', get_daily_schedule),
+    path('api/schedule/', get_schedule_range_api, name='api_schedule_range'),
     path('api/schedules/uniform/<str:target_date>/', check_ceremonial_uniform),
 
     path('api/for-you/', api_for_you, name='api_for_you'),
@@ -332,6 +340,7 @@ urlpatterns = [
     # Auto-complete courses API endpoints
     path('api/auto-complete-courses/', auto_complete_courses_api, name='api_auto_complete_courses'),
     path('api/auto-complete-courses-registration/', auto_complete_courses_registration_api, name='api_auto_complete_courses_registration'),
+    path('api/wolfnet-jobs/<str:job_id>/', wolfnet_job_status_api, name='api_wolfnet_job_status'),
 ]
 
 if settings.DEBUG: